@@ -0,0 +1,166 @@
+import httpx
+from typing import Optional, List, AsyncIterator, Tuple
+from urllib.parse import quote
+import os
+import time
+import logging
+
+from airtable_scheduler import AirtableScheduler, get_scheduler
+from metrics import observe_airtable, record_upstream
+
+logger = logging.getLogger(__name__)
+
+AIRTABLE_API_URL = os.environ.get('AIRTABLE_API_URL', 'https://api.airtable.com/v0')
+
+# Airtable accepteert maximaal 10 records per batch request
+MAX_BATCH_SIZE = 10
+
+class AsyncAirtableTable:
+    """Async client voor één Airtable tabel, met een gedeelde keep-alive connection pool."""
+
+    def __init__(self, access_token: str, base_id: str, table_name: str,
+                 api_url: Optional[str] = None,
+                 scheduler: Optional[AirtableScheduler] = None):
+        """
+        Initialiseer de HTTP client voor een Airtable tabel.
+
+        Args:
+            access_token: Airtable personal access token
+            base_id: Airtable base ID
+            table_name: Naam of ID van de tabel
+            api_url: Basis URL van de Airtable API (voor tests of proxies)
+            scheduler: Request scheduler; standaard de gedeelde scheduler van de base
+        """
+        api_url = (api_url or AIRTABLE_API_URL).rstrip('/')
+        self.table_name = table_name
+        self.table_url = f"{api_url}/{base_id}/{quote(table_name, safe='')}"
+        self.scheduler = scheduler or get_scheduler(base_id)
+
+        limits = httpx.Limits(
+            max_connections=int(os.environ.get('AIRTABLE_MAX_CONNECTIONS', '10')),
+            max_keepalive_connections=int(os.environ.get('AIRTABLE_MAX_KEEPALIVE', '5')),
+            keepalive_expiry=float(os.environ.get('AIRTABLE_KEEPALIVE_EXPIRY', '30'))
+        )
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=httpx.Timeout(float(os.environ.get('AIRTABLE_TIMEOUT', '10'))),
+            limits=limits
+        )
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        """Voer een request uit via de scheduler en geef de JSON body terug; gooit bij HTTP fouten."""
+        async def call():
+            started = time.perf_counter()
+            status = "error"
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                status = str(response.status_code)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                observe_airtable(method, status, time.perf_counter() - started)
+
+        # Server-Timing telt ook het wachten op de scheduler en retries mee
+        started = time.perf_counter()
+        try:
+            # POST maakt records aan; opnieuw proberen kan dubbele records geven
+            return await self.scheduler.submit(call, idempotent=method != "POST")
+        finally:
+            record_upstream("airtable", time.perf_counter() - started)
+
+    def _list_params(self, formula: Optional[str], sort: Optional[List[str]],
+                     fields: Optional[List[str]], page_size: int) -> list:
+        """Bouw query parameters voor een list request."""
+        params = [("pageSize", str(page_size))]
+        if formula:
+            params.append(("filterByFormula", formula))
+        for i, field in enumerate(sort or []):
+            direction = "asc"
+            if field.startswith("-"):
+                field, direction = field[1:], "desc"
+            params.append((f"sort[{i}][field]", field))
+            params.append((f"sort[{i}][direction]", direction))
+        for field in fields or []:
+            params.append(("fields[]", field))
+        return params
+
+    async def iterate(self,
+                      formula: Optional[str] = None,
+                      sort: Optional[List[str]] = None,
+                      fields: Optional[List[str]] = None,
+                      page_size: int = 100) -> AsyncIterator[List[dict]]:
+        """
+        Itereer pagina voor pagina over records.
+
+        Args:
+            formula: Airtable filterByFormula expressie
+            sort: Veldnamen om op te sorteren, prefix '-' voor aflopend
+            fields: Alleen deze velden ophalen
+            page_size: Aantal records per pagina (max 100)
+
+        Yields:
+            Lijst van ruwe Airtable records per pagina
+        """
+        params = self._list_params(formula, sort, fields, page_size)
+        offset = None
+        while True:
+            page_params = params + ([("offset", offset)] if offset else [])
+            data = await self._request("GET", self.table_url, params=page_params)
+            yield data.get("records", [])
+            offset = data.get("offset")
+            if not offset:
+                break
+
+    async def all(self, **kwargs) -> List[dict]:
+        """Haal alle records op over alle pagina's heen."""
+        records = []
+        async for page in self.iterate(**kwargs):
+            records.extend(page)
+        return records
+
+    async def get(self, record_id: str) -> dict:
+        """Haal een enkel record op via ID."""
+        return await self._request("GET", f"{self.table_url}/{quote(record_id, safe='')}")
+
+    async def create(self, fields: dict) -> dict:
+        """Maak een nieuw record aan."""
+        return await self._request("POST", self.table_url, json={"fields": fields})
+
+    async def update(self, record_id: str, fields: dict) -> dict:
+        """Werk velden van een bestaand record bij (PATCH)."""
+        return await self._request("PATCH", f"{self.table_url}/{quote(record_id, safe='')}",
+                                   json={"fields": fields})
+
+    async def delete(self, record_id: str) -> dict:
+        """Verwijder een record."""
+        return await self._request("DELETE", f"{self.table_url}/{quote(record_id, safe='')}")
+
+    def _check_batch(self, items: list):
+        if not items or len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"Batch moet 1 tot {MAX_BATCH_SIZE} records bevatten, niet {len(items)}")
+
+    async def batch_create(self, fields_list: List[dict]) -> List[dict]:
+        """Maak maximaal 10 records aan in één request."""
+        self._check_batch(fields_list)
+        data = await self._request("POST", self.table_url,
+                                   json={"records": [{"fields": fields} for fields in fields_list]})
+        return data.get("records", [])
+
+    async def batch_update(self, updates: List[Tuple[str, dict]]) -> List[dict]:
+        """Werk maximaal 10 records bij in één request; updates zijn (record_id, fields) paren."""
+        self._check_batch(updates)
+        data = await self._request("PATCH", self.table_url,
+                                   json={"records": [{"id": record_id, "fields": fields}
+                                                     for record_id, fields in updates]})
+        return data.get("records", [])
+
+    async def batch_delete(self, record_ids: List[str]) -> List[dict]:
+        """Verwijder maximaal 10 records in één request."""
+        self._check_batch(record_ids)
+        data = await self._request("DELETE", self.table_url,
+                                   params=[("records[]", record_id) for record_id in record_ids])
+        return data.get("records", [])
+
+    async def aclose(self):
+        """Sluit de connection pool."""
+        await self._client.aclose()
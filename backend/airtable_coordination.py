@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from bson.binary import Binary
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from groepen_store import GroepenStore
+from snapshot_mirror import GroepenSnapshot, SnapshotMetadata, SnapshotMirror
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: geen file locks, elk proces is leider
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COORDINATION_DIR = Path(__file__).parent / 'data'
+
+def worker_id() -> str:
+    """Unieke naam van dit worker proces."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Mongo geeft naive UTC datetimes terug
+    return value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+
+class FileCoordinator:
+    """
+    Leiderverkiezing en snapshot deling via bestanden, voor development.
+
+    De leider houdt een exclusieve flock op een lock bestand zolang het proces
+    leeft; stopt of crasht het proces, dan geeft het OS de lock vrij en neemt
+    een andere worker het bij de volgende tick over. De leider schrijft zijn
+    snapshot atomisch naar een gedeeld bestand; volgers lezen het opnieuw
+    zodra mtime, grootte of inode verandert. Werkt alleen voor workers op
+    dezelfde machine.
+    """
+
+    def __init__(self, directory: Path, name: str = "gli_groepen", tick: float = 5.0):
+        self.lock_path = directory / f"{name}.leader.lock"
+        self.channel = SnapshotMirror(directory / f"{name}.shared.json")
+        self.tick = tick
+        self._lock_handle = None
+        self._seen: Optional[tuple] = None
+        self.published = 0
+        self.fetched = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_handle is not None
+
+    async def acquire(self) -> bool:
+        """Word leider of blijf het; False als een ander proces de lock heeft."""
+        if self._lock_handle is not None or fcntl is None:
+            return True
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._lock_handle = handle
+        return True
+
+    async def release(self):
+        if self._lock_handle is not None:
+            fcntl.flock(self._lock_handle, fcntl.LOCK_UN)
+            self._lock_handle.close()
+            self._lock_handle = None
+
+    async def publish(self, store: GroepenStore, watermark: Optional[datetime]):
+        """Deel de store met de volgers als groepen, synced_at of watermark gewijzigd zijn."""
+        if await self.channel.save(store, watermark):
+            self.published += 1
+
+    async def fetch(self) -> Optional[GroepenSnapshot]:
+        """De gedeelde snapshot als die nieuw is sinds de vorige fetch, anders None."""
+        try:
+            stat = os.stat(self.channel.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature == self._seen:
+            return None
+        snapshot = await asyncio.to_thread(self.channel.load)
+        self._seen = signature
+        if snapshot is not None:
+            self.fetched += 1
+        return snapshot
+
+    def stats(self) -> dict:
+        return {"leader": int(self.is_leader), "published": self.published, "fetched": self.fetched}
+
+class MongoCoordinator:
+    """
+    Leiderverkiezing en snapshot deling via MongoDB, voor workers op meerdere machines.
+
+    De leider heeft een lease document dat hij elke tick verlengt; verloopt de
+    lease (bijv. omdat het proces gestopt is), dan neemt de eerste worker die
+    daarna een tick doet het over. De snapshot staat gecomprimeerd in één
+    document met een versie; volgers halen de groepen alleen op als de versie
+    verschilt van wat ze al hebben. Een sync zonder wijzigingen werkt alleen
+    synced_at en het watermark in dat document bij (heartbeat), zodat de
+    snapshot van volgers niet steeds ouder lijkt.
+    """
+
+    def __init__(self, db, name: str = "gli_groepen", lease_ttl: float = 30.0, tick: float = 5.0):
+        self.leases = db.airtable_leases
+        self.snapshots = db.airtable_snapshots
+        self.name = name
+        self.lease_ttl = timedelta(seconds=lease_ttl)
+        self.tick = tick
+        self.worker_id = worker_id()
+        self.is_leader = False
+        self._published_version = -1
+        self._published_metadata: Optional[SnapshotMetadata] = None
+        self._seen: Optional[str] = None
+        self._seen_metadata: Optional[SnapshotMetadata] = None
+        self.published = 0
+        self.heartbeats = 0
+        self.fetched = 0
+
+    async def acquire(self) -> bool:
+        """Neem of verleng de lease; False als een andere worker een geldige lease heeft."""
+        now = datetime.now(timezone.utc)
+        try:
+            await self.leases.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.worker_id}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.worker_id, "expires_at": now + self.lease_ttl}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            self.is_leader = True
+        except DuplicateKeyError:
+            # Upsert van een bezet _id: een andere worker is leider
+            self.is_leader = False
+        return self.is_leader
+
+    async def release(self):
+        """Geef de lease direct vrij, zodat een andere worker niet op de TTL hoeft te wachten."""
+        if self.is_leader:
+            await self.leases.delete_one({"_id": self.name, "owner": self.worker_id})
+            self.is_leader = False
+
+    async def publish(self, store: GroepenStore, watermark: Optional[datetime]):
+        """Deel de store met de volgers; zonder gewijzigde groepen alleen synced_at en watermark."""
+        version = store.version
+        metadata = SnapshotMetadata(synced_at=store.synced_at, watermark=watermark)
+        if version == self._published_version:
+            if metadata == self._published_metadata:
+                return
+            result = await self.snapshots.update_one(
+                {"_id": self.name, "version": f"{self.worker_id}:{version}"},
+                {"$set": {**metadata.model_dump(), "published_at": datetime.now(timezone.utc)}}
+            )
+            if result.matched_count:
+                self._published_metadata = metadata
+                self.heartbeats += 1
+                return
+            # Het document is intussen door een andere leider vervangen: publiceer alles opnieuw
+
+        data = GroepenSnapshot.from_store(store, watermark).model_dump_json().encode('utf-8')
+        await self.snapshots.replace_one(
+            {"_id": self.name},
+            {
+                "_id": self.name,
+                "version": f"{self.worker_id}:{version}",
+                "published_at": datetime.now(timezone.utc),
+                **metadata.model_dump(),
+                "data": Binary(await asyncio.to_thread(zlib.compress, data)),
+            },
+            upsert=True
+        )
+        self._published_version = version
+        self._published_metadata = metadata
+        self.published += 1
+
+    async def fetch(self) -> Optional[SnapshotMetadata]:
+        """
+        Wat sinds de vorige fetch nieuw is: de volledige snapshot als de groepen
+        gewijzigd zijn, alleen de metadata na een heartbeat, anders None.
+        """
+        # Zonder de (grote) data: bij een heartbeat is dit de enige round trip
+        head = await self.snapshots.find_one({"_id": self.name}, {"data": 0})
+        if head is None:
+            return None
+        metadata = SnapshotMetadata(synced_at=_as_utc(head.get("synced_at")),
+                                    watermark=_as_utc(head.get("watermark")))
+        if head["version"] == self._seen:
+            if metadata == self._seen_metadata:
+                return None
+            self._seen_metadata = metadata
+            return metadata
+
+        doc = await self.snapshots.find_one({"_id": self.name})
+        if doc is None:
+            return None
+        data = await asyncio.to_thread(zlib.decompress, doc["data"])
+        snapshot = GroepenSnapshot.model_validate_json(data)
+        # Heartbeats werken alleen de velden naast de data bij
+        metadata = SnapshotMetadata(synced_at=_as_utc(doc.get("synced_at", snapshot.synced_at)),
+                                    watermark=_as_utc(doc.get("watermark", snapshot.watermark)))
+        snapshot = snapshot.model_copy(update=metadata.model_dump())
+        self._seen = doc["version"]
+        self._seen_metadata = metadata
+        self.fetched += 1
+        return snapshot
+
+    def stats(self) -> dict:
+        return {"leader": int(self.is_leader), "published": self.published,
+                "heartbeats": self.heartbeats, "fetched": self.fetched}
+
+def coordinator_from_env(db=None):
+    """
+    Coördinatie volgens AIRTABLE_COORDINATION: leeg (uit), "file" of "mongo".
+
+    Zonder coördinatie synct elk worker proces zelf met Airtable.
+
+    Alleen de lijst snapshot en reads van bekende ids komen van de leider.
+    Schrijfacties, /batch, /export en reads van ids die nog niet in de
+    snapshot staan gaan vanuit elke worker naar Airtable; zet daarom
+    AIRTABLE_WORKERS op het aantal workers, zodat die samen binnen
+    AIRTABLE_RATE_LIMIT blijven.
+    """
+    mode = os.environ.get('AIRTABLE_COORDINATION', '').lower()
+    tick = float(os.environ.get('AIRTABLE_COORDINATION_TICK', '5'))
+    if not mode:
+        return None
+    if mode == "file":
+        directory = Path(os.environ.get('AIRTABLE_COORDINATION_DIR', str(DEFAULT_COORDINATION_DIR)))
+        return FileCoordinator(directory, tick=tick)
+    if mode == "mongo":
+        if db is None:
+            raise ValueError("AIRTABLE_COORDINATION=mongo vereist een database")
+        lease_ttl = float(os.environ.get('AIRTABLE_LEASE_TTL', '30'))
+        return MongoCoordinator(db, lease_ttl=lease_ttl, tick=tick)
+    raise ValueError(f"Onbekende AIRTABLE_COORDINATION: {mode}")
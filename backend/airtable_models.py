@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
 from datetime import date
 from enum import Enum
 
@@ -65,4 +65,60 @@ class GLIStatistics(BaseModel):
     geplande_groepen: int
     volle_groepen: int
     per_type: dict[str, int]
-    per_aanbieder: dict[str, int]
\ No newline at end of file
+    per_aanbieder: dict[str, int]
+
+class BatchAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class GLIGroepBatchOperation(BaseModel):
+    """Eén operatie in een batch request."""
+    action: BatchAction
+    id: Optional[str] = Field(None, description="Airtable record ID (verplicht voor update en delete)")
+    groep: Optional[GLIGroepCreate] = Field(None, description="Nieuwe groep (verplicht voor create)")
+    update: Optional[GLIGroepUpdate] = Field(None, description="Te wijzigen velden (verplicht voor update)")
+
+    @model_validator(mode="after")
+    def check_action_fields(self):
+        if self.action == BatchAction.CREATE and self.groep is None:
+            raise ValueError("create vereist 'groep'")
+        if self.action == BatchAction.UPDATE and (self.id is None or self.update is None):
+            raise ValueError("update vereist 'id' en 'update'")
+        if self.action == BatchAction.DELETE and self.id is None:
+            raise ValueError("delete vereist 'id'")
+        return self
+
+class GLIGroepBatchRequest(BaseModel):
+    """Batch van create/update/delete operaties."""
+    operations: List[GLIGroepBatchOperation] = Field(..., min_length=1, max_length=500)
+
+class GLIGroepBatchResult(BaseModel):
+    """Resultaat van één operatie, op dezelfde index als in het request."""
+    index: int
+    action: BatchAction
+    success: bool
+    id: Optional[str] = None
+    groep: Optional[GLIGroepResponse] = None
+    error: Optional[str] = None
+
+class GLIGroepBatchResponse(BaseModel):
+    """Resultaten van een batch request."""
+    results: List[GLIGroepBatchResult]
+    succeeded: int
+    failed: int
+
+class GLIBeschikbaarQuery(BaseModel):
+    """Vraag naar de eerstvolgende groepen met open inschrijving."""
+    gli_type: Optional[GLIType] = Field(None, description="Alleen dit GLI type")
+    vanaf: Optional[date] = Field(None, description="Startdatum op of na deze datum (standaard vandaag)")
+    aanbieder: Optional[str] = Field(None, description="Alleen deze aanbieder")
+    limit: int = Field(5, ge=1, le=100, description="Maximaal aantal groepen")
+
+class GLIBeschikbaarBatchRequest(BaseModel):
+    """Meerdere beschikbaarheidsvragen in één request."""
+    queries: List[GLIBeschikbaarQuery] = Field(..., min_length=1, max_length=1000)
+
+class GLIBeschikbaarBatchResponse(BaseModel):
+    """Groepen per vraag, in dezelfde volgorde als de vragen."""
+    results: List[List[GLIGroepResponse]]
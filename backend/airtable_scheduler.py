@@ -0,0 +1,244 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import random
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class Priority(IntEnum):
+    """Lanes van de scheduler; een lagere waarde gaat voor."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+# Lane voor Airtable calls in de huidige taak; achtergrondtaken zetten BACKGROUND
+request_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "airtable_request_priority", default=Priority.INTERACTIVE
+)
+
+class CircuitOpenError(Exception):
+    """Airtable wordt tijdelijk niet aangeroepen na herhaalde fouten."""
+
+# Fouten waarbij het request Airtable zeker niet bereikt heeft
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class TokenBucket:
+    """Token bucket voor het request budget per base."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_token(self) -> float:
+        self._refill()
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            return pause
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def pause(self, seconds: float):
+        """Geef geen tokens uit gedurende `seconds` (na een 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+class AirtableScheduler:
+    """
+    Gedeelde scheduler voor alle Airtable requests naar één base.
+
+    - Token bucket op het base limiet (standaard 5 req/s). De burst is standaard
+      1, dus requests worden gelijkmatig verdeeld en geen enkele seconde komt
+      boven AIRTABLE_RATE_LIMIT; een grotere burst laat in de eerste seconde
+      burst + rate requests door. Het limiet geldt voor alle processen samen:
+      met AIRTABLE_WORKERS workers krijgt elk proces een evenredig deel.
+    - Prioriteitslanes: wachtende interactieve requests krijgen het eerstvolgende
+      token vóór achtergrond sync.
+    - Retry met exponential backoff en jitter op 429, 5xx en netwerkfouten.
+      Niet-idempotente calls (POST) alleen op 429 en als het request niet
+      verstuurd is, anders kan Airtable een record dubbel aanmaken.
+    - Circuit breaker: na een reeks fouten faalt elke call direct met
+      CircuitOpenError, tot na de reset timeout één proefcall mag.
+    """
+
+    def __init__(self):
+        # Elke worker heeft een eigen bucket; samen blijven ze onder het base limiet
+        workers = max(1, int(os.environ.get('AIRTABLE_WORKERS', '1')))
+        rate = float(os.environ.get('AIRTABLE_RATE_LIMIT', '5')) / workers
+        self._bucket = TokenBucket(rate, float(os.environ.get('AIRTABLE_RATE_BURST', '1')))
+        self.max_retries = int(os.environ.get('AIRTABLE_MAX_RETRIES', '3'))
+        self.base_delay = float(os.environ.get('AIRTABLE_RETRY_BASE_DELAY', '0.5'))
+        self.max_delay = float(os.environ.get('AIRTABLE_RETRY_MAX_DELAY', '8'))
+        self.breaker_threshold = int(os.environ.get('AIRTABLE_BREAKER_THRESHOLD', '5'))
+        self.breaker_reset = float(os.environ.get('AIRTABLE_BREAKER_RESET', '30'))
+
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.rejected = 0
+
+    @property
+    def breaker_state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.breaker_reset:
+            return "half-open"
+        return "open"
+
+    async def submit(self, call: Callable[[], Awaitable[T]], priority: Optional[Priority] = None,
+                     idempotent: bool = True) -> T:
+        """
+        Voer een Airtable call uit binnen het rate budget, met retries.
+
+        Args:
+            call: Coroutine functie die het request uitvoert
+            priority: Lane; standaard die van de huidige taak
+            idempotent: False voor calls die niet veilig herhaald kunnen worden
+
+        Raises:
+            CircuitOpenError: Als de breaker open staat
+        """
+        priority = request_priority.get() if priority is None else priority
+        trial = self._check_breaker()
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._acquire(priority)
+                self.requests += 1
+                try:
+                    result = await call()
+                except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                    delay = self._retry_delay(e, attempt, idempotent)
+                    if delay is None or attempt == self.max_retries:
+                        self._record_failure(e)
+                        raise
+                    self.retries += 1
+                    logger.warning(f"Airtable call mislukt ({self._describe(e)}), nieuwe poging over {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                self._record_success()
+                return result
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+    def _check_breaker(self) -> bool:
+        """Gooi CircuitOpenError als de breaker open is; geeft True voor een proefcall."""
+        state = self.breaker_state
+        if state == "closed":
+            return False
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError("Airtable circuit breaker staat open")
+
+    def _retry_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> Optional[float]:
+        """Wachttijd voor de volgende poging, of None als de call niet opnieuw mag."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if isinstance(error, httpx.TransportError):
+            # Na een read timeout of verbroken verbinding kan Airtable het request al verwerkt hebben
+            return backoff if idempotent or isinstance(error, NOT_SENT_ERRORS) else None
+        status = error.response.status_code
+        if status == 429:
+            self.rate_limited += 1
+            retry_after = error.response.headers.get("Retry-After")
+            delay = min(self.max_delay, float(retry_after)) if retry_after and retry_after.isdigit() else backoff
+            delay = max(delay, self.base_delay)
+            # Het hele proces remt af, niet alleen deze caller
+            self._bucket.pause(delay)
+            return delay
+        if status >= 500 and idempotent:
+            return backoff
+        return None
+
+    def _record_success(self):
+        self._consecutive_failures = 0
+        if self._opened_at is not None:
+            logger.info("Airtable circuit breaker gesloten")
+        self._opened_at = None
+
+    def _record_failure(self, error: Exception):
+        # Client fouten (404, 422) betekenen dat Airtable gewoon bereikbaar is
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code < 500 \
+                and error.response.status_code != 429:
+            self._record_success()
+            return
+        self._consecutive_failures += 1
+        if self._opened_at is not None or self._consecutive_failures >= self.breaker_threshold:
+            self._opened_at = time.monotonic()
+            logger.error(f"Airtable circuit breaker open voor {self.breaker_reset}s na: {self._describe(error)}")
+
+    @staticmethod
+    def _describe(error: Exception) -> str:
+        if isinstance(error, httpx.HTTPStatusError):
+            return f"HTTP {error.response.status_code}"
+        return type(error).__name__
+
+    async def _acquire(self, priority: Priority):
+        """Wacht op een token; de dispatcher bedient wachtenden op prioriteit."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        if (self._dispatcher is None or self._dispatcher.done()
+                or self._dispatcher.get_loop() is not asyncio.get_running_loop()):
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            wait = self._bucket.time_until_token()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Caller is intussen geannuleerd
+                continue
+            self._bucket.take()
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+            "queued": len(self._waiters),
+            "breaker_state": self.breaker_state,
+        }
+
+_schedulers: Dict[str, AirtableScheduler] = {}
+
+def get_scheduler(base_id: str) -> AirtableScheduler:
+    """Eén scheduler per base, gedeeld door alle tabellen in dit proces."""
+    if base_id not in _schedulers:
+        _schedulers[base_id] = AirtableScheduler()
+    return _schedulers[base_id]
@@ -1,12 +1,24 @@
-from pyairtable import Api
-from pyairtable.formulas import match, AND, OR
+import asyncio
+import time
+import httpx
 from functools import lru_cache
-from typing import Optional, List
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Tuple
 import os
 import logging
 from datetime import datetime, timezone, date
 
-from airtable_models import GLIGroepCreate, GLIGroepUpdate, GLIGroepResponse, GLIStatistics, GLIType, GroupStatus
+from airtable_client import AsyncAirtableTable, MAX_BATCH_SIZE
+from airtable_scheduler import NOT_SENT_ERRORS, CircuitOpenError, Priority, request_priority
+from airtable_sync import AirtableSync
+from groepen_cache import SnapshotCache
+from groepen_index import GroepenIndex
+from groepen_store import GroepenStore
+from single_flight import SingleFlight
+from snapshot_mirror import GroepenSnapshot, SnapshotMetadata, SnapshotMirror
+from airtable_models import (
+    GLIGroepCreate, GLIGroepUpdate, GLIGroepResponse, GLIStatistics, GLIType, GroupStatus,
+    BatchAction, GLIGroepBatchOperation, GLIGroepBatchResult, GLIBeschikbaarQuery
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +34,208 @@ class AirtableService:
         if not self.access_token or not self.base_id:
             raise ValueError("AIRTABLE_ACCESS_TOKEN en AIRTABLE_BASE_ID moeten zijn ingesteld")
         
-        self.api = Api(self.access_token)
-        self.base = self.api.base(self.base_id)
-        self.gli_table = self.base.table(self.gli_table_name)
+        self.gli_table = AsyncAirtableTable(self.access_token, self.base_id, self.gli_table_name)
+        
+        # Lokale kopie van de tabel, incrementeel bijgewerkt door de sync engine
+        self._store = GroepenStore()
+        self._sync = AirtableSync(self.gli_table, self._store, self._transform_record_to_model)
+        self._sync_task: Optional[asyncio.Task] = None
+        
+        # Reads gebruiken de store zolang die binnen de TTL gesynct is
+        self.cache_ttl = float(os.environ.get('AIRTABLE_CACHE_TTL', '60'))
+        self._groepen_cache = SnapshotCache(self._sync_and_persist, ttl=self.cache_ttl)
+        
+        # Afgeleide data (zoals de zoekindex) die bij elke nieuwe snapshot bijgewerkt wordt
+        self._snapshot_listeners: List[Callable[[GroepenStore], None]] = []
+        
+        # Kopie op schijf: warme start en reads tijdens een Airtable storing
+        self._mirror = SnapshotMirror.from_env()
+        self._restore_mirror()
+        
+        # Gelijktijdige identieke reads delen één upstream request
+        self._single_flight = SingleFlight()
+        
+        # Met meerdere workers synct alleen de leider; zonder coördinatie is elk proces leider
+        self._coordinator = None
+        self._is_leader = True
+        
+        # Aantal batch requests dat tegelijk naar Airtable mag
+        self.batch_concurrency = int(os.environ.get('AIRTABLE_BATCH_CONCURRENCY', '3'))
         
         logger.info(f"Airtable service geïnitialiseerd voor base: {self.base_id}")
     
+    def _restore_mirror(self):
+        """Vul de store vanuit de snapshot mirror, als die er is."""
+        snapshot = self._mirror.load() if self._mirror else None
+        if snapshot is None:
+            return
+        self._apply_snapshot(snapshot)
+        self._mirror.mark_saved(self._store, self._sync.watermark)
+        
+        # Een oude snapshot wordt direct geserveerd en op de achtergrond ververst
+        age = self.snapshot_age()
+        self._groepen_cache.prime(self._store, age=self.cache_ttl if age is None else age)
+    
+    def _apply_snapshot(self, snapshot: SnapshotMetadata):
+        """
+        Neem een snapshot over en ga vanaf zijn watermark verder met syncen.
+        
+        Een heartbeat (alleen metadata) of een snapshot met dezelfde groepen
+        werkt alleen synced_at en het watermark bij; de store versie blijft
+        dan gelijk, zodat indexen en voorgecodeerde responses geldig blijven.
+        """
+        if isinstance(snapshot, GroepenSnapshot):
+            # Ongewijzigde groepen houden hun object, zodat afgeleide indexen ze kunnen overslaan
+            current = self._store.records
+            groepen = [current[g.id] if current.get(g.id) == g else g for g in snapshot.groepen]
+            if len(groepen) != len(current) or any(g is not current.get(g.id) for g in groepen):
+                self._store.replace_all(groepen)
+        self._store.synced_at = snapshot.synced_at
+        self._sync.restore(snapshot.watermark)
+    
+    async def _sync_and_persist(self) -> GroepenStore:
+        """Sync met Airtable en schrijf gewijzigde data naar de mirror; volgers lezen de leider."""
+        if not self._is_leader:
+            return await self._follow()
+        store = await self._sync.sync_once()
+        self._notify_snapshot()
+        if self._mirror:
+            await self._mirror.save(store, self._sync.watermark)
+        if self._coordinator:
+            await self._coordinator.publish(store, self._sync.watermark)
+        return store
+    
+    async def _follow(self) -> GroepenStore:
+        """Neem de laatst gepubliceerde snapshot van de leider over, zonder Airtable calls."""
+        snapshot = await self._coordinator.fetch()
+        if snapshot is not None:
+            self._apply_snapshot(snapshot)
+        if self._store.synced_at is None:
+            raise RuntimeError("Nog geen snapshot van de sync leider beschikbaar")
+        self._notify_snapshot()
+        return self._store
+    
+    def add_snapshot_listener(self, listener: Callable[[GroepenStore], None]):
+        """
+        Roep `listener(store)` aan na elke sync, overgenomen snapshot en schrijfactie.
+        
+        Is er al gesynchroniseerde data (bijv. uit de mirror), dan volgt de
+        eerste aanroep direct. Listeners draaien synchroon op de event loop en
+        moeten dus alleen het verschil met de vorige snapshot verwerken.
+        """
+        self._snapshot_listeners.append(listener)
+        if self._store.synced_at is not None:
+            listener(self._store)
+    
+    def _notify_snapshot(self):
+        # Een store zonder geslaagde sync is nog geen volledige snapshot
+        if self._store.synced_at is None:
+            return
+        for listener in self._snapshot_listeners:
+            try:
+                listener(self._store)
+            except Exception as e:
+                logger.error(f"Fout in snapshot listener: {str(e)}")
+    
+    @property
+    def coordinator(self):
+        return self._coordinator
+    
+    @property
+    def snapshot_cache(self) -> SnapshotCache:
+        return self._groepen_cache
+    
+    @property
+    def single_flight(self) -> SingleFlight:
+        return self._single_flight
+    
+    def snapshot_age(self) -> Optional[float]:
+        """Seconden sinds de laatste geslaagde sync van de geserveerde data, of None."""
+        if self._store.synced_at is None:
+            return None
+        return max(0.0, (datetime.now(timezone.utc) - self._store.synced_at).total_seconds())
+    
+    async def get_snapshot(self) -> GroepenStore:
+        """Geef de lokale store, gesynct volgens de cache TTL (bijv. voor de zoekindex)."""
+        return await self._groepen_cache.get()
+    
+    async def _index(self) -> GroepenIndex:
+        """Geef de index van de lokale store, gesynct volgens de cache TTL."""
+        store = await self._groepen_cache.get()
+        return store.index()
+    
+    async def encoded(self, key: Hashable, build: Callable[[GroepenIndex], Any]) -> Any:
+        """
+        Geef een voorgecodeerde response, hergebruikt zolang de store niet wijzigt.
+        
+        Args:
+            key: Sleutel van de query (filters, cursor, velden)
+            build: Bouwt de response uit de index van de huidige snapshot
+        """
+        store = await self._groepen_cache.get()
+        return store.encoded(key, lambda: build(store.index()))
+    
+    def start_background_sync(self, coordinator=None):
+        """
+        Start de periodieke sync als achtergrondtaak.
+        
+        Args:
+            coordinator: FileCoordinator of MongoCoordinator als meerdere workers
+                samenwerken; alleen de gekozen leider synct dan met Airtable
+        """
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        if coordinator is None:
+            self._sync_task = asyncio.create_task(
+                self._sync.run_periodic(self._groepen_cache.refresh)
+            )
+            return
+        self._coordinator = coordinator
+        self._is_leader = False
+        self._sync_task = asyncio.create_task(self._run_coordinated())
+    
+    async def _run_coordinated(self):
+        """
+        Elke tick: bepaal of dit proces leider is, sync dan (volgens het sync
+        interval) met Airtable en publiceer, of neem als volger de laatste
+        gepubliceerde snapshot over.
+        """
+        request_priority.set(Priority.BACKGROUND)
+        last_sync: Optional[float] = None
+        while True:
+            try:
+                is_leader = await self._coordinator.acquire()
+                if is_leader != self._is_leader:
+                    logger.info(f"Airtable sync {'leider' if is_leader else 'volger'} geworden")
+                    self._is_leader = is_leader
+                    last_sync = None
+                if not is_leader and self._store.synced_at is None:
+                    # Volger zonder data: wacht stil tot de leider zijn eerste snapshot publiceert
+                    snapshot = await self._coordinator.fetch()
+                    if snapshot is None:
+                        await asyncio.sleep(self._coordinator.tick)
+                        continue
+                    self._apply_snapshot(snapshot)
+                if not is_leader or last_sync is None or time.monotonic() - last_sync >= self._sync.interval:
+                    await self._groepen_cache.refresh()
+                    if is_leader:
+                        last_sync = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Fout bij gecoördineerde Airtable sync: {str(e)}")
+            await asyncio.sleep(self._coordinator.tick)
+    
+    async def stop_background_sync(self):
+        """Stop de periodieke sync."""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+    
     def _transform_record_to_model(self, record: dict) -> GLIGroepResponse:
         """Transform Airtable record naar GLI groep model."""
         fields = record.get("fields", {})
@@ -63,10 +271,29 @@ class AirtableService:
             "Status": groep.status.value
         }
     
+    def _transform_update_to_fields(self, update: GLIGroepUpdate) -> dict:
+        """Transform update model naar Airtable fields, zonder None waarden."""
+        fields = {}
+        if update.gli_aanbieder is not None:
+            fields["GLI aanbieder"] = update.gli_aanbieder
+        if update.type_gli is not None:
+            fields["Type GLI"] = update.type_gli.value
+        if update.startdatum_groep is not None:
+            fields["Startdatum groep"] = update.startdatum_groep.isoformat()
+        if update.einddatum_groep is not None:
+            fields["Einddatum groep"] = update.einddatum_groep.isoformat()
+        if update.groepnummer is not None:
+            fields["Groepnummer"] = update.groepnummer
+        if update.status is not None:
+            fields["Status"] = update.status.value
+        return fields
+    
     async def get_all_groepen(self, 
                               gli_type: Optional[GLIType] = None,
                               status: Optional[GroupStatus] = None,
-                              aanbieder: Optional[str] = None) -> List[GLIGroepResponse]:
+                              aanbieder: Optional[str] = None,
+                              after: Optional[Tuple[date, str]] = None,
+                              limit: Optional[int] = None) -> List[GLIGroepResponse]:
         """
         Haal alle GLI groepen op met optionele filters.
         
@@ -74,30 +301,16 @@ class AirtableService:
             gli_type: Filter op GLI type
             status: Filter op status
             aanbieder: Filter op aanbieder
+            after: Keyset cursor, alleen groepen na deze (startdatum, id)
+            limit: Maximaal aantal groepen
             
         Returns:
             Lijst van GLI groepen
         """
         try:
-            # Build formula for filtering
-            conditions = []
-            if gli_type:
-                conditions.append(f"{{Type GLI}}='{gli_type.value}'")
-            if status:
-                conditions.append(f"{{Status}}='{status.value}'")
-            if aanbieder:
-                conditions.append(f"{{GLI aanbieder}}='{aanbieder}'")
-            
-            formula = None
-            if conditions:
-                formula = f"AND({', '.join(conditions)})" if len(conditions) > 1 else conditions[0]
-            
-            records = self.gli_table.all(
-                formula=formula,
-                sort=["Startdatum groep"]
-            )
-            
-            groepen = [self._transform_record_to_model(record) for record in records]
+            index = await self._index()
+            groepen = index.query(gli_type=gli_type, status=status, aanbieder=aanbieder,
+                                  after=after, limit=limit)
             logger.info(f"Opgehaald {len(groepen)} GLI groepen")
             return groepen
             
@@ -105,6 +318,18 @@ class AirtableService:
             logger.error(f"Fout bij ophalen GLI groepen: {str(e)}")
             raise
     
+    async def export_groepen(self) -> AsyncIterator[List[GLIGroepResponse]]:
+        """
+        Itereer pagina voor pagina over alle groepen, rechtstreeks uit Airtable.
+        
+        Yields:
+            Lijst van GLI groepen per Airtable pagina
+        """
+        # Een volledige export wijkt voor interactieve requests
+        request_priority.set(Priority.BACKGROUND)
+        async for page in self.gli_table.iterate():
+            yield [self._transform_record_to_model(record) for record in page]
+    
     async def get_groep_by_id(self, groep_id: str) -> Optional[GLIGroepResponse]:
         """
         Haal specifieke GLI groep op via ID.
@@ -115,9 +340,24 @@ class AirtableService:
         Returns:
             GLI groep of None
         """
+        # Een volger leest uit de snapshot van de leider; alleen onbekende ids gaan naar Airtable
+        if not self._is_leader and self._store.synced_at is not None and groep_id in self._store:
+            return self._store.get(groep_id)
         try:
-            record = self.gli_table.get(groep_id)
+            record = await self._single_flight.do(
+                ("get", groep_id), lambda: self.gli_table.get(groep_id)
+            )
             return self._transform_record_to_model(record)
+        except (CircuitOpenError, httpx.TransportError) as e:
+            # Airtable onbereikbaar: val terug op de lokale kopie
+            logger.warning(f"Groep {groep_id} uit lokale store, Airtable niet bereikbaar: {str(e)}")
+            return self._store.get(groep_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500 or e.response.status_code == 429:
+                logger.warning(f"Groep {groep_id} uit lokale store na Airtable fout: {str(e)}")
+                return self._store.get(groep_id)
+            logger.error(f"Fout bij ophalen groep {groep_id}: {str(e)}")
+            return None
         except Exception as e:
             logger.error(f"Fout bij ophalen groep {groep_id}: {str(e)}")
             return None
@@ -134,9 +374,11 @@ class AirtableService:
         """
         try:
             fields = self._transform_model_to_fields(groep)
-            record = self.gli_table.create(fields)
+            record = await self.gli_table.create(fields)
             
             created_groep = self._transform_record_to_model(record)
+            self._store.upsert(created_groep)
+            self._notify_snapshot()
             logger.info(f"GLI groep aangemaakt: {created_groep.groepnummer}")
             return created_groep
             
@@ -156,27 +398,17 @@ class AirtableService:
             Geüpdatete GLI groep of None
         """
         try:
-            # Build update fields, skip None values
-            fields = {}
-            if update.gli_aanbieder is not None:
-                fields["GLI aanbieder"] = update.gli_aanbieder
-            if update.type_gli is not None:
-                fields["Type GLI"] = update.type_gli.value
-            if update.startdatum_groep is not None:
-                fields["Startdatum groep"] = update.startdatum_groep.isoformat()
-            if update.einddatum_groep is not None:
-                fields["Einddatum groep"] = update.einddatum_groep.isoformat()
-            if update.groepnummer is not None:
-                fields["Groepnummer"] = update.groepnummer
-            if update.status is not None:
-                fields["Status"] = update.status.value
+            fields = self._transform_update_to_fields(update)
             
             if not fields:
                 logger.warning("Geen velden om te updaten")
                 return await self.get_groep_by_id(groep_id)
             
-            record = self.gli_table.update(groep_id, fields)
+            record = await self.gli_table.update(groep_id, fields)
             updated_groep = self._transform_record_to_model(record)
+            self._store.upsert(updated_groep)
+            self._single_flight.forget(("get", groep_id))
+            self._notify_snapshot()
             logger.info(f"GLI groep geüpdatet: {updated_groep.groepnummer}")
             return updated_groep
             
@@ -195,13 +427,103 @@ class AirtableService:
             True als succesvol verwijderd
         """
         try:
-            self.gli_table.delete(groep_id)
+            await self.gli_table.delete(groep_id)
+            self._store.remove(groep_id)
+            self._single_flight.forget(("get", groep_id))
+            self._notify_snapshot()
             logger.info(f"GLI groep verwijderd: {groep_id}")
             return True
         except Exception as e:
             logger.error(f"Fout bij verwijderen GLI groep {groep_id}: {str(e)}")
             return False
     
+    async def batch_groepen(self, operations: List[GLIGroepBatchOperation]) -> List[GLIGroepBatchResult]:
+        """
+        Voer create/update/delete operaties uit via Airtable batch requests.
+        
+        Operaties worden per actie gebundeld in chunks van 10 records. Chunks van
+        dezelfde actie lopen gelijktijdig (maximaal AIRTABLE_BATCH_CONCURRENCY);
+        de acties zelf na elkaar: eerst create, dan update, dan delete.
+        
+        Args:
+            operations: Operaties in de volgorde van het request
+            
+        Returns:
+            Resultaat per operatie, in dezelfde volgorde
+        """
+        results: Dict[int, GLIGroepBatchResult] = {}
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        
+        for action in (BatchAction.CREATE, BatchAction.UPDATE, BatchAction.DELETE):
+            indexed = [(i, op) for i, op in enumerate(operations) if op.action == action]
+            chunks = [indexed[i:i + MAX_BATCH_SIZE] for i in range(0, len(indexed), MAX_BATCH_SIZE)]
+            await asyncio.gather(*(self._run_batch_chunk(action, chunk, results, semaphore) for chunk in chunks))
+        
+        self._notify_snapshot()
+        succeeded = sum(1 for result in results.values() if result.success)
+        logger.info(f"GLI groepen batch: {succeeded} geslaagd, {len(results) - succeeded} mislukt")
+        return [results[i] for i in range(len(operations))]
+    
+    async def _run_batch_chunk(self, action: BatchAction, chunk: list,
+                               results: Dict[int, GLIGroepBatchResult], semaphore: asyncio.Semaphore):
+        """
+        Stuur één chunk; bij een fout worden de operaties waar mogelijk los opnieuw geprobeerd.
+        
+        Een 4xx (behalve 429) betekent dat Airtable de hele batch geweigerd heeft,
+        bijv. door één ongeldig record; dan gaat elk record los. Update en delete
+        zijn idempotent en gaan ook na een 5xx of timeout los opnieuw. Een create
+        niet: na een 5xx of timeout kan Airtable de records toch hebben aangemaakt,
+        dus dan faalt de hele chunk en meldt de fout dat de uitkomst onbekend is.
+        """
+        async with semaphore:
+            try:
+                await self._send_batch(action, chunk, results)
+                return
+            except Exception as e:
+                status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                rejected = status_code is not None and 400 <= status_code < 500 and status_code != 429
+                unsent = isinstance(e, (CircuitOpenError, *NOT_SENT_ERRORS)) or status_code == 429
+                split = rejected or (action != BatchAction.CREATE and not isinstance(e, CircuitOpenError))
+                if len(chunk) == 1 or not split:
+                    error = str(e)
+                    if action == BatchAction.CREATE and not rejected and not unsent:
+                        error = f"Mogelijk toch aangemaakt in Airtable, controleer voor opnieuw proberen: {error}"
+                    for index, op in chunk:
+                        results[index] = GLIGroepBatchResult(index=index, action=action, success=False,
+                                                             id=op.id, error=error)
+                    return
+                logger.warning(f"Batch {action.value} van {len(chunk)} records mislukt, los opnieuw: {str(e)}")
+        
+        # Airtable batches slagen of falen als geheel; één ongeldig record mag de rest niet blokkeren
+        for item in chunk:
+            await self._run_batch_chunk(action, [item], results, semaphore)
+    
+    async def _send_batch(self, action: BatchAction, chunk: list, results: Dict[int, GLIGroepBatchResult]):
+        """Voer één Airtable batch request uit en werk de store bij."""
+        if action == BatchAction.CREATE:
+            records = await self.gli_table.batch_create(
+                [self._transform_model_to_fields(op.groep) for _, op in chunk]
+            )
+        elif action == BatchAction.UPDATE:
+            records = await self.gli_table.batch_update(
+                [(op.id, self._transform_update_to_fields(op.update)) for _, op in chunk]
+            )
+        else:
+            await self.gli_table.batch_delete([op.id for _, op in chunk])
+            for index, op in chunk:
+                self._store.remove(op.id)
+                self._single_flight.forget(("get", op.id))
+                results[index] = GLIGroepBatchResult(index=index, action=action, success=True, id=op.id)
+            return
+        
+        # Airtable geeft records terug in de volgorde van het request
+        for (index, _), record in zip(chunk, records):
+            groep = self._transform_record_to_model(record)
+            self._store.upsert(groep)
+            self._single_flight.forget(("get", groep.id))
+            results[index] = GLIGroepBatchResult(index=index, action=action, success=True,
+                                                 id=groep.id, groep=groep)
+    
     async def get_groepen_by_type(self, gli_type: GLIType) -> List[GLIGroepResponse]:
         """Haal groepen op voor specifiek GLI type."""
         return await self.get_all_groepen(gli_type=gli_type)
@@ -209,52 +531,54 @@ class AirtableService:
     async def get_actieve_groepen(self) -> List[GLIGroepResponse]:
         """Haal actieve groepen op (open voor inschrijving of gestart)."""
         try:
-            formula = "OR({Status}='Inschrijving open', {Status}='Gestart')"
-            records = self.gli_table.all(
-                formula=formula,
-                sort=["Startdatum groep"]
-            )
-            
-            return [self._transform_record_to_model(record) for record in records]
+            index = await self._index()
+            return index.by_statuses([GroupStatus.OPEN, GroupStatus.GESTART])
         except Exception as e:
             logger.error(f"Fout bij ophalen actieve groepen: {str(e)}")
             raise
     
+    async def get_beschikbare_groepen(self, queries: List[GLIBeschikbaarQuery]) -> List[List[GLIGroepResponse]]:
+        """
+        Beantwoord beschikbaarheidsvragen uit één snapshot.
+        
+        Args:
+            queries: Per vraag type, startdatum (standaard vandaag), aanbieder en limit
+            
+        Returns:
+            Per vraag de eerstvolgende groepen met open inschrijving
+        """
+        try:
+            index = await self._index()
+            today = date.today()
+            return [
+                index.beschikbaar(gli_type=query.gli_type, vanaf=query.vanaf or today,
+                                  aanbieder=query.aanbieder, limit=query.limit)
+                for query in queries
+            ]
+        except Exception as e:
+            logger.error(f"Fout bij ophalen beschikbare groepen: {str(e)}")
+            raise
+    
     async def get_statistics(self) -> GLIStatistics:
-        """Genereer statistieken voor GLI groepen."""
+        """Geef statistieken voor GLI groepen uit de bijgehouden tellers van de store."""
         try:
-            all_groepen = await self.get_all_groepen()
-            
-            total_groepen = len(all_groepen)
-            actieve_groepen = len([g for g in all_groepen if g.status in [GroupStatus.OPEN, GroupStatus.GESTART]])
-            geplande_groepen = len([g for g in all_groepen if g.status == GroupStatus.PLANNING])
-            volle_groepen = len([g for g in all_groepen if g.status == GroupStatus.VOL])
-            
-            # Count per type
-            per_type = {}
-            for gli_type in GLIType:
-                per_type[gli_type.value] = len([g for g in all_groepen if g.type_gli == gli_type])
-            
-            # Count per aanbieder
-            per_aanbieder = {}
-            for groep in all_groepen:
-                if groep.gli_aanbieder in per_aanbieder:
-                    per_aanbieder[groep.gli_aanbieder] += 1
-                else:
-                    per_aanbieder[groep.gli_aanbieder] = 1
-            
-            return GLIStatistics(
-                total_groepen=total_groepen,
-                actieve_groepen=actieve_groepen,
-                geplande_groepen=geplande_groepen,
-                volle_groepen=volle_groepen,
-                per_type=per_type,
-                per_aanbieder=per_aanbieder
-            )
-            
+            store = await self._groepen_cache.get()
+            return store.statistics()
         except Exception as e:
             logger.error(f"Fout bij genereren statistieken: {str(e)}")
             raise
+    
+    async def aclose(self):
+        """Stop de sync, geef het leiderschap vrij en sluit de HTTP connection pool."""
+        await self.stop_background_sync()
+        if self._mirror and self._is_leader and self._store.synced_at is not None:
+            await self._mirror.save(self._store, self._sync.watermark)
+        if self._coordinator:
+            try:
+                await self._coordinator.release()
+            except Exception as e:
+                logger.warning(f"Kan sync leiderschap niet vrijgeven: {str(e)}")
+        await self.gli_table.aclose()
 
 @lru_cache()
 def get_airtable_service() -> AirtableService:
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from airtable_client import AsyncAirtableTable
+from airtable_models import GLIGroepResponse
+from airtable_scheduler import Priority, request_priority
+from groepen_store import GroepenStore
+
+logger = logging.getLogger(__name__)
+
+class AirtableSync:
+    """
+    Incrementele sync van een Airtable tabel naar een GroepenStore.
+
+    De eerste sync haalt de volledige tabel op. Daarna worden alleen records
+    opgehaald die sinds het watermark gewijzigd zijn (LAST_MODIFIED_TIME), en
+    worden verwijderingen gedetecteerd met een pass die alleen record IDs en
+    één klein veld ophaalt.
+    """
+
+    def __init__(self, table: AsyncAirtableTable, store: GroepenStore,
+                 transform: Callable[[dict], GLIGroepResponse]):
+        """
+        Args:
+            table: Async Airtable tabel om te syncen
+            store: Lokale store die bijgewerkt wordt
+            transform: Zet een ruw Airtable record om naar een groep model
+        """
+        self.table = table
+        self.store = store
+        self.transform = transform
+
+        self.interval = float(os.environ.get('AIRTABLE_SYNC_INTERVAL', '30'))
+        # Marge voor klokverschil en de seconde-resolutie van LAST_MODIFIED_TIME
+        self.overlap = timedelta(seconds=float(os.environ.get('AIRTABLE_SYNC_OVERLAP', '5')))
+        # Verwijderingen worden elke N syncs gecontroleerd
+        self.delete_check_every = max(1, int(os.environ.get('AIRTABLE_SYNC_DELETE_CHECK_EVERY', '5')))
+        self.id_field = os.environ.get('AIRTABLE_SYNC_ID_FIELD', 'Groepnummer')
+
+        self.watermark: Optional[datetime] = None
+        self._syncs_since_delete_check = 0
+
+    def restore(self, watermark: Optional[datetime]):
+        """Ga verder vanaf een eerder opgeslagen watermark (bijv. uit de snapshot mirror)."""
+        self.watermark = watermark
+        # Verwijderingen van terwijl dit proces niet draaide direct meenemen
+        self._syncs_since_delete_check = self.delete_check_every - 1
+
+    async def full_sync(self) -> int:
+        """Haal de volledige tabel op en vervang de store."""
+        started = datetime.now(timezone.utc)
+        records = await self.table.all()
+        self.store.replace_all(self.transform(record) for record in records)
+        self.watermark = started
+        self.store.synced_at = started
+        self._syncs_since_delete_check = 0
+        logger.info(f"Volledige sync: {len(records)} GLI groepen")
+        return len(records)
+
+    async def incremental_sync(self) -> int:
+        """Haal alleen records op die sinds het watermark gewijzigd zijn."""
+        started = datetime.now(timezone.utc)
+        since = (self.watermark - self.overlap).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        formula = f"IS_AFTER(LAST_MODIFIED_TIME(), '{since}')"
+
+        changed = await self.table.all(formula=formula)
+        for record in changed:
+            self.store.upsert(self.transform(record))
+
+        removed = 0
+        self._syncs_since_delete_check += 1
+        if self._syncs_since_delete_check >= self.delete_check_every:
+            removed = await self.detect_deletions()
+
+        self.watermark = started
+        self.store.synced_at = started
+        if changed or removed:
+            logger.info(f"Incrementele sync: {len(changed)} gewijzigd, {removed} verwijderd")
+        return len(changed) + removed
+
+    async def detect_deletions(self) -> int:
+        """Vergelijk upstream record IDs met de store en verwijder wat ontbreekt."""
+        upstream_ids = set()
+        async for page in self.table.iterate(fields=[self.id_field]):
+            upstream_ids.update(record["id"] for record in page)
+        self._syncs_since_delete_check = 0
+        return self.store.retain(upstream_ids)
+
+    async def sync_once(self) -> GroepenStore:
+        """Voer één sync uit: volledig als er nog geen watermark is, anders incrementeel."""
+        if self.watermark is None:
+            await self.full_sync()
+        else:
+            await self.incremental_sync()
+        return self.store
+
+    async def run_periodic(self, sync: Callable):
+        """
+        Blijf periodiek syncen tot de taak geannuleerd wordt.
+
+        Args:
+            sync: Coroutine functie die één sync uitvoert
+        """
+        # Periodieke sync wijkt voor requests van gebruikers
+        request_priority.set(Priority.BACKGROUND)
+        logger.info(f"Periodieke Airtable sync gestart (interval {self.interval}s)")
+        while True:
+            try:
+                await sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Fout bij periodieke Airtable sync: {str(e)}")
+            await asyncio.sleep(self.interval)
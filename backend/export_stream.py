@@ -0,0 +1,97 @@
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+import pydantic_core
+from fastapi.responses import StreamingResponse
+
+# Rows per chunk when reading from a Mongo cursor
+EXPORT_CHUNK_SIZE = 500
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+async def cursor_batches(cursor, size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[list]:
+    """Group documents from a Mongo cursor into lists of at most `size`."""
+    batch = []
+    async for document in cursor.batch_size(size):
+        batch.append(document)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def _prefetched(first: list, batches: AsyncIterator[list]) -> AsyncIterator[list]:
+    yield first
+    async for batch in batches:
+        yield batch
+
+async def prefetch(batches: AsyncIterator[list]) -> AsyncIterator[list]:
+    """
+    Fetch the first batch before the response starts.
+
+    Errors reaching the source then still become a proper error status
+    instead of a truncated 200 response.
+    """
+    try:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = []
+    return _prefetched(first, batches)
+
+async def ndjson_chunks(batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(pydantic_core.to_json(row) + b"\n" for row in batch)
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return pydantic_core.to_json(value).decode()
+    return value
+
+async def csv_chunks(batches: AsyncIterator[list], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        for row in batch:
+            row = pydantic_core.to_jsonable_python(row)
+            writer.writerow([_csv_value(row.get(column)) for column in columns])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+async def json_array_chunks(key: str, batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    """Stream `{"<key>": [...]}` one batch at a time."""
+    yield b'{"' + key.encode() + b'":['
+    first = True
+    async for batch in batches:
+        if not batch:
+            continue
+        chunk = b",".join(pydantic_core.to_json(row) for row in batch)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]}"
+
+async def export_response(batches: AsyncIterator[list], format: ExportFormat,
+                          columns: Sequence[str], filename: str) -> StreamingResponse:
+    """Stream rows (dicts or models) as NDJSON or CSV; the first batch is fetched before responding."""
+    batches = await prefetch(batches)
+    if format == ExportFormat.CSV:
+        chunks = csv_chunks(batches, columns)
+    else:
+        chunks = ndjson_chunks(batches)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format.value}"'},
+    )
@@ -0,0 +1,31 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Type
+
+import pydantic_core
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+def serialize_models(model: Type[BaseModel], items: list, fields: Optional[List[str]] = None) -> bytes:
+    """Serialize a list of models straight to JSON bytes, optionally only `fields`."""
+    include = {"__all__": set(fields)} if fields else None
+    return _list_adapter(model).dump_json(items, include=include)
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered by pydantic-core instead of jsonable_encoder + json.dumps.
+
+    Routes opt in by returning this response directly, which also skips
+    FastAPI's response_model validation; only return models that were already
+    validated. Bytes are sent as-is, so pre-encoded bodies can be reused.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return pydantic_core.to_json(content)
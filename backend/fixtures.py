@@ -0,0 +1,172 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pymongo import InsertOne, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+SEED_FIXTURE = FIXTURES_DIR / 'seed.json'
+
+# Documents per bulk_write round trip
+FIXTURE_BATCH_SIZE = int(os.environ.get('FIXTURE_BATCH_SIZE', '1000'))
+
+# Fields that are generated once and must not change when a fixture is loaded again
+INSERT_ONLY_FIELDS = ("id", "created_at")
+
+class FixtureSpec(NamedTuple):
+    """How to validate and identify the documents of one collection."""
+    model: Type[BaseModel]
+    natural_key: Tuple[str, ...]
+
+def read_fixture_file(path: Path) -> Dict[str, List[dict]]:
+    """Read a fixture set: a JSON object mapping collection name to a list of documents."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(isinstance(rows, list) for rows in data.values()):
+        raise ValueError(f"{path}: expected an object of collection name -> list of documents")
+    return data
+
+def validate_rows(collection: str, spec: FixtureSpec, rows: List[dict]) -> List[dict]:
+    """Validate all rows of a collection in one pass and return Mongo-ready documents."""
+    try:
+        models = TypeAdapter(List[spec.model]).validate_python(rows)
+    except ValidationError as e:
+        raise ValueError(f"Invalid {collection} fixtures: {e}") from e
+    return [model.model_dump() for model in models]
+
+def _upsert(document: dict, natural_key: Tuple[str, ...]) -> UpdateOne:
+    key = {field: document[field] for field in natural_key}
+    fields = {k: v for k, v in document.items() if k not in INSERT_ONLY_FIELDS}
+    on_insert = {k: document[k] for k in INSERT_ONLY_FIELDS if k in document}
+    return UpdateOne(key, {"$set": fields, "$setOnInsert": on_insert}, upsert=True)
+
+def _batches(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+async def load_collection(db, collection: str, spec: FixtureSpec, rows: List[dict],
+                          upsert: bool = True) -> dict:
+    """
+    Validate and write one collection's fixtures with unordered bulk writes.
+
+    With `upsert` (the default) documents are matched on the natural key, so
+    loading the same fixtures again updates them instead of adding duplicates.
+    Without it documents are inserted blindly, which is faster for an empty
+    collection.
+    """
+    started = time.perf_counter()
+    documents = validate_rows(collection, spec, rows)
+    validated = time.perf_counter()
+
+    totals = {"inserted": 0, "upserted": 0, "matched": 0, "modified": 0}
+    for batch in _batches(documents, FIXTURE_BATCH_SIZE):
+        if upsert:
+            requests = [_upsert(document, spec.natural_key) for document in batch]
+        else:
+            requests = [InsertOne(document) for document in batch]
+        result = await db[collection].bulk_write(requests, ordered=False)
+        totals["inserted"] += result.inserted_count
+        totals["upserted"] += result.upserted_count
+        totals["matched"] += result.matched_count
+        totals["modified"] += result.modified_count
+
+    finished = time.perf_counter()
+    report = {
+        "documents": len(documents),
+        **totals,
+        "validate_seconds": round(validated - started, 3),
+        "write_seconds": round(finished - validated, 3),
+    }
+    logger.info(f"Loaded {len(documents)} {collection} fixtures in {finished - started:.2f}s")
+    return report
+
+async def load_fixtures(db, fixtures: Dict[str, List[dict]], specs: Dict[str, FixtureSpec],
+                        upsert: bool = True) -> Dict[str, dict]:
+    """
+    Load a fixture set; every collection must have a FixtureSpec.
+
+    Returns:
+        Counts and timings per collection
+    """
+    unknown = set(fixtures) - set(specs)
+    if unknown:
+        raise ValueError(f"No fixture spec for: {', '.join(sorted(unknown))}")
+    return {
+        collection: await load_collection(db, collection, specs[collection], rows, upsert)
+        for collection, rows in fixtures.items()
+    }
+
+def synthetic_fixtures(resources: int = 0, events: int = 0, seed: int = 0) -> Dict[str, List[dict]]:
+    """Generate a deterministic load-test set of resources and events."""
+    rng = random.Random(seed)
+    roles = ["inwoner", "deelnemer", "verwijzer", "professional"]
+    categories = ["exercise", "recipe", "document", "link"]
+    locations = ["Zeist Centrum", "Zeist West", "Vollenhove", "Kerckebosch", "Austerlitz"]
+    start = datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+    fixtures: Dict[str, List[dict]] = {}
+    if resources:
+        fixtures["resources"] = [
+            {
+                "title": f"Resource {i:06d}",
+                "description": f"Synthetische resource {i} voor belastingtests.",
+                "category": categories[i % len(categories)],
+                "content": f"https://example.org/resources/{i}",
+                "target_role": rng.sample(roles, rng.randint(1, len(roles))),
+            }
+            for i in range(resources)
+        ]
+    if events:
+        fixtures["events"] = [
+            {
+                "title": f"Bijeenkomst {i:06d}",
+                "description": f"Synthetische bijeenkomst {i} voor belastingtests.",
+                "date": (start + timedelta(hours=rng.randint(0, 24 * 730))).isoformat(),
+                "location": rng.choice(locations),
+                "target_audience": rng.sample(roles, rng.randint(1, len(roles))),
+            }
+            for i in range(events)
+        ]
+    return fixtures
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load fixture sets into MongoDB")
+    parser.add_argument("files", nargs="*", type=Path, help=f"Fixture files (default: {SEED_FIXTURE.name})")
+    parser.add_argument("--synthetic-resources", type=int, default=0)
+    parser.add_argument("--synthetic-events", type=int, default=0)
+    parser.add_argument("--insert", action="store_true", help="insert_many instead of upserts, for empty collections")
+    parser.add_argument("--dump", type=Path, help="Write the synthetic set to this file instead of loading it")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    synthetic = synthetic_fixtures(args.synthetic_resources, args.synthetic_events)
+    if args.dump:
+        args.dump.write_text(json.dumps(synthetic, ensure_ascii=False))
+        raise SystemExit(0)
+
+    # The models live in server.py, which also loads .env and connects to Mongo
+    from server import FIXTURE_SPECS, client, db
+
+    async def main():
+        files = args.files or ([] if synthetic else [SEED_FIXTURE])
+        report = {}
+        for path in files:
+            report[str(path)] = await load_fixtures(db, read_fixture_file(path), FIXTURE_SPECS, not args.insert)
+        if synthetic:
+            report["synthetic"] = await load_fixtures(db, synthetic, FIXTURE_SPECS, not args.insert)
+        client.close()
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
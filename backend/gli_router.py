@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Tuple
+from datetime import date
 import logging
 
 from airtable_service import get_airtable_service, AirtableService
@@ -9,8 +11,17 @@ from airtable_models import (
     GLIGroepUpdate,
     GLIStatistics,
     GLIType,
-    GroupStatus
+    GroupStatus,
+    GLIGroepBatchRequest,
+    GLIGroepBatchResponse,
+    GLIBeschikbaarQuery,
+    GLIBeschikbaarBatchRequest,
+    GLIBeschikbaarBatchResponse
 )
+from export_stream import ExportFormat, export_response, json_array_chunks, prefetch
+from fast_json import FastJSONResponse, serialize_models
+from groepen_index import GroepenIndex
+from pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, parse_fields
 
 logger = logging.getLogger(__name__)
 
@@ -23,36 +34,73 @@ router = APIRouter(
     }
 )
 
-@router.get("/", response_model=List[GLIGroepResponse])
+SNAPSHOT_AGE_HEADER = "X-Snapshot-Age"
+
+def set_snapshot_age(response: Response, service: AirtableService):
+    """Zet de leeftijd van de geserveerde snapshot (seconden sinds de laatste sync) in een header."""
+    age = service.snapshot_age()
+    if age is not None:
+        response.headers[SNAPSHOT_AGE_HEADER] = str(int(age))
+
+@router.get("/", response_model=List[GLIGroepResponse], response_class=FastJSONResponse)
 async def get_gli_groepen(
     gli_type: Optional[GLIType] = Query(None, description="Filter op GLI type"),
     status: Optional[GroupStatus] = Query(None, description="Filter op status"),
     aanbieder: Optional[str] = Query(None, description="Filter op aanbieder"),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximaal aantal groepen per pagina"),
+    after: Optional[str] = Query(None, description="Cursor uit de X-Next-Cursor header van de vorige pagina"),
+    fields: Optional[str] = Query(None, description="Komma-gescheiden lijst van velden om terug te geven"),
     service: AirtableService = Depends(get_airtable_service)
 ):
     """
     Haal alle GLI groepen op.
     
-    Retourneert lijst van alle GLI groepen, optioneel gefilterd.
+    Retourneert lijst van GLI groepen op startdatum, optioneel gefilterd.
+    Als er meer groepen zijn dan `limit` staat de cursor voor de volgende
+    pagina in de X-Next-Cursor header.
     """
-    try:
-        groepen = await service.get_all_groepen(
+    selected_fields = parse_fields(fields, GLIGroepResponse)
+    after_key = None
+    if after:
+        cursor = decode_cursor(after)
+        try:
+            after_key = (date.fromisoformat(cursor["startdatum"]), cursor["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Ongeldige cursor")
+    
+    def build(index: GroepenIndex) -> Tuple[bytes, Optional[str], int]:
+        # Eén extra groep ophalen om te weten of er een volgende pagina is
+        groepen = index.query(
             gli_type=gli_type,
             status=status,
-            aanbieder=aanbieder
+            aanbieder=aanbieder,
+            after=after_key,
+            limit=limit + 1
         )
-        
-        logger.info(f"Retourneer {len(groepen)} GLI groepen")
-        return groepen
-        
+        next_cursor = None
+        if len(groepen) > limit:
+            groepen = groepen[:limit]
+            last = groepen[-1]
+            next_cursor = encode_cursor({"startdatum": last.startdatum_groep.isoformat(), "id": last.id})
+        return serialize_models(GLIGroepResponse, groepen, selected_fields), next_cursor, len(groepen)
+    
+    try:
+        # Zolang de snapshot niet wijzigt worden dezelfde bytes opnieuw verstuurd
+        key = ("groepen", gli_type, status, aanbieder, after_key, limit, tuple(selected_fields or ()))
+        body, next_cursor, count = await service.encoded(key, build)
     except Exception as e:
         logger.error(f"Fout bij ophalen GLI groepen: {str(e)}")
         raise HTTPException(
             status_code=503,
             detail="Kan GLI groepen niet ophalen uit Airtable"
         )
+    
+    logger.info(f"Retourneer {count} GLI groepen")
+    response = FastJSONResponse(body, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+    set_snapshot_age(response, service)
+    return response
 
-@router.get("/actief", response_model=List[GLIGroepResponse])
+@router.get("/actief", response_model=List[GLIGroepResponse], response_class=FastJSONResponse)
 async def get_actieve_groepen(
     service: AirtableService = Depends(get_airtable_service)
 ):
@@ -63,7 +111,9 @@ async def get_actieve_groepen(
     """
     try:
         groepen = await service.get_actieve_groepen()
-        return groepen
+        response = FastJSONResponse(serialize_models(GLIGroepResponse, groepen))
+        set_snapshot_age(response, service)
+        return response
     except Exception as e:
         logger.error(f"Fout bij ophalen actieve groepen: {str(e)}")
         raise HTTPException(
@@ -71,7 +121,7 @@ async def get_actieve_groepen(
             detail="Kan actieve groepen niet ophalen"
         )
 
-@router.get("/type/{gli_type}", response_model=List[GLIGroepResponse])
+@router.get("/type/{gli_type}", response_model=List[GLIGroepResponse], response_class=FastJSONResponse)
 async def get_groepen_by_type(
     gli_type: GLIType,
     service: AirtableService = Depends(get_airtable_service)
@@ -83,7 +133,9 @@ async def get_groepen_by_type(
     """
     try:
         groepen = await service.get_groepen_by_type(gli_type)
-        return groepen
+        response = FastJSONResponse(serialize_models(GLIGroepResponse, groepen))
+        set_snapshot_age(response, service)
+        return response
     except Exception as e:
         logger.error(f"Fout bij ophalen groepen voor type {gli_type}: {str(e)}")
         raise HTTPException(
@@ -93,6 +145,7 @@ async def get_groepen_by_type(
 
 @router.get("/statistieken", response_model=GLIStatistics)
 async def get_statistieken(
+    response: Response,
     service: AirtableService = Depends(get_airtable_service)
 ):
     """
@@ -102,6 +155,7 @@ async def get_statistieken(
     """
     try:
         stats = await service.get_statistics()
+        set_snapshot_age(response, service)
         return stats
     except Exception as e:
         logger.error(f"Fout bij ophalen statistieken: {str(e)}")
@@ -110,6 +164,92 @@ async def get_statistieken(
             detail="Kan statistieken niet ophalen"
         )
 
+@router.get("/beschikbaar", response_model=List[GLIGroepResponse], response_class=FastJSONResponse)
+async def get_beschikbare_groepen(
+    gli_type: Optional[GLIType] = Query(None, description="Filter op GLI type"),
+    vanaf: Optional[date] = Query(None, description="Startdatum op of na deze datum (standaard vandaag)"),
+    aanbieder: Optional[str] = Query(None, description="Filter op aanbieder"),
+    limit: int = Query(5, ge=1, le=100, description="Maximaal aantal groepen"),
+    service: AirtableService = Depends(get_airtable_service)
+):
+    """
+    Haal de eerstvolgende groepen met open inschrijving op.
+    
+    Retourneert groepen met status "Inschrijving open" of "Beschikbaar" die
+    op of na `vanaf` starten, gesorteerd op startdatum. De index houdt deze
+    groepen per type en aanbieder op datum gesorteerd bij, dus er wordt niet
+    gescand.
+    """
+    query = GLIBeschikbaarQuery(gli_type=gli_type, vanaf=vanaf or date.today(), aanbieder=aanbieder, limit=limit)
+    
+    def build(index: GroepenIndex) -> bytes:
+        groepen = index.beschikbaar(gli_type=query.gli_type, vanaf=query.vanaf,
+                                    aanbieder=query.aanbieder, limit=query.limit)
+        return serialize_models(GLIGroepResponse, groepen)
+    
+    try:
+        key = ("beschikbaar", query.gli_type, query.vanaf, query.aanbieder, query.limit)
+        body = await service.encoded(key, build)
+    except Exception as e:
+        logger.error(f"Fout bij ophalen beschikbare groepen: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Kan beschikbare groepen niet ophalen"
+        )
+    
+    response = FastJSONResponse(body)
+    set_snapshot_age(response, service)
+    return response
+
+@router.post("/beschikbaar/batch", response_model=GLIBeschikbaarBatchResponse)
+async def get_beschikbare_groepen_batch(
+    request: GLIBeschikbaarBatchRequest,
+    response: Response,
+    service: AirtableService = Depends(get_airtable_service)
+):
+    """
+    Beantwoord veel beschikbaarheidsvragen in één request.
+    
+    Elke vraag (type, vanaf, aanbieder, limit) wordt uit dezelfde snapshot
+    beantwoord; de resultaten staan in dezelfde volgorde als de vragen.
+    """
+    try:
+        results = await service.get_beschikbare_groepen(request.queries)
+    except Exception as e:
+        logger.error(f"Fout bij batch beschikbaarheid: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Kan beschikbare groepen niet ophalen"
+        )
+    
+    set_snapshot_age(response, service)
+    return GLIBeschikbaarBatchResponse(results=results)
+
+@router.get("/export")
+async def export_groepen(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson of csv"),
+    service: AirtableService = Depends(get_airtable_service)
+):
+    """
+    Exporteer alle GLI groepen als NDJSON of CSV.
+    
+    De groepen worden per Airtable pagina gestreamd, zodat het geheugengebruik
+    niet groeit met de tabel en de eerste regels na één pagina binnenkomen.
+    """
+    try:
+        return await export_response(
+            service.export_groepen(),
+            format,
+            columns=list(GLIGroepResponse.model_fields),
+            filename="gli-groepen"
+        )
+    except Exception as e:
+        logger.error(f"Fout bij exporteren GLI groepen: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Kan GLI groepen niet exporteren"
+        )
+
 @router.get("/{groep_id}", response_model=GLIGroepResponse)
 async def get_groep(
     groep_id: str,
@@ -162,6 +302,27 @@ async def create_groep(
             detail="Kan GLI groep niet aanmaken"
         )
 
+@router.post("/batch", response_model=GLIGroepBatchResponse)
+async def batch_groepen(
+    request: GLIGroepBatchRequest,
+    service: AirtableService = Depends(get_airtable_service)
+):
+    """
+    Voer meerdere create/update/delete operaties in één request uit.
+    
+    Operaties worden gebundeld in Airtable batch requests van 10 records.
+    Retourneert per operatie of die geslaagd is, in de volgorde van het request.
+    Faalt een create na een serverfout of timeout, dan is niet zeker of
+    Airtable de groep toch heeft aangemaakt; de fout van die operaties zegt dat.
+    """
+    results = await service.batch_groepen(request.operations)
+    succeeded = sum(1 for result in results if result.success)
+    return GLIGroepBatchResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
 @router.put("/{groep_id}", response_model=GLIGroepResponse)
 async def update_groep(
     groep_id: str,
@@ -194,14 +355,14 @@ async def update_groep(
             detail="Kan GLI groep niet updaten"
         )
 
-@router.get("/debug/raw")
+@router.get("/debug/raw", response_class=FastJSONResponse)
 async def debug_raw_airtable_data(
     service: AirtableService = Depends(get_airtable_service)
 ):
-    """Debug endpoint om ruwe Airtable data te bekijken."""
+    """Debug endpoint om ruwe Airtable data te bekijken, per pagina gestreamd."""
     try:
-        records = service.gli_table.all()
-        return {"raw_records": records}
+        pages = await prefetch(service.gli_table.iterate())
+        return StreamingResponse(json_array_chunks("raw_records", pages), media_type="application/json")
     except Exception as e:
         return {"error": str(e)}
 
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SnapshotCache(Generic[T]):
+    """
+    In-memory TTL cache voor een volledige snapshot, met stale-while-revalidate.
+
+    Binnen de TTL wordt de snapshot direct geretourneerd. Daarna wordt de oude
+    snapshot nog geserveerd terwijl één achtergrondtaak ververst. Gelijktijdige
+    misses (lege cache) wachten samen op één upstream fetch.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[T]], ttl: float):
+        """
+        Args:
+            loader: Coroutine functie die een verse snapshot ophaalt
+            ttl: Aantal seconden dat een snapshot als vers geldt
+        """
+        self._loader = loader
+        self.ttl = ttl
+        self._value: Optional[T] = None
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._inflight: Optional[asyncio.Task] = None
+        self._inflight_generation = -1
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def age(self) -> Optional[float]:
+        """Leeftijd van de huidige snapshot in seconden, of None als leeg."""
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def is_fresh(self) -> bool:
+        age = self.age
+        return age is not None and age < self.ttl
+
+    async def get(self) -> T:
+        """Geef de snapshot; ververs op de achtergrond als die verlopen is."""
+        if self._value is not None:
+            self.hits += 1
+            if not self.is_fresh():
+                self._start_load()
+            return self._value
+
+        self.misses += 1
+        # asyncio.shield: een afgebroken request mag de gedeelde fetch niet annuleren
+        return await asyncio.shield(self._start_load())
+
+    async def refresh(self) -> T:
+        """Ververs nu, of wacht op de refresh die al loopt."""
+        return await asyncio.shield(self._start_load())
+
+    def prime(self, value: T, age: float = 0.0):
+        """Vul de cache met een bestaande snapshot van `age` seconden oud."""
+        self._value = value
+        self._loaded_at = time.monotonic() - age
+
+    def invalidate(self):
+        """Gooi de snapshot weg; lopende fetches van vóór de invalidatie worden genegeerd."""
+        self._generation += 1
+        self._value = None
+        self._loaded_at = None
+
+    def _start_load(self) -> asyncio.Task:
+        """Start een fetch, of hergebruik de fetch die al loopt voor deze generatie."""
+        if (self._inflight is not None and not self._inflight.done()
+                and self._inflight_generation == self._generation):
+            return self._inflight
+
+        self._inflight_generation = self._generation
+        self._inflight = asyncio.create_task(self._load(self._generation))
+        self._inflight.add_done_callback(self._log_failure)
+        return self._inflight
+
+    async def _load(self, generation: int) -> T:
+        value = await self._loader()
+        if generation == self._generation:
+            self._value = value
+            self._loaded_at = time.monotonic()
+        return value
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        # Haal de exceptie altijd op, ook als niemand op een achtergrond-refresh wacht
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Verversen van snapshot mislukt: {task.exception()}")
@@ -0,0 +1,133 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from airtable_models import GLIGroepResponse, GLIType, GroupStatus
+
+# Statussen waarvoor een verwijzer nog kan inschrijven
+BESCHIKBARE_STATUSSEN = frozenset({GroupStatus.OPEN, GroupStatus.BESCHIKBAAR})
+
+class GroepenIndex:
+    """
+    In-memory index over één groepen snapshot.
+
+    De groepen worden eenmalig gesorteerd op startdatum; de postings per type,
+    status en aanbieder zijn posities in die volgorde en dus ook op datum
+    gesorteerd. Filteren is daardoor een doorsnede van postings zonder sortering
+    of netwerkverkeer.
+    """
+
+    def __init__(self, groepen: Iterable[GLIGroepResponse]):
+        self.groepen: List[GLIGroepResponse] = sorted(groepen, key=self.sort_key)
+        # Sorteersleutel per positie, voor keyset paginering met bisect
+        self._keys: List[Tuple[date, str]] = [self.sort_key(g) for g in self.groepen]
+        self._by_type: Dict[GLIType, List[int]] = defaultdict(list)
+        self._by_status: Dict[GroupStatus, List[int]] = defaultdict(list)
+        self._by_aanbieder: Dict[str, List[int]] = defaultdict(list)
+        # Beschikbare groepen per (type, aanbieder), None = alle; startdatums voor bisect
+        self._beschikbaar: Dict[tuple, Tuple[List[date], List[int]]] = defaultdict(lambda: ([], []))
+
+        for pos, groep in enumerate(self.groepen):
+            self._by_type[groep.type_gli].append(pos)
+            self._by_status[groep.status].append(pos)
+            self._by_aanbieder[groep.gli_aanbieder].append(pos)
+            if groep.status in BESCHIKBARE_STATUSSEN:
+                for key in ((groep.type_gli, None), (groep.type_gli, groep.gli_aanbieder),
+                            (None, None), (None, groep.gli_aanbieder)):
+                    dates, positions = self._beschikbaar[key]
+                    dates.append(groep.startdatum_groep)
+                    positions.append(pos)
+
+        # Sets voor snelle membership checks bij het combineren van filters
+        self._sets: Dict[tuple, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.groepen)
+
+    def _members(self, key: tuple, postings: List[int]) -> Set[int]:
+        members = self._sets.get(key)
+        if members is None:
+            members = self._sets[key] = set(postings)
+        return members
+
+    def query(self,
+              gli_type: Optional[GLIType] = None,
+              status: Optional[GroupStatus] = None,
+              aanbieder: Optional[str] = None,
+              after: Optional[Tuple[date, str]] = None,
+              limit: Optional[int] = None) -> List[GLIGroepResponse]:
+        """
+        Filter groepen op type, status en/of aanbieder.
+
+        Args:
+            gli_type: Filter op GLI type
+            status: Filter op status
+            aanbieder: Filter op aanbieder (exacte naam)
+            after: Alleen groepen na deze (startdatum, id) sleutel
+            limit: Maximaal aantal groepen
+
+        Returns:
+            Gefilterde groepen, gesorteerd op startdatum
+        """
+        start = bisect_right(self._keys, after) if after else 0
+        filters = []
+        if gli_type:
+            filters.append((("type", gli_type), self._by_type.get(gli_type, [])))
+        if status:
+            filters.append((("status", status), self._by_status.get(status, [])))
+        if aanbieder:
+            filters.append((("aanbieder", aanbieder), self._by_aanbieder.get(aanbieder, [])))
+
+        if not filters:
+            end = len(self.groepen) if limit is None else start + limit
+            return self.groepen[start:end]
+
+        # Loop over de kleinste postings lijst en check de rest via sets
+        filters.sort(key=lambda f: len(f[1]))
+        (_, smallest), rest = filters[0], filters[1:]
+        others = [self._members(key, postings) for key, postings in rest]
+
+        result = []
+        for i in range(bisect_left(smallest, start), len(smallest)):
+            pos = smallest[i]
+            if all(pos in members for members in others):
+                result.append(self.groepen[pos])
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    @staticmethod
+    def sort_key(groep: GLIGroepResponse) -> Tuple[date, str]:
+        """Sleutel waarop de index sorteert en pagineert."""
+        return (groep.startdatum_groep, groep.id)
+
+    def beschikbaar(self,
+                    gli_type: Optional[GLIType] = None,
+                    vanaf: Optional[date] = None,
+                    aanbieder: Optional[str] = None,
+                    limit: int = 5) -> List[GLIGroepResponse]:
+        """
+        Eerstvolgende groepen met open inschrijving, zonder scan.
+
+        Args:
+            gli_type: Alleen dit GLI type
+            vanaf: Alleen groepen die op of na deze datum starten
+            aanbieder: Alleen deze aanbieder (exacte naam)
+            limit: Maximaal aantal groepen
+
+        Returns:
+            Groepen met status OPEN of BESCHIKBAAR, gesorteerd op startdatum
+        """
+        entry = self._beschikbaar.get((gli_type, aanbieder))
+        if entry is None:
+            return []
+        dates, positions = entry
+        start = bisect_left(dates, vanaf) if vanaf else 0
+        return [self.groepen[pos] for pos in positions[start:start + limit]]
+
+    def by_statuses(self, statuses: Iterable[GroupStatus]) -> List[GLIGroepResponse]:
+        """Groepen met één van de opgegeven statussen, gesorteerd op startdatum."""
+        postings = [self._by_status.get(status, []) for status in statuses]
+        return [self.groepen[pos] for pos in heapq.merge(*postings)]
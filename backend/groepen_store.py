@@ -0,0 +1,122 @@
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from airtable_models import GLIGroepResponse, GLIStatistics, GLIType, GroupStatus
+from groepen_index import GroepenIndex
+
+# Maximaal aantal voorgecodeerde responses per versie
+MAX_ENCODED = 128
+
+class GroepenStore:
+    """
+    Lokale kopie van de GLI tabel, bijgehouden door de sync engine.
+
+    Wijzigingen worden per record toegepast; de GroepenIndex wordt pas opnieuw
+    opgebouwd bij de eerstvolgende read na een wijziging. De statistieken worden
+    als tellers bijgehouden en per wijziging met een delta bijgewerkt.
+    """
+
+    def __init__(self):
+        self.records: Dict[str, GLIGroepResponse] = {}
+        self.version = 0
+        # Starttijd van de laatste geslaagde sync met Airtable
+        self.synced_at: Optional[datetime] = None
+        self._index: Optional[GroepenIndex] = None
+        self._index_version = -1
+
+        self._per_status: Counter = Counter()
+        self._per_type: Counter = Counter()
+        self._per_aanbieder: Counter = Counter()
+        self._statistics: Optional[GLIStatistics] = None
+        self._statistics_version = -1
+
+        self._encoded: Dict[Hashable, Any] = {}
+        self._encoded_version = -1
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, groep_id: str) -> bool:
+        return groep_id in self.records
+
+    def get(self, groep_id: str) -> Optional[GLIGroepResponse]:
+        return self.records.get(groep_id)
+
+    def replace_all(self, groepen: Iterable[GLIGroepResponse]):
+        """Vervang de volledige inhoud (initiële of volledige sync)."""
+        self.records = {}
+        self._per_status.clear()
+        self._per_type.clear()
+        self._per_aanbieder.clear()
+        for groep in groepen:
+            self.records[groep.id] = groep
+            self._count(groep, 1)
+        self.version += 1
+
+    def upsert(self, groep: GLIGroepResponse):
+        previous = self.records.get(groep.id)
+        if previous is not None:
+            self._count(previous, -1)
+        self.records[groep.id] = groep
+        self._count(groep, 1)
+        self.version += 1
+
+    def remove(self, groep_id: str) -> Optional[GLIGroepResponse]:
+        removed = self.records.pop(groep_id, None)
+        if removed is not None:
+            self._count(removed, -1)
+            self.version += 1
+        return removed
+
+    def _count(self, groep: GLIGroepResponse, delta: int):
+        """Tel een groep mee (+1) of haal hem uit de tellers (-1)."""
+        self._per_status[groep.status] += delta
+        self._per_type[groep.type_gli] += delta
+        self._per_aanbieder[groep.gli_aanbieder] += delta
+        if self._per_aanbieder[groep.gli_aanbieder] <= 0:
+            del self._per_aanbieder[groep.gli_aanbieder]
+
+    def retain(self, groep_ids: set) -> int:
+        """Verwijder alle records die niet meer upstream bestaan; geeft het aantal terug."""
+        stale = [groep_id for groep_id in self.records if groep_id not in groep_ids]
+        for groep_id in stale:
+            self.remove(groep_id)
+        return len(stale)
+
+    def index(self) -> GroepenIndex:
+        """Geef de index voor de huidige versie, zo nodig opnieuw opgebouwd."""
+        if self._index is None or self._index_version != self.version:
+            self._index = GroepenIndex(self.records.values())
+            self._index_version = self.version
+        return self._index
+
+    def statistics(self) -> GLIStatistics:
+        """Geef de statistieken voor de huidige versie vanuit de bijgehouden tellers."""
+        if self._statistics is None or self._statistics_version != self.version:
+            self._statistics = GLIStatistics(
+                total_groepen=len(self.records),
+                actieve_groepen=self._per_status[GroupStatus.OPEN] + self._per_status[GroupStatus.GESTART],
+                geplande_groepen=self._per_status[GroupStatus.PLANNING],
+                volle_groepen=self._per_status[GroupStatus.VOL],
+                per_type={gli_type.value: self._per_type[gli_type] for gli_type in GLIType},
+                per_aanbieder=dict(self._per_aanbieder)
+            )
+            self._statistics_version = self.version
+        return self._statistics
+
+    def encoded(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Geef een voorgecodeerde response voor `key` bij de huidige versie.
+
+        Zolang de store niet wijzigt, wordt dezelfde query niet opnieuw
+        geserialiseerd; bij een nieuwe versie vervallen alle entries.
+        """
+        if self._encoded_version != self.version:
+            self._encoded = {}
+            self._encoded_version = self.version
+        if key not in self._encoded:
+            if len(self._encoded) >= MAX_ENCODED:
+                self._encoded.pop(next(iter(self._encoded)))
+            self._encoded[key] = build()
+        return self._encoded[key]
@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency per route",
+    ["method", "route", "status"],
+)
+AIRTABLE_LATENCY = Histogram(
+    "airtable_request_duration_seconds",
+    "Latency of single Airtable HTTP calls, excluding scheduler queueing",
+    ["method", "status"],
+)
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds",
+    "Latency of MongoDB commands",
+    ["command", "outcome"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5),
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up a periodic timer",
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+)
+EVENT_LOOP_LAG_LAST = Gauge("event_loop_lag_last_seconds", "Most recent event loop lag sample")
+
+# Upstream time spent on behalf of the current request, reported as Server-Timing
+_server_timing: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "server_timing", default=None
+)
+
+def record_upstream(name: str, seconds: float):
+    """Add upstream time to the current request's Server-Timing, if any."""
+    timings = _server_timing.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+def observe_airtable(method: str, status: str, seconds: float):
+    AIRTABLE_LATENCY.labels(method=method, status=status).observe(seconds)
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    Times every MongoDB command.
+
+    Motor runs pymongo on a thread pool with a copy of the caller's context,
+    so the request's Server-Timing accumulator is still reachable here.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event, "success")
+
+    def failed(self, event):
+        self._observe(event, "failure")
+
+    @staticmethod
+    def _observe(event, outcome: str):
+        seconds = event.duration_micros / 1_000_000
+        MONGO_LATENCY.labels(command=event.command_name, outcome=outcome).observe(seconds)
+        record_upstream("mongo", seconds)
+
+class StatsCollector(Collector):
+    """Exposes counters that components already keep (caches, scheduler, pools)."""
+
+    def __init__(self):
+        self._caches: Dict[str, Callable[[], object]] = {}
+        self._gauges: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def register_cache(self, name: str, get_cache: Callable[[], object]):
+        """`get_cache` returns an object with `hits` and `misses` attributes, or None."""
+        self._caches[name] = get_cache
+
+    def register_gauges(self, prefix: str, get_stats: Callable[[], Dict[str, float]]):
+        """Every numeric value returned by `get_stats` becomes a `<prefix>_<key>` gauge."""
+        self._gauges[prefix] = get_stats
+
+    def collect(self) -> Iterable:
+        hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+        for name, get_cache in self._caches.items():
+            cache = get_cache()
+            if cache is not None:
+                hits.add_metric([name], cache.hits)
+                misses.add_metric([name], cache.misses)
+        yield hits
+        yield misses
+
+        for prefix, get_stats in self._gauges.items():
+            try:
+                stats = get_stats()
+            except Exception as e:
+                logger.warning(f"Collecting {prefix} metrics failed: {str(e)}")
+                continue
+            for key, value in (stats or {}).items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                gauge = GaugeMetricFamily(f"{prefix}_{key}", f"{prefix} {key.replace('_', ' ')}")
+                gauge.add_metric([], value)
+                yield gauge
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(timings.items())]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+async def timing_middleware(request: Request, call_next):
+    """Record route latency and add a Server-Timing header with upstream time."""
+    timings: Dict[str, float] = {}
+    token = _server_timing.set(timings)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["Server-Timing"] = server_timing_header(timings, time.perf_counter() - started)
+        return response
+    finally:
+        _server_timing.reset(token)
+        route = request.scope.get("route")
+        # Unmatched paths share one label, so scanners can't blow up the cardinality
+        path = route.path if route is not None else "unmatched"
+        REQUEST_LATENCY.labels(method=request.method, route=path, status=str(status)).observe(
+            time.perf_counter() - started
+        )
+
+async def monitor_event_loop(interval: Optional[float] = None):
+    """Sample how late a timer fires; a blocked loop (e.g. sync bcrypt) shows up as lag."""
+    interval = interval or float(os.environ.get('EVENT_LOOP_LAG_INTERVAL', '0.5'))
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - scheduled)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+
+def metrics_response() -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
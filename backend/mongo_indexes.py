@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from pagination import page_sort
+
+logger = logging.getLogger(__name__)
+
+# Indexes the API routes rely on, per collection. create_indexes is idempotent,
+# so these are applied on every startup.
+REQUIRED_INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "contact_requests": [
+        # Lets the write-behind queue replay its spool without creating duplicates
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    # natural_key: fixture upserts match on these (see FIXTURE_SPECS in server.py).
+    # Not unique, so existing duplicates from older seeds don't block startup.
+    "programs": [
+        IndexModel([("name", ASCENDING)], name="natural_key"),
+    ],
+    "coaches": [
+        IndexModel([("email", ASCENDING)], name="natural_key"),
+    ],
+    "faqs": [
+        # target_role is an array, so this is a multikey index; _id matches the
+        # page order so role pages need no in-memory SORT
+        IndexModel([("target_role", ASCENDING), ("_id", ASCENDING)], name="target_role_id"),
+        IndexModel([("question", ASCENDING)], name="natural_key"),
+    ],
+    "resources": [
+        IndexModel([("target_role", ASCENDING), ("_id", ASCENDING)], name="target_role_id"),
+        IndexModel([("title", ASCENDING), ("category", ASCENDING)], name="natural_key"),
+    ],
+    "events": [
+        # Role + date range queries; _id completes the keyset sort so no in-memory SORT is needed
+        IndexModel([("target_audience", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)],
+                   name="target_audience_date"),
+        # Undated /events pages are ordered by _id only
+        IndexModel([("target_audience", ASCENDING), ("_id", ASCENDING)], name="target_audience_id"),
+        IndexModel([("date", ASCENDING)], name="date"),
+        IndexModel([("title", ASCENDING), ("date", ASCENDING)], name="natural_key"),
+    ],
+}
+
+def route_queries() -> List[Tuple[str, str, dict, Optional[list]]]:
+    """
+    Representative query per route: (route, collection, filter, sort).
+
+    Paged routes use the same sort as find_page, so the plans checked here are
+    the ones the routes actually run.
+    """
+    now = datetime.now(timezone.utc)
+    role = {"$in": ["inwoner"]}
+    return [
+        ("POST /api/auth/login", "users", {"email": "diagnostics@example.com"}, None),
+        ("GET /api/programs", "programs", {}, page_sort()),
+        ("GET /api/coaches", "coaches", {}, page_sort()),
+        ("GET /api/faqs?role=", "faqs", {"target_role": role}, page_sort()),
+        ("GET /api/resources", "resources", {"target_role": role}, page_sort()),
+        ("GET /api/events", "events", {"target_audience": role}, page_sort()),
+        ("GET /api/events?upcoming=true", "events",
+         {"target_audience": role, "date": {"$gte": now}}, page_sort("date")),
+        ("GET /api/events/upcoming", "events",
+         {"target_audience": role, "date": {"$gte": now}}, page_sort("date")),
+    ]
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create all required indexes; existing ones are left alone.
+
+    A failure on one collection (e.g. duplicate emails blocking the unique
+    index) is logged and does not stop the others.
+    """
+    created = {}
+    for collection, indexes in REQUIRED_INDEXES.items():
+        try:
+            created[collection] = await db[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            logger.error(f"Could not create indexes on {collection}: {str(e)}")
+    return created
+
+def _plan_stages(plan) -> List[str]:
+    """Collect all stage names in an explain() plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+async def verify_query_plans(db) -> Dict[str, List[str]]:
+    """
+    Run explain() on each route's query and raise if any does a collection scan
+    or a blocking in-memory SORT.
+
+    Returns:
+        The winning plan stages per route
+    """
+    results = {}
+    failures = []
+    for route, collection, query, sort in route_queries():
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        results[route] = stages
+        if "COLLSCAN" in stages:
+            failures.append(f"{route} ({collection}: COLLSCAN)")
+        if "SORT" in stages:
+            failures.append(f"{route} ({collection}: SORT)")
+        logger.info(f"Query plan {route}: {' <- '.join(stages)}")
+
+    if failures:
+        raise RuntimeError(f"Unindexed query plan for: {', '.join(failures)}")
+    return results
+
+async def bootstrap_indexes(db):
+    """Startup hook: ensure indexes, and verify plans when MONGO_INDEX_DIAGNOSTICS is set."""
+    await ensure_indexes(db)
+    if os.environ.get('MONGO_INDEX_DIAGNOSTICS', '').lower() in ('1', 'true', 'yes'):
+        await verify_query_plans(db)
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pathlib import Path
+
+    load_dotenv(Path(__file__).parent / '.env')
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    async def main():
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        db = client[os.environ['DB_NAME']]
+        await ensure_indexes(db)
+        await verify_query_plans(db)
+        client.close()
+
+    asyncio.run(main())
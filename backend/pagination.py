@@ -0,0 +1,115 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple, Type
+
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class Page(BaseModel):
+    """One page of results plus the cursor for the next page (None on the last page)."""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+def encode_cursor(value: dict) -> str:
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """Parse a comma separated `fields=` value and check it against the model."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # Always return the id so clients can address the items
+    if "id" in model.model_fields and "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+def page_sort(sort_field: Optional[str] = None) -> List[Tuple[str, int]]:
+    """The keyset order find_page reads in: _id, or (sort_field, _id)."""
+    return [(sort_field, 1), ("_id", 1)] if sort_field else [("_id", 1)]
+
+async def find_page(collection, query: dict, model: Type[BaseModel], limit: int,
+                    after: Optional[str] = None, fields: Optional[List[str]] = None,
+                    sort_field: Optional[str] = None) -> Page:
+    """
+    Read one keyset page from a Mongo collection, ordered by _id or by (sort_field, _id).
+
+    The cursor is pushed down as a `> last` condition so every page is an
+    index range scan; documents are consumed from the driver cursor one batch
+    at a time, so at most `limit + 1` documents are held in memory.
+    """
+    if after:
+        cursor_value = decode_cursor(after)
+        try:
+            last_id = ObjectId(cursor_value.get("_id"))
+            last_key = json_util.loads(json.dumps(cursor_value["key"])) if sort_field else None
+        except (InvalidId, TypeError, KeyError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if sort_field:
+            after_query = {"$or": [
+                {sort_field: {"$gt": last_key}},
+                {sort_field: last_key, "_id": {"$gt": last_id}},
+            ]}
+        else:
+            after_query = {"_id": {"$gt": last_id}}
+        query = {"$and": [query, after_query]} if query else after_query
+
+    projection = {field: 1 for field in fields} if fields else None
+    if projection and sort_field:
+        projection[sort_field] = 1
+    cursor = collection.find(query, projection).sort(page_sort(sort_field)).limit(limit + 1)
+
+    items = []
+    last_id = None
+    last_key = None
+    async for doc in cursor:
+        if len(items) == limit:
+            next_cursor = {"_id": str(last_id)}
+            if sort_field:
+                # json_util keeps datetimes intact through the cursor round trip
+                next_cursor["key"] = json.loads(json_util.dumps(last_key))
+            return Page(items=items, next_cursor=encode_cursor(next_cursor))
+        last_id = doc.pop("_id")
+        last_key = doc.get(sort_field) if sort_field else None
+        if fields and sort_field and sort_field not in fields:
+            doc.pop(sort_field, None)
+        items.append(doc if fields else model(**doc))
+    return Page(items=items)
+
+def page_response(response: Response, page: Page, fields: Optional[List[str]] = None):
+    """
+    Return the page items, with the next cursor in the X-Next-Cursor header.
+
+    Projected items are returned as a JSONResponse because they no longer
+    satisfy the route's full response_model.
+    """
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    if fields:
+        items = [
+            item.model_dump(include=set(fields)) if isinstance(item, BaseModel) else item
+            for item in page.items
+        ]
+        # Keep headers the route already set on `response`
+        return JSONResponse(content=jsonable_encoder(items), headers={**response.headers, **headers})
+    response.headers.update(headers)
+    return page.items
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import bcrypt
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the password pool's queue is full."""
+
+class _Timing:
+    """Count, total and max of a duration, in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+        }
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL, so a thread pool gives real parallelism without
+    blocking the event loop. At most `max_workers + max_queue` calls may be
+    pending; beyond that callers get PasswordPoolSaturated immediately instead
+    of queueing without bound.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.max_workers = max_workers or int(os.environ.get('PASSWORD_POOL_WORKERS', '4'))
+        self.max_queue = max_queue if max_queue is not None else int(os.environ.get('PASSWORD_POOL_MAX_QUEUE', '32'))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self.rejected = 0
+        self.hash_timing = _Timing()
+        self.verify_timing = _Timing()
+        self.queue_wait = _Timing()
+
+    async def _run(self, timing: _Timing, fn: Callable, *args):
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordPoolSaturated()
+
+        def timed():
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started, time.perf_counter()
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+
+        self.queue_wait.observe(started - submitted)
+        timing.observe(finished - started)
+        return result
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(self.hash_timing, bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt())
+        return hashed.decode('utf-8')
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self.verify_timing, bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(self._pending, self.max_workers),
+            "queue_depth": max(0, self._pending - self.max_workers),
+            "rejected": self.rejected,
+            "hash": self.hash_timing.as_dict(),
+            "verify": self.verify_timing.as_dict(),
+            "queue_wait": self.queue_wait.as_dict(),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+class CachedResponse:
+    """
+    A pre-serialized JSON body with its ETag and extra headers.
+
+    `expires_at` (a Unix timestamp) is for content that goes stale with time
+    rather than with writes, such as a list of upcoming events.
+    """
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None,
+                 expires_at: Optional[float] = None):
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.headers = headers or {}
+        self.expires_at = expires_at
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+class RoleResponseCache:
+    """
+    Cache of serialized list responses per (collection, role).
+
+    Content of the role-filtered routes only varies by UserRole, so there are
+    at most a handful of entries per collection (`role` can also be any other
+    small key, e.g. a derived view per role). Entries are dropped per
+    collection on writes, either explicitly via `invalidate` or through a
+    Mongo change stream (`watch_changes`).
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], CachedResponse] = {}
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_build(self, collection: str, role: str,
+                           build: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        key = (collection, role)
+        cached = self._entries.get(key)
+        if cached is not None and not cached.expired():
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        version = (self._epoch, self._versions.get(collection, 0))
+        cached = await build()
+        # Don't store a body that was built from data invalidated in the meantime
+        if (self._epoch, self._versions.get(collection, 0)) == version:
+            self._entries[key] = cached
+        return cached
+
+    def invalidate(self, collection: Optional[str] = None):
+        """Drop cached responses for one collection, or for all when collection is None."""
+        if collection is None:
+            self._epoch += 1
+            self._entries = {}
+            return
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+        self._entries = {key: value for key, value in self._entries.items() if key[0] != collection}
+
+    @staticmethod
+    def respond(request: Request, cached: CachedResponse, private: bool = False) -> Response:
+        """Return the cached body, or 304 if the client's If-None-Match still matches."""
+        headers = {
+            "ETag": cached.etag,
+            "Cache-Control": "private, no-cache" if private else "no-cache",
+            **cached.headers,
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if cached.etag in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
+    async def watch_changes(self, db, collections: Iterable[str]):
+        """
+        Invalidate entries from a Mongo change stream until cancelled.
+
+        Change streams need a replica set; on a standalone server this logs a
+        warning and returns, leaving explicit invalidation in place.
+        """
+        collections = list(collections)
+        pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+        try:
+            async with db.watch(pipeline) as stream:
+                logger.info(f"Watching {', '.join(collections)} for response cache invalidation")
+                async for change in stream:
+                    self.invalidate(change["ns"]["coll"])
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            logger.warning(f"Change stream unavailable, response cache relies on explicit invalidation: {str(e)}")
@@ -0,0 +1,374 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Dutch function words; they occur in nearly every text and only add noise to the ranking
+STOPWORDS = frozenset("""
+    aan al als bij dan dat de der deze die dit door dus een en er ge geen had heb hebben heeft
+    het hier hij hoe hun ik in is je jij jou jouw kan kon maar me men met mij mijn na naar niet
+    nog nu of om omdat ons onze ook op over te tot u uit uw van veel voor want was wat we wel
+    werd wie wij wil worden wordt zal ze zich zij zijn zo zonder zou
+""".split())
+
+VOWELS = frozenset("aeiouy")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Query prefixes expand to at most this many indexed terms
+MAX_PREFIX_TERMS = 32
+SNIPPET_LENGTH = 160
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics, so "patiënt" and "patient" are the same word."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def _undouble(word: str) -> str:
+    return word[:-1] if word.endswith(("kk", "dd", "tt")) else word
+
+def _non_vowel(ch: str) -> bool:
+    return ch not in VOWELS
+
+def _valid_en(stem: str) -> bool:
+    return bool(stem) and _non_vowel(stem[-1]) and not stem.endswith("gem")
+
+def _valid_s(stem: str) -> bool:
+    return bool(stem) and _non_vowel(stem[-1]) and stem[-1] != "j"
+
+def _regions(word: str) -> Tuple[int, int]:
+    def after_vowel_consonant(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if word[i - 1] in VOWELS and _non_vowel(word[i]):
+                return i + 1
+        return len(word)
+    p1 = after_vowel_consonant(0)
+    return max(p1, 3), after_vowel_consonant(p1)
+
+def stem(word: str) -> str:
+    """
+    Dutch Snowball stemmer for a folded, lowercase word.
+
+    Maps inflections onto one stem ("bewegen", "beweging" -> "beweg";
+    "patiënten" -> "patient") so a query matches every form of a word.
+    """
+    if len(word) < 3 or not word.isalpha():
+        return word
+    # Consonantal y and i are not vowels: "Y" at the start or after a vowel, "I" between vowels
+    chars = list(word)
+    for i, ch in enumerate(chars):
+        if ch == "y" and (i == 0 or chars[i - 1] in VOWELS):
+            chars[i] = "Y"
+        elif ch == "i" and 0 < i < len(chars) - 1 and chars[i - 1] in VOWELS and chars[i + 1] in VOWELS:
+            chars[i] = "I"
+    word = "".join(chars)
+    r1, r2 = _regions(word)
+
+    # Step 1: plural and inflection endings
+    if word.endswith("heden"):
+        if len(word) - 5 >= r1:
+            word = word[:-5] + "heid"
+    elif word.endswith(("ene", "en")):
+        pos = len(word) - (3 if word.endswith("ene") else 2)
+        if pos >= r1 and _valid_en(word[:pos]):
+            word = _undouble(word[:pos])
+    elif word.endswith(("se", "s")):
+        pos = len(word) - (2 if word.endswith("se") else 1)
+        if pos >= r1 and _valid_s(word[:pos]):
+            word = word[:pos]
+
+    # Step 2: a final e
+    e_found = False
+    def remove_e(word: str) -> str:
+        nonlocal e_found
+        if word.endswith("e") and len(word) - 1 >= r1 and len(word) > 1 and _non_vowel(word[-2]):
+            e_found = True
+            return _undouble(word[:-1])
+        return word
+    word = remove_e(word)
+
+    # Step 3a: -heid
+    if word.endswith("heid") and len(word) - 4 >= r2 and word[-5:-4] != "c":
+        word = word[:-4]
+        if word.endswith("en") and len(word) - 2 >= r1 and _valid_en(word[:-2]):
+            word = _undouble(word[:-2])
+
+    # Step 3b: derivational suffixes
+    if word.endswith(("end", "ing")):
+        if len(word) - 3 >= r2:
+            word = word[:-3]
+            if word.endswith("ig") and len(word) - 2 >= r2 and word[-3:-2] != "e":
+                word = word[:-2]
+            else:
+                word = _undouble(word)
+    elif word.endswith("ig"):
+        if len(word) - 2 >= r2 and word[-3:-2] != "e":
+            word = word[:-2]
+    elif word.endswith("lijk"):
+        if len(word) - 4 >= r2:
+            word = remove_e(word[:-4])
+    elif word.endswith("baar"):
+        if len(word) - 4 >= r2:
+            word = word[:-4]
+    elif word.endswith("bar"):
+        if len(word) - 3 >= r2 and e_found:
+            word = word[:-3]
+
+    # Step 4: undouble the vowel of a closing syllable ("maan" -> "man")
+    if (len(word) >= 4 and _non_vowel(word[-1]) and word[-1] != "I" and word[-2] == word[-3]
+            and word[-2] in "aeou" and _non_vowel(word[-4])):
+        word = word[:-2] + word[-1]
+
+    return word.replace("Y", "y").replace("I", "i")
+
+def tokenize(text: str) -> List[str]:
+    """Fold, split and stem text into index terms, without stopwords."""
+    return [stem(token) for token in _TOKEN.findall(fold(text)) if token not in STOPWORDS]
+
+class SearchSource(NamedTuple):
+    """Which fields of a source document are searchable, and how it is shown."""
+    title: str
+    # (field, weight); a field may hold a string or a list of strings
+    fields: Tuple[Tuple[str, float], ...]
+    snippet: Optional[str] = None
+    # Field with the roles a document is meant for; None means everyone
+    roles: Optional[str] = None
+
+class SearchDocument(NamedTuple):
+    kind: str
+    id: str
+    title: str
+    snippet: str
+    roles: Optional[FrozenSet[str]]
+
+def _field(source: Any, name: str) -> Any:
+    return source.get(name) if isinstance(source, dict) else getattr(source, name, None)
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return " ".join(_text(item) for item in value)
+    return str(getattr(value, "value", value))
+
+DocKey = Tuple[str, Hashable]
+
+class SearchIndex:
+    """
+    In-memory inverted index with BM25 ranking over several kinds of documents.
+
+    Documents are Mongo documents or models, described per kind by a
+    SearchSource. Adding, replacing or removing a document only touches the
+    postings of that document, so writes are applied incrementally instead of
+    rebuilding the index. Queries are ranked with BM25 over weighted term
+    frequencies; the last query word also matches as a prefix, so results
+    update while the user is typing.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, sources: Dict[str, SearchSource]):
+        self.sources = sources
+        self._postings: Dict[str, Dict[DocKey, float]] = {}
+        self._documents: Dict[DocKey, SearchDocument] = {}
+        self._terms: Dict[DocKey, Dict[str, float]] = {}
+        self._lengths: Dict[DocKey, float] = {}
+        self._total_length = 0.0
+        # Indexed source object per key, to skip unchanged documents in sync_kind
+        self._indexed: Dict[str, Dict[Hashable, Any]] = defaultdict(dict)
+        self._versions: Dict[str, Any] = {}
+        # Sorted terms for prefix matches, rebuilt lazily after the vocabulary changed
+        self._vocabulary: Optional[List[str]] = None
+        # BM25 contribution per (term, document), valid until the next write
+        self._impacts: Dict[str, List[Tuple[DocKey, float]]] = {}
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def upsert(self, kind: str, key: Hashable, source: Any):
+        """Index one document, replacing an earlier version with the same key."""
+        spec = self.sources[kind]
+        self.remove(kind, key)
+        self._impacts = {}
+
+        terms: Dict[str, float] = defaultdict(float)
+        for field, weight in spec.fields:
+            for term in tokenize(_text(_field(source, field))):
+                terms[term] += weight
+
+        doc_key = (kind, key)
+        roles = _field(source, spec.roles) if spec.roles else None
+        snippet = _text(_field(source, spec.snippet)) if spec.snippet else ""
+        self._documents[doc_key] = SearchDocument(
+            kind=kind,
+            id=str(_field(source, "id") or key),
+            title=_text(_field(source, spec.title)),
+            snippet=snippet if len(snippet) <= SNIPPET_LENGTH else snippet[:SNIPPET_LENGTH - 1].rstrip() + "…",
+            roles=frozenset(_text(role) for role in roles) if roles is not None else None,
+        )
+        self._terms[doc_key] = terms
+        length = sum(terms.values())
+        self._lengths[doc_key] = length
+        self._total_length += length
+        self._indexed[kind][key] = source
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[doc_key] = weight
+
+    def remove(self, kind: str, key: Hashable):
+        doc_key = (kind, key)
+        terms = self._terms.pop(doc_key, None)
+        if terms is None:
+            return
+        del self._documents[doc_key]
+        self._impacts = {}
+        self._total_length -= self._lengths.pop(doc_key)
+        self._indexed[kind].pop(key, None)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_key]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+    def sync_kind(self, kind: str, sources: Dict[Hashable, Any], version: Any = None):
+        """
+        Make the documents of one kind match `sources` (key -> source document).
+
+        Only documents that were added, removed or replaced by a different
+        object are re-indexed. With a `version` the call is a no-op while the
+        version is unchanged.
+        """
+        if version is not None and self._versions.get(kind) == version:
+            return
+        indexed = self._indexed[kind]
+        for key in [key for key in indexed if key not in sources]:
+            self.remove(kind, key)
+        for key, source in sources.items():
+            if indexed.get(key) is not source:
+                self.upsert(kind, key, source)
+        self._versions[kind] = version
+
+    def _expand(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        matches = []
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix) or len(matches) >= MAX_PREFIX_TERMS:
+                break
+            matches.append(vocabulary[i])
+        return matches
+
+    def _impact(self, term: str) -> List[Tuple[DocKey, float]]:
+        """BM25 score of `term` per matching document; computed once between writes."""
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            postings = self._postings.get(term, {})
+            count = len(self._documents)
+            average_length = self._total_length / count or 1.0
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            impacts = self._impacts[term] = [
+                (doc_key, idf * tf * (self.K1 + 1) / (
+                    tf + self.K1 * (1 - self.B + self.B * self._lengths[doc_key] / average_length)))
+                for doc_key, tf in postings.items()
+            ]
+        return impacts
+
+    def search(self, query: str,
+               visible: Optional[Callable[[SearchDocument], bool]] = None,
+               kinds: Optional[Iterable[str]] = None,
+               limit: int = 20) -> List[Tuple[float, SearchDocument]]:
+        """
+        Rank documents for a free-text query.
+
+        Args:
+            query: Query text; words are folded and stemmed like the documents
+            visible: Returns False for documents the caller may not see
+            kinds: Only return these kinds
+            limit: Maximum number of results
+
+        Returns:
+            (score, document) pairs, best first
+        """
+        self.queries += 1
+        words = [token for token in _TOKEN.findall(fold(query)) if token not in STOPWORDS]
+        if not words or not self._documents:
+            return []
+
+        # Exact stems weigh fully; completions of the last word count half
+        weighted: Dict[str, float] = {stem(word): 1.0 for word in words}
+        if not query[-1:].isspace():
+            for term in self._expand(words[-1]):
+                weighted.setdefault(term, 0.5)
+
+        kinds = set(kinds) if kinds is not None else None
+        scores: Dict[DocKey, float] = defaultdict(float)
+        for term, query_weight in weighted.items():
+            for doc_key, impact in self._impact(term):
+                if kinds is None or doc_key[0] in kinds:
+                    scores[doc_key] += query_weight * impact
+
+        candidates = ((score, self._documents[doc_key]) for doc_key, score in scores.items())
+        if visible is not None:
+            candidates = (candidate for candidate in candidates if visible(candidate[1]))
+        return heapq.nlargest(limit, candidates, key=lambda candidate: candidate[0])
+
+    async def load_collection(self, collection, kind: Optional[str] = None):
+        """(Re)index all documents of a Mongo collection; the kind defaults to its name."""
+        kind = kind or collection.name
+        spec = self.sources[kind]
+        projection = {field: 1 for field, _ in spec.fields}
+        projection.update({name: 1 for name in ("id", spec.title, spec.snippet, spec.roles) if name})
+        documents = {str(doc["_id"]): doc async for doc in collection.find({}, projection)}
+        self.sync_kind(kind, documents)
+        logger.info(f"Indexed {len(documents)} {kind} for search")
+
+    async def watch_changes(self, db, kinds: Iterable[str]):
+        """
+        Apply inserts, updates and deletes from a Mongo change stream until cancelled.
+
+        Like the response cache, this needs a replica set; on a standalone
+        server it logs a warning and returns.
+        """
+        kinds = list(kinds)
+        pipeline = [{"$match": {"ns.coll": {"$in": kinds}}}]
+        try:
+            async with db.watch(pipeline, full_document="updateLookup") as stream:
+                logger.info(f"Watching {', '.join(kinds)} for search index updates")
+                async for change in stream:
+                    kind = change["ns"]["coll"]
+                    if "documentKey" not in change:
+                        # drop/rename: reload the whole collection
+                        await self.load_collection(db[kind])
+                        continue
+                    key = str(change["documentKey"]["_id"])
+                    document = change.get("fullDocument")
+                    if document is None:
+                        self.remove(kind, key)
+                    else:
+                        self.upsert(kind, key, document)
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            logger.warning(f"Change stream unavailable, search index relies on explicit reloads: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._documents),
+            "terms": len(self._postings),
+            "queries": self.queries,
+        }
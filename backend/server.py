@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -9,20 +9,35 @@ from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Optional
 import uuid
-from datetime import datetime, timezone
-import bcrypt
+from datetime import datetime, timedelta, timezone
 import jwt
+from pymongo.errors import DuplicateKeyError
 from enum import Enum
 import sys
+import asyncio
 sys.path.append('/app/backend')
-from gli_router import router as gli_router
+from gli_router import router as gli_router, SNAPSHOT_AGE_HEADER
+from triage_router import router as triage_router
+from airtable_service import get_airtable_service
+from airtable_coordination import coordinator_from_env
+from mongo_indexes import bootstrap_indexes
+from fixtures import SEED_FIXTURE, FixtureSpec, load_fixtures, read_fixture_file
+from metrics import MongoCommandTimer, metrics_response, monitor_event_loop, stats_collector, timing_middleware
+from user_cache import UserCache
+from export_stream import ExportFormat, cursor_batches, export_response
+from fast_json import serialize_models
+from response_cache import CachedResponse, RoleResponseCache
+from search_index import SearchDocument, SearchIndex, SearchSource
+from write_behind import WriteBehindQueue
+from password_pool import PasswordHasher, PasswordPoolSaturated
+from pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, find_page, page_response, parse_fields
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandTimer()])
 db = client[os.environ['DB_NAME']]
 
 # Create the main app
@@ -33,7 +48,20 @@ api_router = APIRouter(prefix="/api")
 
 # Security
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key')
+JWT_EXPIRE_HOURS = float(os.environ.get('JWT_EXPIRE_HOURS', '24'))
+# Opt-in: trust the signed email/role claims instead of looking the user up in Mongo.
+# Tokens issued before invalidate_user() in this process are still checked in Mongo;
+# other workers only see a deactivation once the token expires.
+JWT_TRUST_CLAIMS = os.environ.get('JWT_TRUST_CLAIMS', '').lower() in ('1', 'true', 'yes')
+
+# Verified token -> User, so parallel dashboard requests don't each hit db.users
+user_cache = UserCache(
+    maxsize=int(os.environ.get('USER_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('USER_CACHE_TTL', '60')),
+    remember_for=JWT_EXPIRE_HOURS * 3600
+)
 
 class UserRole(str, Enum):
     INWONER = "inwoner"
@@ -115,15 +143,99 @@ class ContactRequest(BaseModel):
     request_type: str  # info, referral, support
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class SearchResult(BaseModel):
+    kind: str  # faqs, resources, programs, groepen
+    id: str
+    title: str
+    snippet: str
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+
+# Validation model and natural key per collection for fixture loading
+FIXTURE_SPECS = {
+    "programs": FixtureSpec(Program, ("name",)),
+    "coaches": FixtureSpec(Coach, ("email",)),
+    "faqs": FixtureSpec(FAQ, ("question",)),
+    "resources": FixtureSpec(Resource, ("title", "category")),
+    "events": FixtureSpec(Event, ("title", "date")),
+}
+
+# Contact form bursts are acknowledged right away and inserted with insert_many
+contact_queue = WriteBehindQueue.from_env(db.contact_requests)
+
+# Role-filtered content only varies by UserRole, so default pages are cached pre-serialized
+response_cache = RoleResponseCache()
+ROLE_CACHED_COLLECTIONS = ("faqs", "resources", "events")
+
+# Size of the per-role "next events" view the dashboard shows
+UPCOMING_EVENTS_LIMIT = int(os.environ.get('UPCOMING_EVENTS_LIMIT', '20'))
+
+def is_cacheable_page(limit: int, after: Optional[str], fields: Optional[str]) -> bool:
+    return limit == MAX_PAGE_SIZE and not after and not fields
+
+async def role_cached_page(request: Request, collection: str, role: str, query: dict,
+                           model, private: bool = False) -> Response:
+    async def build():
+        page = await find_page(db[collection], query, model, MAX_PAGE_SIZE)
+        headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+        return CachedResponse(serialize_models(model, page.items), headers)
+    
+    cached = await response_cache.get_or_build(collection, role, build)
+    return response_cache.respond(request, cached, private=private)
+
+# Full-text search over content and groepen; titles and focus areas weigh double
+search_index = SearchIndex({
+    "faqs": SearchSource(title="question", fields=(("question", 2.0), ("answer", 1.0)),
+                         snippet="answer", roles="target_role"),
+    "resources": SearchSource(title="title", fields=(("title", 2.0), ("description", 1.0)),
+                              snippet="description", roles="target_role"),
+    "programs": SearchSource(title="name", fields=(("name", 2.0), ("focus_areas", 2.0), ("description", 1.0)),
+                             snippet="description"),
+    "groepen": SearchSource(title="groepnummer", fields=(("gli_aanbieder", 1.0),), snippet="gli_aanbieder"),
+})
+SEARCH_COLLECTIONS = ("faqs", "resources", "programs")
+
+async def reload_search_index():
+    for collection in SEARCH_COLLECTIONS:
+        await search_index.load_collection(db[collection])
+
+def sync_groepen_search(store):
+    """Snapshot listener: apply the changed groepen to the search index."""
+    search_index.sync_kind("groepen", store.records, version=store.version)
+
+# Password hashing runs on a bounded thread pool so bcrypt never blocks the event loop
+password_hasher = PasswordHasher()
+
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, please try again shortly",
+        headers={"Retry-After": "1"}
+    )
+
 # Helper functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordPoolSaturated:
+        raise _password_pool_busy()
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    try:
+        return await password_hasher.verify(password, hashed)
+    except PasswordPoolSaturated:
+        raise _password_pool_busy()
 
 def create_jwt_token(user_data: dict) -> str:
-    return jwt.encode(user_data, JWT_SECRET, algorithm='HS256')
+    now = datetime.now(timezone.utc)
+    payload = {**user_data, "iat": now, "exp": now + timedelta(hours=JWT_EXPIRE_HOURS)}
+    return jwt.encode(payload, JWT_SECRET, algorithm='HS256')
+
+def user_token_data(user: User) -> dict:
+    return {"sub": user.id, "email": user.email, "name": user.name, "role": user.role}
 
 def verify_jwt_token(token: str) -> dict:
     try:
@@ -131,22 +243,69 @@ def verify_jwt_token(token: str) -> dict:
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+def invalidate_user(email: str):
+    """Drop cached sessions of a user; call after updating or deactivating them."""
+    user_cache.invalidate_email(email)
+
+def user_from_claims(payload: dict) -> Optional[User]:
+    """
+    Build a User from signed claims, only for tokens that carry all of them and expire.
+
+    The token has no created_at or is_active, so the result is only good for
+    authorization; /auth/profile reads the stored user. Tokens issued before
+    the user was last invalidated get None and are checked in Mongo.
+    """
+    if not all(payload.get(claim) for claim in ("sub", "email", "role", "exp", "iat")):
+        return None
+    if user_cache.invalidated_since(payload["email"], float(payload["iat"])):
+        return None
+    return User(id=payload["sub"], email=payload["email"],
+                name=payload.get("name") or payload["email"], role=payload["role"])
+
+async def load_user(email: str) -> User:
+    """The stored user; 401 if they no longer exist or are deactivated."""
+    user_doc = await db.users.find_one({"email": email})
+    if not user_doc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user = User(**user_doc)
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is deactivated")
+    return user
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
+        cached_user = user_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+        
         payload = verify_jwt_token(token)
         user_email = payload.get("email")
         if not user_email:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
         
-        user_doc = await db.users.find_one({"email": user_email})
-        if not user_doc:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        user = user_from_claims(payload) if JWT_TRUST_CLAIMS else None
+        if user is None:
+            user = await load_user(user_email)
         
-        return User(**user_doc)
+        user_cache.put(token, user_email, user, token_exp=payload.get("exp"))
+        return user
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
 
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[User]:
+    """The current user when a token is sent; anonymous requests get None."""
+    if credentials is None:
+        return None
+    return await get_current_user(credentials)
+
 # Authentication routes
 @api_router.post("/auth/register")
 async def register_user(user_data: UserCreate):
@@ -156,7 +315,7 @@ async def register_user(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password and create user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     user_dict = user_data.dict()
     del user_dict['password']
     user_obj = User(**user_dict)
@@ -164,11 +323,16 @@ async def register_user(user_data: UserCreate):
     # Store user with hashed password
     user_doc = user_obj.dict()
     user_doc['password'] = hashed_password
-    await db.users.insert_one(user_doc)
+    try:
+        await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        # Unique index on users.email catches concurrent registrations
+        raise HTTPException(status_code=400, detail="Email already registered")
+    # A re-registered email must not inherit cached sessions of the old account
+    invalidate_user(user_obj.email)
     
     # Create token
-    token_data = {"email": user_obj.email, "role": user_obj.role}
-    token = create_jwt_token(token_data)
+    token = create_jwt_token(user_token_data(user_obj))
     
     return {"user": user_obj, "token": token}
 
@@ -180,19 +344,21 @@ async def login_user(login_data: UserLogin):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Verify password
-    if not verify_password(login_data.password, user_doc['password']):
+    if not await verify_password(login_data.password, user_doc['password']):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     user = User(**user_doc)
     
     # Create token
-    token_data = {"email": user.email, "role": user.role}
-    token = create_jwt_token(token_data)
+    token = create_jwt_token(user_token_data(user))
     
     return {"user": user, "token": token}
 
 @api_router.get("/auth/profile")
 async def get_profile(current_user: User = Depends(get_current_user)):
+    if JWT_TRUST_CLAIMS:
+        # A claims-built user lacks the stored fields (created_at, is_active)
+        return await load_user(current_user.email)
     return current_user
 
 # Public routes
@@ -201,137 +367,198 @@ async def root():
     return {"message": "GLI Webapp API", "version": "1.0.0"}
 
 @api_router.get("/programs", response_model=List[Program])
-async def get_programs():
-    programs = await db.programs.find().to_list(1000)
-    return [Program(**program) for program in programs]
+async def get_programs(
+    response: Response,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected_fields = parse_fields(fields, Program)
+    page = await find_page(db.programs, {}, Program, limit, after, selected_fields)
+    return page_response(response, page, selected_fields)
 
 @api_router.get("/coaches", response_model=List[Coach])
-async def get_coaches():
-    coaches = await db.coaches.find().to_list(1000)
-    return [Coach(**coach) for coach in coaches]
+async def get_coaches(
+    response: Response,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected_fields = parse_fields(fields, Coach)
+    page = await find_page(db.coaches, {}, Coach, limit, after, selected_fields)
+    return page_response(response, page, selected_fields)
 
 @api_router.get("/faqs", response_model=List[FAQ])
-async def get_faqs(role: Optional[str] = None):
+async def get_faqs(
+    request: Request,
+    response: Response,
+    role: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None
+):
     query = {}
     if role:
         query["target_role"] = {"$in": [role]}
     
-    faqs = await db.faqs.find(query).to_list(1000)
-    return [FAQ(**faq) for faq in faqs]
+    if is_cacheable_page(limit, after, fields) and (not role or role in UserRole._value2member_map_):
+        return await role_cached_page(request, "faqs", role or "*", query, FAQ)
+    
+    selected_fields = parse_fields(fields, FAQ)
+    page = await find_page(db.faqs, query, FAQ, limit, after, selected_fields)
+    return page_response(response, page, selected_fields)
 
 @api_router.post("/contact")
 async def create_contact_request(contact: ContactRequest):
     contact_dict = contact.dict()
-    await db.contact_requests.insert_one(contact_dict)
+    # Spooled locally and inserted in batches by the write-behind queue
+    await contact_queue.submit(contact_dict)
     return {"message": "Contact request submitted successfully"}
 
+@api_router.get("/contact-requests/export")
+async def export_contact_requests(
+    format: ExportFormat = ExportFormat.CSV,
+    current_user: User = Depends(require_admin)
+):
+    # Streamed straight from the cursor so memory stays flat for any number of requests
+    cursor = db.contact_requests.find({}, {"_id": 0}).sort("_id", 1)
+    return await export_response(
+        cursor_batches(cursor),
+        format,
+        columns=list(ContactRequest.model_fields),
+        filename="contact-requests"
+    )
+
+@api_router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = None,
+    role: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    kinds = None
+    if types:
+        kinds = {kind.strip() for kind in types.split(",") if kind.strip()}
+        unknown = kinds - set(search_index.sources)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(sorted(unknown))}")
+    
+    # Same visibility as the list routes: resources need a login, FAQs filter on an explicit role
+    user_role = current_user.role.value if current_user else None
+    
+    def visible(document: SearchDocument) -> bool:
+        if document.kind == "resources":
+            return user_role is not None and user_role in document.roles
+        if document.kind == "faqs":
+            return role is None or role in document.roles
+        return True
+    
+    hits = search_index.search(q, visible, kinds, limit)
+    return SearchResponse(query=q, results=[
+        SearchResult(kind=document.kind, id=document.id, title=document.title,
+                     snippet=document.snippet, score=round(score, 4))
+        for score, document in hits
+    ])
+
 # Protected routes
 @api_router.get("/resources", response_model=List[Resource])
-async def get_resources(current_user: User = Depends(get_current_user)):
-    resources = await db.resources.find({"target_role": {"$in": [current_user.role]}}).to_list(1000)
-    return [Resource(**resource) for resource in resources]
+async def get_resources(
+    request: Request,
+    response: Response,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    query = {"target_role": {"$in": [current_user.role]}}
+    if is_cacheable_page(limit, after, fields):
+        return await role_cached_page(request, "resources", current_user.role.value, query, Resource, private=True)
+    
+    selected_fields = parse_fields(fields, Resource)
+    page = await find_page(db.resources, query, Resource, limit, after, selected_fields)
+    return page_response(response, page, selected_fields)
 
-@api_router.get("/events", response_model=List[Event])
-async def get_events(current_user: User = Depends(get_current_user)):
-    events = await db.events.find({"target_audience": {"$in": [current_user.role]}}).to_list(1000)
-    return [Event(**event) for event in events]
+def as_utc(value: datetime) -> datetime:
+    # Mongo returns naive UTC datetimes; query parameters may be naive too
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
-# Admin routes (for seeding data)
-@api_router.post("/admin/seed")
-async def seed_data():
-    # Seed programs
-    programs_data = [
-        {
-            "name": "BeweegKuur",
-            "description": "Intensief medisch begeleide leefstijlinterventie voor mensen met diabetes type 2, hart- en vaatziekten of overgewicht.",
-            "duration": "12 maanden",
-            "focus_areas": ["Voeding", "Beweging", "Gedrag", "Medische begeleiding"],
-            "target_group": "Mensen met diabetes type 2, hart- en vaatziekten, overgewicht"
-        },
-        {
-            "name": "COOL",
-            "description": "Leefstijlprogramma gericht op mindset, motivatie en duurzame gedragsverandering.",
-            "duration": "6 maanden",
-            "focus_areas": ["Mindset", "Motivatie", "Gedragsverandering", "Beweging"],
-            "target_group": "Volwassenen die hun leefstijl duurzaam willen veranderen"
-        },
-        {
-            "name": "SLIMMER",
-            "description": "Diabetespreventie programma voor mensen met verhoogd risico op diabetes type 2.",
-            "duration": "12 maanden",
-            "focus_areas": ["Diabetespreventie", "Voeding", "Beweging", "Gewichtsmanagement"],
-            "target_group": "Mensen met verhoogd risico op diabetes type 2"
-        }
-    ]
-    
-    for program_data in programs_data:
-        program = Program(**program_data)
-        await db.programs.insert_one(program.dict())
+@api_router.get("/events", response_model=List[Event])
+async def get_events(
+    request: Request,
+    response: Response,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+    upcoming: bool = False,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    query = {"target_audience": {"$in": [current_user.role]}}
+    date_range = {}
+    if upcoming:
+        now = datetime.now(timezone.utc)
+        date_range["$gte"] = max(as_utc(from_date), now) if from_date else now
+    elif from_date:
+        date_range["$gte"] = as_utc(from_date)
+    if to_date:
+        date_range["$lt"] = as_utc(to_date)
     
-    # Seed coaches
-    coaches_data = [
-        {
-            "name": "Dr. Sarah van der Berg",
-            "specialization": "Leefstijlgeneeskunde",
-            "phone": "+31 30 123 4567",
-            "email": "s.vandenberg@zorg4zeist.nl",
-            "location": "Zeist Centrum",
-            "programs": ["BeweegKuur", "SLIMMER"]
-        },
-        {
-            "name": "Mark Jansen",
-            "specialization": "Gedragspsychologie",
-            "phone": "+31 30 234 5678",
-            "email": "m.jansen@zorg4zeist.nl",
-            "location": "Zeist West",
-            "programs": ["COOL", "BeweegKuur"]
-        },
-        {
-            "name": "Lisa de Wit",
-            "specialization": "Voeding & Beweging",
-            "phone": "+31 30 345 6789",
-            "email": "l.dewit@zorg4zeist.nl",
-            "location": "Vollenhove",
-            "programs": ["BeweegKuur", "COOL", "SLIMMER"]
-        }
-    ]
+    if not date_range:
+        if is_cacheable_page(limit, after, fields):
+            return await role_cached_page(request, "events", current_user.role.value, query, Event, private=True)
+        selected_fields = parse_fields(fields, Event)
+        page = await find_page(db.events, query, Event, limit, after, selected_fields)
+        return page_response(response, page, selected_fields)
     
-    for coach_data in coaches_data:
-        coach = Coach(**coach_data)
-        await db.coaches.insert_one(coach.dict())
+    # Date ranges are ordered by date and scan only the range on the (target_audience, date) index
+    query["date"] = date_range
+    selected_fields = parse_fields(fields, Event)
+    page = await find_page(db.events, query, Event, limit, after, selected_fields, sort_field="date")
+    return page_response(response, page, selected_fields)
+
+@api_router.get("/events/upcoming", response_model=List[Event])
+async def get_upcoming_events(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    role = current_user.role.value
     
-    # Seed FAQs
-    faqs_data = [
-        {
-            "question": "Wat is de GLI?",
-            "answer": "De Gecombineerde Leefstijlinterventie (GLI) is een wetenschappelijk onderbouwd programma dat zich richt op vier pijlers: voeding, beweging, gedrag en slaap/stress. Het helpt mensen bij het aanleren van een gezonde leefstijl.",
-            "category": "algemeen",
-            "target_role": ["inwoner", "deelnemer"]
-        },
-        {
-            "question": "Hoe verwijs ik een patiënt naar de GLI?",
-            "answer": "Verwijzingen gaan uitsluitend via VIP Live. Selecteer 'GLI-verwijzing', kies het juiste programma en vermeld BMI, co-morbiditeiten en motivatie van de patiënt.",
-            "category": "verwijzing",
-            "target_role": ["verwijzer"]
-        },
-        {
-            "question": "Wat kan ik verwachten van het traject?",
-            "answer": "Je wordt persoonlijk begeleid door een leefstijlcoach en krijgt stap voor stap hulp bij het ontwikkelen van gezonde gewoontes. Het traject bestaat uit groepsbijeenkomsten en individuele coaching.",
-            "category": "traject",
-            "target_role": ["deelnemer"]
-        }
-    ]
+    async def build():
+        now = datetime.now(timezone.utc)
+        query = {"target_audience": {"$in": [role]}, "date": {"$gte": now}}
+        page = await find_page(db.events, query, Event, UPCOMING_EVENTS_LIMIT, sort_field="date")
+        # The view is stale as soon as its first event has started
+        expires_at = as_utc(page.items[0].date).timestamp() if page.items else None
+        return CachedResponse(serialize_models(Event, page.items), expires_at=expires_at)
     
-    for faq_data in faqs_data:
-        faq = FAQ(**faq_data)
-        await db.faqs.insert_one(faq.dict())
+    # Kept per role next to the /events pages, so event writes drop it too
+    cached = await response_cache.get_or_build("events", f"upcoming:{role}", build)
+    return response_cache.respond(request, cached, private=True)
+
+# Admin routes
+@api_router.get("/admin/password-pool")
+async def get_password_pool_metrics(current_user: User = Depends(require_admin)):
+    return password_hasher.metrics()
+
+@api_router.post("/admin/seed")
+async def seed_data():
+    # Upserts on natural keys, so seeding twice doesn't duplicate anything
+    try:
+        report = await load_fixtures(db, read_fixture_file(SEED_FIXTURE), FIXTURE_SPECS)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     
-    return {"message": "Data seeded successfully"}
+    response_cache.invalidate()
+    await reload_search_index()
+    return {"message": "Data seeded successfully", "report": report}
 
 # Include the router in the main app
 app.include_router(api_router)
 app.include_router(gli_router)
 app.include_router(gli_router)
+app.include_router(triage_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -339,8 +566,48 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, SNAPSHOT_AGE_HEADER],
 )
 
+app.middleware("http")(timing_middleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return metrics_response()
+
+def airtable_service_if_started():
+    # Metrics must not create the Airtable service as a side effect
+    return get_airtable_service() if get_airtable_service.cache_info().currsize else None
+
+def airtable_scheduler_stats():
+    service = airtable_service_if_started()
+    if service is None:
+        return {}
+    stats = service.gli_table.scheduler.stats()
+    stats["breaker_open"] = int(stats["breaker_state"] != "closed")
+    return stats
+
+stats_collector.register_cache("role_response", lambda: response_cache)
+stats_collector.register_cache("user", lambda: user_cache)
+stats_collector.register_cache(
+    "gli_groepen_snapshot",
+    lambda: getattr(airtable_service_if_started(), "snapshot_cache", None)
+)
+stats_collector.register_gauges("airtable_scheduler", airtable_scheduler_stats)
+stats_collector.register_gauges(
+    "airtable_single_flight",
+    lambda: getattr(airtable_service_if_started(), "single_flight", None) and
+    airtable_service_if_started().single_flight.stats()
+)
+stats_collector.register_gauges(
+    "airtable_coordination",
+    lambda: getattr(airtable_service_if_started(), "coordinator", None) and
+    airtable_service_if_started().coordinator.stats()
+)
+stats_collector.register_gauges("password_pool", lambda: password_hasher.metrics())
+stats_collector.register_gauges("contact_queue", contact_queue.stats)
+stats_collector.register_gauges("search_index", search_index.stats)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -348,6 +615,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_mongo_indexes():
+    await bootstrap_indexes(db)
+
+@app.on_event("startup")
+async def build_search_index():
+    await reload_search_index()
+
+@app.on_event("startup")
+async def watch_cached_collections():
+    if os.environ.get('MONGO_CHANGE_STREAMS', '').lower() in ('1', 'true', 'yes'):
+        app.state.change_stream_task = asyncio.create_task(
+            response_cache.watch_changes(db, ROLE_CACHED_COLLECTIONS)
+        )
+        app.state.search_stream_task = asyncio.create_task(
+            search_index.watch_changes(db, SEARCH_COLLECTIONS)
+        )
+
+@app.on_event("startup")
+async def start_contact_queue():
+    contact_queue.start()
+
+@app.on_event("startup")
+async def start_event_loop_monitor():
+    app.state.loop_monitor_task = asyncio.create_task(monitor_event_loop())
+
+@app.on_event("startup")
+async def start_airtable_sync():
+    # With several workers, AIRTABLE_COORDINATION lets one leader sync and share snapshots
+    try:
+        service = get_airtable_service()
+        # Groepen become searchable as snapshots arrive; /search never waits for Airtable
+        service.add_snapshot_listener(sync_groepen_search)
+        service.start_background_sync(coordinator_from_env(db))
+    except ValueError as e:
+        logger.warning(f"Airtable sync not started: {str(e)}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for task_name in ("change_stream_task", "search_stream_task", "loop_monitor_task"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    # Drain before closing the client; whatever can't be written stays spooled
+    await contact_queue.close()
+    # Only close the Airtable service if it was ever created; it releases its
+    # Mongo sync lease, so this has to happen before the client is closed
+    if get_airtable_service.cache_info().currsize:
+        await get_airtable_service().aclose()
+    client.close()
+    password_hasher.shutdown()
\ No newline at end of file
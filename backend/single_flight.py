@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Bundel gelijktijdige identieke upstream reads tot één call.
+
+    Zolang een call voor een sleutel loopt, wachten nieuwe callers met
+    dezelfde sleutel op hetzelfde resultaat (of dezelfde fout) in plaats van
+    zelf een request te doen. Na afloop wordt niets bewaard; dit is geen cache.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Voer `fn` uit, of wacht op de call die al loopt voor `key`.
+
+        Args:
+            key: Sleutel die identieke reads identificeert
+            fn: Coroutine functie die de upstream read doet
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+        # asyncio.shield: een afgebroken caller mag de gedeelde call niet annuleren
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """
+        Laat nieuwe callers voor `key` niet meer aansluiten bij de lopende call.
+
+        Na een write mag een read die daarna start geen resultaat krijgen van
+        een request dat al vóór de write verstuurd was.
+        """
+        self._inflight.pop(key, None)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Voorkom "exception was never retrieved" als alle callers weg zijn
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
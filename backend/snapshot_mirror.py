@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from airtable_models import GLIGroepResponse
+from groepen_store import GroepenStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRROR_PATH = Path(__file__).parent / 'data' / 'gli_groepen_snapshot.json'
+
+class SnapshotMetadata(BaseModel):
+    """Sync stand van een snapshot; alleen dit deel verandert bij een sync zonder wijzigingen."""
+    synced_at: Optional[datetime] = None
+    watermark: Optional[datetime] = None
+
+class GroepenSnapshot(SnapshotMetadata):
+    """Inhoud van het mirror bestand."""
+    saved_at: datetime
+    groepen: List[GLIGroepResponse]
+
+    @classmethod
+    def from_store(cls, store: GroepenStore, watermark: Optional[datetime]) -> "GroepenSnapshot":
+        return cls(
+            saved_at=datetime.now(timezone.utc),
+            synced_at=store.synced_at,
+            watermark=watermark,
+            groepen=list(store.records.values())
+        )
+
+class SnapshotMirror:
+    """
+    Lokale kopie van de gesyncte groepen op schijf.
+
+    Nieuwe workers en herstarte processen laden dit bestand bij het opstarten,
+    zodat ze direct groepen kunnen serveren en incrementeel verder syncen in
+    plaats van de hele tabel opnieuw op te halen. Het bestand wordt met de
+    pydantic JSON parser (Rust) in één keer gevalideerd en atomisch vervangen.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._saved_state: Optional[tuple] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["SnapshotMirror"]:
+        """Mirror op AIRTABLE_MIRROR_PATH; een lege waarde schakelt de mirror uit."""
+        path = os.environ.get('AIRTABLE_MIRROR_PATH', str(DEFAULT_MIRROR_PATH))
+        return cls(Path(path)) if path else None
+
+    def load(self) -> Optional[GroepenSnapshot]:
+        """Lees de snapshot; None als er geen (geldig) bestand is."""
+        try:
+            snapshot = GroepenSnapshot.model_validate_json(self.path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Snapshot mirror {self.path} onleesbaar, wordt genegeerd: {str(e)}")
+            return None
+        logger.info(f"Snapshot mirror geladen: {len(snapshot.groepen)} GLI groepen van {snapshot.synced_at}")
+        return snapshot
+
+    @staticmethod
+    def _state(store: GroepenStore, watermark: Optional[datetime]) -> tuple:
+        return (store.version, store.synced_at, watermark)
+
+    def mark_saved(self, store: GroepenStore, watermark: Optional[datetime]):
+        """Noteer dat het bestand deze store al bevat, bijv. direct na load()."""
+        self._saved_state = self._state(store, watermark)
+
+    async def save(self, store: GroepenStore, watermark: Optional[datetime]) -> bool:
+        """
+        Schrijf de store weg als groepen, synced_at of watermark sinds de vorige
+        keer gewijzigd zijn; True als het bestand herschreven is.
+
+        Ook een sync zonder wijzigingen wordt weggeschreven, anders lijkt de
+        snapshot na een herstart ouder dan hij is en begint de sync bij een oud
+        watermark.
+        """
+        state = self._state(store, watermark)
+        if state == self._saved_state:
+            return False
+        data = GroepenSnapshot.from_store(store, watermark).model_dump_json().encode('utf-8')
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as e:
+            logger.error(f"Kan snapshot mirror niet schrijven naar {self.path}: {str(e)}")
+            return False
+        self._saved_state = state
+        return True
+
+    def _write(self, data: bytes):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.path)
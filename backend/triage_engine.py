@@ -0,0 +1,123 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+from airtable_models import GLIType
+from triage_models import TriageVraag
+
+# Programma's in vaste kolomvolgorde; bij gelijke score wint de eerste (zoals in de verwijzerstool)
+PROGRAMMAS = ["beweegkuur", "cool", "slimmer"]
+
+PROGRAMMA_GLI_TYPE = {
+    "beweegkuur": GLIType.BEWEEGKUUR,
+    "cool": GLIType.COOL,
+    "slimmer": GLIType.SLIMMER,
+}
+
+TRIAGE_VRAGEN = [
+    {
+        "id": "medische_conditie",
+        "vraag": "Wat is de primaire medische conditie van de patiënt?",
+        "opties": [
+            {"value": "diabetes2", "label": "Diabetes type 2 (HbA1c ≥ 7,0%)", "score": {"beweegkuur": 3, "slimmer": 1, "cool": 1}},
+            {"value": "cvd", "label": "Hart- en vaatziekten", "score": {"beweegkuur": 3, "slimmer": 1, "cool": 1}},
+            {"value": "prediabetes", "label": "Pre-diabetes/verhoogd risico", "score": {"slimmer": 3, "beweegkuur": 2, "cool": 1}},
+            {"value": "overgewicht", "label": "Overgewicht zonder co-morbiditeit", "score": {"cool": 2, "beweegkuur": 2, "slimmer": 1}},
+            {"value": "preventie", "label": "Preventie/algemene gezondheid", "score": {"cool": 3, "slimmer": 2, "beweegkuur": 1}},
+        ],
+    },
+    {
+        "id": "bmi",
+        "vraag": "Wat is de BMI van de patiënt?",
+        "opties": [
+            {"value": "bmi_23_25", "label": "23-25 kg/m²", "score": {"cool": 2, "slimmer": 1, "beweegkuur": 0}},
+            {"value": "bmi_25_30", "label": "25-30 kg/m²", "score": {"beweegkuur": 2, "slimmer": 2, "cool": 2}},
+            {"value": "bmi_30_plus", "label": "≥ 30 kg/m²", "score": {"beweegkuur": 3, "cool": 2, "slimmer": 2}},
+        ],
+    },
+    {
+        "id": "leeftijd",
+        "vraag": "Wat is de leeftijd van de patiënt?",
+        "opties": [
+            {"value": "jong", "label": "18-40 jaar", "score": {"cool": 2, "beweegkuur": 1, "slimmer": 1}},
+            {"value": "middelbaar", "label": "40-60 jaar", "score": {"slimmer": 3, "beweegkuur": 2, "cool": 2}},
+            {"value": "ouder", "label": "60+ jaar", "score": {"beweegkuur": 3, "slimmer": 2, "cool": 1}},
+        ],
+    },
+    {
+        "id": "motivatie",
+        "vraag": "Hoe is de motivatie van de patiënt?",
+        "opties": [
+            {"value": "hoog", "label": "Zeer gemotiveerd, wil intensieve begeleiding", "score": {"beweegkuur": 3, "slimmer": 2, "cool": 1}},
+            {"value": "gemiddeld", "label": "Gemotiveerd, voorkeur voor begeleiding", "score": {"slimmer": 3, "cool": 2, "beweegkuur": 2}},
+            {"value": "zelfstandig", "label": "Gemotiveerd, wil zelfstandig werken", "score": {"cool": 3, "slimmer": 1, "beweegkuur": 1}},
+        ],
+    },
+    {
+        "id": "beweging",
+        "vraag": "Wat is de huidige bewegingsactiviteit?",
+        "opties": [
+            {"value": "inactief", "label": "Nauwelijks actief, heeft structuur nodig", "score": {"beweegkuur": 3, "slimmer": 2, "cool": 1}},
+            {"value": "licht_actief", "label": "Licht actief, wil meer bewegen", "score": {"beweegkuur": 2, "slimmer": 2, "cool": 2}},
+            {"value": "actief", "label": "Redelijk actief, wil optimaliseren", "score": {"cool": 3, "slimmer": 2, "beweegkuur": 1}},
+        ],
+    },
+    {
+        "id": "begeleidingsbehoefte",
+        "vraag": "Wat voor begeleiding heeft de patiënt nodig?",
+        "opties": [
+            {"value": "intensief", "label": "Intensieve medische begeleiding", "score": {"beweegkuur": 3, "slimmer": 1, "cool": 0}},
+            {"value": "regelmatig", "label": "Regelmatige coaching en monitoring", "score": {"slimmer": 3, "beweegkuur": 2, "cool": 2}},
+            {"value": "beperkt", "label": "Beperkte begeleiding, meer zelfstandigheid", "score": {"cool": 3, "slimmer": 1, "beweegkuur": 1}},
+        ],
+    },
+]
+
+class TriageEngine:
+    """
+    Scoort verwijskandidaten met één matrixvermenigvuldiging.
+
+    Elke antwoordoptie is een rij in de score matrix (opties x programma's).
+    Een batch antwoorden wordt one-hot gecodeerd (patiënten x opties), zodat
+    de scores van de hele batch het product van beide matrices zijn.
+    """
+
+    def __init__(self, vragen: List[dict] = TRIAGE_VRAGEN):
+        self.vragen = [TriageVraag(**vraag) for vraag in vragen]
+        self._optie_index: Dict[Tuple[str, str], int] = {}
+
+        rijen = []
+        for vraag in self.vragen:
+            for optie in vraag.opties:
+                self._optie_index[(vraag.id, optie.value)] = len(rijen)
+                rijen.append([optie.score.get(programma, 0) for programma in PROGRAMMAS])
+
+        self.score_matrix = np.array(rijen, dtype=np.int32)
+        self._vraag_ids = {vraag.id for vraag in self.vragen}
+
+    def encode(self, batch: List[Dict[str, str]]) -> np.ndarray:
+        """
+        Codeer antwoorden one-hot naar een (patiënten x opties) matrix.
+
+        Raises:
+            ValueError: Bij een onbekende vraag of optie
+        """
+        antwoorden = np.zeros((len(batch), len(self._optie_index)), dtype=np.int32)
+        for rij, patient in enumerate(batch):
+            for vraag_id, optie in patient.items():
+                kolom = self._optie_index.get((vraag_id, optie))
+                if kolom is None:
+                    raise ValueError(f"Patiënt {rij}: onbekend antwoord '{optie}' op vraag '{vraag_id}'")
+                antwoorden[rij, kolom] = 1
+        return antwoorden
+
+    def score(self, batch: List[Dict[str, str]]) -> np.ndarray:
+        """Scores per patiënt en programma (patiënten x programma's)."""
+        return self.encode(batch) @ self.score_matrix
+
+    @staticmethod
+    def rank(scores: np.ndarray) -> np.ndarray:
+        """Programma-indices per patiënt, van hoogste naar laagste score."""
+        return np.argsort(-scores, axis=1, kind="stable")
+
+    def alle_vragen_beantwoord(self, antwoorden: Dict[str, str]) -> bool:
+        return self._vraag_ids.issubset(antwoorden)
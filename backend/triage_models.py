@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
+
+from airtable_models import GLIGroepResponse, GLIType
+
+class TriageOptie(BaseModel):
+    """Antwoordoptie met de score per programma."""
+    value: str
+    label: str
+    score: Dict[str, int]
+
+class TriageVraag(BaseModel):
+    """Triagevraag uit de verwijzerstool."""
+    id: str
+    vraag: str
+    type: str = "single"
+    opties: List[TriageOptie]
+
+class TriagePatient(BaseModel):
+    """Antwoorden voor één verwijskandidaat."""
+    referentie: Optional[str] = Field(None, description="Eigen kenmerk van de praktijk, wordt teruggegeven")
+    antwoorden: Dict[str, str] = Field(..., description="Vraag ID -> gekozen optie")
+
+class TriageBatchRequest(BaseModel):
+    """Batch van verwijskandidaten om te scoren."""
+    patienten: List[TriagePatient] = Field(..., min_length=1, max_length=500)
+    max_groepen: int = Field(3, ge=0, le=20, description="Aantal open groepen per advies")
+
+class ProgrammaScore(BaseModel):
+    """Score van één programma."""
+    programma: str
+    gli_type: GLIType
+    score: int
+
+class TriageAdvies(BaseModel):
+    """Advies voor één verwijskandidaat."""
+    referentie: Optional[str] = None
+    primair: ProgrammaScore
+    secundair: ProgrammaScore
+    scores: Dict[str, int]
+    alle_vragen_beantwoord: bool
+    groepen: List[GLIGroepResponse] = Field(default_factory=list, description="Open groepen voor het primaire programma")
+
+class TriageBatchResponse(BaseModel):
+    """Adviezen in dezelfde volgorde als de aangeleverde patiënten."""
+    adviezen: List[TriageAdvies]
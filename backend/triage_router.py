@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List
+import logging
+
+from airtable_service import get_airtable_service, AirtableService
+from airtable_models import GLIBeschikbaarQuery, GLIGroepResponse, GLIType
+from triage_engine import TriageEngine, PROGRAMMAS, PROGRAMMA_GLI_TYPE
+from triage_models import (
+    TriageVraag,
+    TriageBatchRequest,
+    TriageBatchResponse,
+    TriageAdvies,
+    ProgrammaScore
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/triage",
+    tags=["triage"],
+    responses={
+        422: {"description": "Ongeldige antwoorden"}
+    }
+)
+
+engine = TriageEngine()
+
+async def _open_groepen(service: AirtableService, gli_types: set, limit: int) -> Dict[GLIType, List[GLIGroepResponse]]:
+    """Eerstvolgende groepen met open inschrijving per GLI type."""
+    gli_types = list(gli_types)
+    queries = [GLIBeschikbaarQuery(gli_type=gli_type, limit=limit) for gli_type in gli_types]
+    results = await service.get_beschikbare_groepen(queries)
+    return dict(zip(gli_types, results))
+
+@router.get("/vragen", response_model=List[TriageVraag])
+async def get_triage_vragen():
+    """
+    Haal de triagevragen op.
+
+    Retourneert de vragen en antwoordopties met hun scores per programma.
+    """
+    return engine.vragen
+
+@router.post("/batch", response_model=TriageBatchResponse)
+async def triage_batch(
+    request: TriageBatchRequest,
+    service: AirtableService = Depends(get_airtable_service)
+):
+    """
+    Score een batch verwijskandidaten.
+
+    Retourneert per patiënt het geadviseerde programma, het tweede programma
+    en de eerstvolgende open groepen voor het primaire programma.
+    """
+    antwoorden = [patient.antwoorden for patient in request.patienten]
+    try:
+        scores = engine.score(antwoorden)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    ranking = engine.rank(scores)
+    primaire_types = {PROGRAMMA_GLI_TYPE[PROGRAMMAS[i]] for i in ranking[:, 0]}
+
+    groepen = {}
+    if request.max_groepen:
+        try:
+            groepen = await _open_groepen(service, primaire_types, request.max_groepen)
+        except Exception as e:
+            # Het advies zelf hangt niet van Airtable af
+            logger.warning(f"Kan open groepen voor triage niet ophalen: {str(e)}")
+
+    def programma_score(rij: int, kolom: int) -> ProgrammaScore:
+        programma = PROGRAMMAS[kolom]
+        return ProgrammaScore(
+            programma=programma,
+            gli_type=PROGRAMMA_GLI_TYPE[programma],
+            score=int(scores[rij, kolom])
+        )
+
+    adviezen = []
+    for rij, patient in enumerate(request.patienten):
+        primair = programma_score(rij, ranking[rij, 0])
+        adviezen.append(TriageAdvies(
+            referentie=patient.referentie,
+            primair=primair,
+            secundair=programma_score(rij, ranking[rij, 1]),
+            scores={programma: int(scores[rij, i]) for i, programma in enumerate(PROGRAMMAS)},
+            alle_vragen_beantwoord=engine.alle_vragen_beantwoord(patient.antwoorden),
+            groepen=groepen.get(primair.gli_type, [])
+        ))
+
+    logger.info(f"Triage batch gescoord: {len(adviezen)} patiënten")
+    return TriageBatchResponse(adviezen=adviezen)
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+class UserCache:
+    """
+    Bounded LRU cache of verified bearer token -> user, with a TTL.
+
+    Entries never outlive the token's own `exp` claim. All tokens of a user can
+    be dropped at once with `invalidate_email`, e.g. after the user is updated
+    or deactivated. The time of that invalidation is remembered for
+    `remember_for` seconds (the token lifetime), so tokens issued before it
+    can be sent back to the database instead of being trusted again.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, remember_for: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.remember_for = remember_for
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._tokens_by_email: Dict[str, Set[str]] = {}
+        self._invalidated_at: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Any]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, email, user = entry
+        if expires_at <= time.time():
+            self._drop(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return user
+
+    def put(self, token: str, email: str, user: Any, token_exp: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+
+        self._drop(token)
+        self._entries[token] = (expires_at, email, user)
+        self._tokens_by_email.setdefault(email, set()).add(token)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+    def invalidate_email(self, email: str):
+        for token in list(self._tokens_by_email.get(email, ())):
+            self._drop(token)
+        now = time.time()
+        # Oldest first: invalidations older than any live token no longer matter
+        while self._invalidated_at and next(iter(self._invalidated_at.values())) < now - self.remember_for:
+            self._invalidated_at.popitem(last=False)
+        self._invalidated_at.pop(email, None)
+        self._invalidated_at[email] = now
+
+    def invalidated_since(self, email: str, issued_at: float) -> bool:
+        """True if the user was invalidated at or after a token's `iat`."""
+        invalidated_at = self._invalidated_at.get(email)
+        return invalidated_at is not None and invalidated_at >= issued_at
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_email.clear()
+        self._invalidated_at.clear()
+
+    def _drop(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_email.get(entry[1])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_email[entry[1]]
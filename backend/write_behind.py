@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from bson import json_util
+from pymongo.errors import BulkWriteError, PyMongoError
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process spool locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+class _Segment:
+    """One spool file; it is locked while this process owns it."""
+
+    def __init__(self, path: Path, handle):
+        self.path = path
+        self.handle = handle
+
+    @classmethod
+    def create(cls, spool_dir: Path, prefix: str) -> "_Segment":
+        path = spool_dir / f"{prefix}.{os.getpid()}.{time.time_ns()}.ndjson"
+        handle = open(path, "a+", encoding="utf-8")
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return cls(path, handle)
+
+    @classmethod
+    def claim(cls, path: Path) -> Optional["_Segment"]:
+        """Take over a spool file left behind, unless another live process still holds it."""
+        handle = open(path, "a+", encoding="utf-8")
+        if fcntl:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return None
+        return cls(path, handle)
+
+    def read(self) -> List[dict]:
+        self.handle.seek(0)
+        documents = []
+        for line in self.handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                documents.append(json_util.loads(line))
+            except ValueError:
+                # A line torn by a crash mid-write; everything before it is intact
+                logger.warning(f"Skipping unreadable line in {self.path}")
+        return documents
+
+    def remove(self):
+        self.handle.close()
+        self.path.unlink(missing_ok=True)
+
+class WriteBehindQueue:
+    """
+    Acknowledge writes immediately and insert them into Mongo in batches.
+
+    Each submitted document is first appended to a local spool file (fsynced
+    by default), so a crash never loses an acknowledged write: spool files
+    left behind are replayed on the next start. A background task flushes
+    the buffer with insert_many once it reaches `batch_size` documents or
+    `flush_interval` seconds have passed. The collection needs a unique index
+    on `id`, which makes replaying a partially flushed batch harmless.
+    """
+
+    def __init__(self, collection, spool_dir: Path, batch_size: int = 100,
+                 flush_interval: float = 1.0, fsync: bool = True):
+        self.collection = collection
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.prefix = collection.name
+
+        self._buffer: List[dict] = []
+        # Full spool files whose documents are all still in the buffer
+        self._segments: List[_Segment] = []
+        self._current: Optional[_Segment] = None
+        self._file_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.submitted = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    @classmethod
+    def from_env(cls, collection) -> "WriteBehindQueue":
+        default_dir = Path(__file__).parent / 'data' / 'spool'
+        return cls(
+            collection,
+            spool_dir=Path(os.environ.get('CONTACT_SPOOL_DIR', str(default_dir))),
+            batch_size=int(os.environ.get('CONTACT_QUEUE_BATCH_SIZE', '100')),
+            flush_interval=float(os.environ.get('CONTACT_QUEUE_FLUSH_INTERVAL', '1.0')),
+            fsync=os.environ.get('CONTACT_SPOOL_FSYNC', '1').lower() in ('1', 'true', 'yes'),
+        )
+
+    def start(self):
+        """Replay spool files left by earlier runs and start the flush loop."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        recovered = 0
+        for path in sorted(self.spool_dir.glob(f"{self.prefix}.*.ndjson")):
+            segment = _Segment.claim(path)
+            if segment is None:
+                continue
+            documents = segment.read()
+            self._buffer.extend(documents)
+            self._segments.append(segment)
+            recovered += len(documents)
+        if recovered:
+            logger.info(f"Recovered {recovered} unflushed {self.prefix} documents from the spool")
+
+        self._current = _Segment.create(self.spool_dir, self.prefix)
+        self._task = asyncio.create_task(self._run())
+        if self._buffer:
+            self._wakeup.set()
+
+    async def submit(self, document: dict):
+        """Spool the document and return; it reaches Mongo with the next flush."""
+        line = json_util.dumps(document) + "\n"
+        await asyncio.to_thread(self._append, line, document)
+        self.submitted += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _append(self, line: str, document: dict):
+        # Under the same lock as _rotate: a rotated spool file never holds a
+        # document that is missing from the buffer snapshot of that flush
+        with self._file_lock:
+            handle = self._current.handle
+            handle.write(line)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+            self._buffer.append(document)
+
+    def _rotate(self):
+        """Close off the current spool file so the next flush can delete it."""
+        with self._file_lock:
+            self._segments.append(self._current)
+            self._current = _Segment.create(self.spool_dir, self.prefix)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Insert everything buffered so far; returns the number of documents flushed."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            await asyncio.to_thread(self._rotate)
+            batch = self._buffer[:]
+            segments = self._segments[:]
+            try:
+                for start in range(0, len(batch), self.batch_size):
+                    await self._insert(batch[start:start + self.batch_size])
+            except PyMongoError as e:
+                # Keep buffer and spool files; the next flush retries
+                self.failed_flushes += 1
+                logger.error(f"Flushing {len(batch)} {self.prefix} documents failed: {str(e)}")
+                return 0
+
+            del self._buffer[:len(batch)]
+            self._segments = self._segments[len(segments):]
+            for segment in segments:
+                segment.remove()
+            self.flushed += len(batch)
+            return len(batch)
+
+    async def _insert(self, documents: List[dict]):
+        # insert_many adds _id to the dicts; copies keep a retried batch clean
+        try:
+            await self.collection.insert_many([dict(document) for document in documents], ordered=False)
+        except BulkWriteError as e:
+            # Duplicates are documents a crashed flush already inserted
+            if any(error.get("code") != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+                raise
+            if e.details.get("writeConcernErrors"):
+                raise
+
+    async def close(self, timeout: float = 10.0):
+        """Stop the flush loop and drain the buffer; anything left stays in the spool."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Draining {self.prefix} queue timed out; {len(self._buffer)} documents stay spooled")
+        if self._buffer:
+            logger.warning(f"{len(self._buffer)} {self.prefix} documents stay spooled until the next start")
+        for segment in self._segments + ([self._current] if self._current else []):
+            if segment is self._current and not self._buffer:
+                segment.remove()
+            else:
+                segment.handle.close()
+        self._segments = []
+        self._current = None
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "submitted": self.submitted,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "spool_files": len(self._segments) + (1 if self._current else 0),
+        }
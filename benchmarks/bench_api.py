@@ -0,0 +1,282 @@
+"""
+Load- en latency benchmark voor de GLI API.
+
+    python benchmarks/bench_api.py --records 2000 --latency-ms 80 --concurrency 20 --requests 400
+
+Start de lokale Airtable stand-in en server.py (tegen mongomock, of tegen
+MONGO_URL met --mongo url) als subprocessen, zet testdata klaar en stuurt
+per route gelijktijdige load. Per route worden throughput en p50/p95/p99
+latency als JSON gerapporteerd, op stdout of in --output.
+
+Routes die bij elk request Airtable aanroepen (exports, debug/raw en de
+schrijvende routes met --include-writes) krijgen --upstream-requests
+requests, omdat de stand-in net als Airtable maar 5 req/s toelaat.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+async def wait_until_up(client: httpx.AsyncClient, url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get(url)
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} niet bereikbaar na {timeout}s")
+
+async def drive(client: httpx.AsyncClient, request: Callable, total: int, concurrency: int) -> dict:
+    """Stuur `total` requests met `concurrency` workers en meet de latency per request."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await request(client)
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+                # Streaming responses tellen pas als de hele body binnen is
+                await response.aread()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+async def prepare(client: httpx.AsyncClient) -> dict:
+    """Zet Mongo testdata klaar; geeft een token, een bestaand groep ID en een triage patiënt."""
+    (await client.post("/api/admin/seed")).raise_for_status()
+    credentials = {"email": "bench@example.nl", "password": "bench-password"}
+    await client.post("/api/auth/register", json={**credentials, "name": "Bench", "role": "admin"})
+    login = await client.post("/api/auth/login", json=credentials)
+    login.raise_for_status()
+    groepen = await client.get("/api/gli-groepen/", params={"limit": 1})
+    groepen.raise_for_status()
+    vragen = await client.get("/api/triage/vragen")
+    vragen.raise_for_status()
+    patient = {
+        "referentie": "bench",
+        "antwoorden": {vraag["id"]: vraag["opties"][0]["value"] for vraag in vragen.json()}
+    }
+    return {"token": login.json()["token"], "groep_id": groepen.json()[0]["id"], "patient": patient}
+
+# Routes die per request (meerdere) Airtable calls doen
+UPSTREAM_ROUTES = {
+    "GET /api/gli-groepen/export",
+    "GET /api/gli-groepen/export?format=csv",
+    "GET /api/gli-groepen/debug/raw",
+    "POST /api/gli-groepen/",
+    "POST /api/gli-groepen/batch",
+    "PUT /api/gli-groepen/{id}",
+    "DELETE /api/gli-groepen/{id}",
+}
+
+def new_groep(i: int) -> dict:
+    return {
+        "gli_aanbieder": "Bench", "type_gli": "Cool", "startdatum_groep": "2026-09-01",
+        "einddatum_groep": "2027-03-01", "groepnummer": f"BENCH-{i}", "status": "In planning"
+    }
+
+def routes(context: dict, include_writes: bool) -> Dict[str, Callable]:
+    auth = {"Authorization": f"Bearer {context['token']}"}
+    groep_id = context["groep_id"]
+    # Groepen die de create routes aanmaken; DELETE verwijdert ze weer
+    created: List[str] = []
+
+    async def create_groep(c: httpx.AsyncClient) -> httpx.Response:
+        response = await c.post("/api/gli-groepen/", json=new_groep(len(created)))
+        if response.status_code == 200:
+            created.append(response.json()["id"])
+        return response
+
+    async def batch_groepen(c: httpx.AsyncClient) -> httpx.Response:
+        operations = [{"action": "create", "groep": new_groep(len(created) + i)} for i in range(10)]
+        response = await c.post("/api/gli-groepen/batch", json={"operations": operations})
+        if response.status_code == 200:
+            created.extend(result["id"] for result in response.json()["results"] if result["success"])
+        return response
+
+    async def delete_groep(c: httpx.AsyncClient) -> httpx.Response:
+        # Zonder eerder aangemaakte groepen meet dit het 404 pad
+        record_id = created.pop() if created else "recBenchMissing"
+        return await c.delete(f"/api/gli-groepen/{record_id}")
+
+    selected = {
+        "GET /api/": lambda c: c.get("/api/"),
+        "GET /api/programs": lambda c: c.get("/api/programs"),
+        "GET /api/coaches": lambda c: c.get("/api/coaches"),
+        "GET /api/faqs": lambda c: c.get("/api/faqs"),
+        "GET /api/faqs?role=inwoner": lambda c: c.get("/api/faqs", params={"role": "inwoner"}),
+        "GET /api/resources": lambda c: c.get("/api/resources", headers=auth),
+        "GET /api/events": lambda c: c.get("/api/events", headers=auth),
+        "GET /api/events/upcoming": lambda c: c.get("/api/events/upcoming", headers=auth),
+        "GET /api/search": lambda c: c.get("/api/search", params={"q": "gli traject"}),
+        "GET /api/search?types=groepen": lambda c: c.get("/api/search", params={"q": "aanbieder", "types": "groepen"},
+                                                          headers=auth),
+        "GET /api/contact-requests/export": lambda c: c.get("/api/contact-requests/export", headers=auth),
+        "GET /api/auth/profile": lambda c: c.get("/api/auth/profile", headers=auth),
+        "GET /api/gli-groepen/": lambda c: c.get("/api/gli-groepen/"),
+        "GET /api/gli-groepen/?limit=50": lambda c: c.get("/api/gli-groepen/", params={"limit": 50}),
+        "GET /api/gli-groepen/?status": lambda c: c.get("/api/gli-groepen/", params={"status": "Inschrijving open"}),
+        "GET /api/gli-groepen/actief": lambda c: c.get("/api/gli-groepen/actief"),
+        "GET /api/gli-groepen/type/{type}": lambda c: c.get("/api/gli-groepen/type/Cool"),
+        "GET /api/gli-groepen/statistieken": lambda c: c.get("/api/gli-groepen/statistieken"),
+        "GET /api/gli-groepen/beschikbaar": lambda c: c.get("/api/gli-groepen/beschikbaar", params={"gli_type": "Cool"}),
+        "POST /api/gli-groepen/beschikbaar/batch": lambda c: c.post("/api/gli-groepen/beschikbaar/batch", json={
+            "queries": [{"gli_type": gli_type, "vanaf": f"2025-{month:02d}-01"}
+                        for gli_type in ("Beweegkuur", "Cool", "Slimmer") for month in range(1, 13)]
+        }),
+        "GET /api/gli-groepen/{id}": lambda c: c.get(f"/api/gli-groepen/{groep_id}"),
+        "GET /api/gli-groepen/export": lambda c: c.get("/api/gli-groepen/export"),
+        "GET /api/gli-groepen/export?format=csv": lambda c: c.get("/api/gli-groepen/export", params={"format": "csv"}),
+        "GET /api/gli-groepen/debug/raw": lambda c: c.get("/api/gli-groepen/debug/raw"),
+        "GET /api/triage/vragen": lambda c: c.get("/api/triage/vragen"),
+        "POST /api/triage/batch": lambda c: c.post("/api/triage/batch", json={"patienten": [context["patient"]] * 50}),
+    }
+    if include_writes:
+        selected.update({
+            "POST /api/contact": lambda c: c.post("/api/contact", json={
+                "name": "Bench", "email": "bench@example.nl", "message": "Load test", "request_type": "info"
+            }),
+            "POST /api/auth/login": lambda c: c.post("/api/auth/login", json={
+                "email": "bench@example.nl", "password": "bench-password"
+            }),
+            "POST /api/gli-groepen/": create_groep,
+            "POST /api/gli-groepen/batch": batch_groepen,
+            "PUT /api/gli-groepen/{id}": lambda c: c.put(f"/api/gli-groepen/{groep_id}", json={"status": "Vol"}),
+            "DELETE /api/gli-groepen/{id}": delete_groep,
+        })
+    return selected
+
+def start(args: List[str], env: Optional[dict] = None) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], env={**os.environ, **(env or {})})
+
+async def run(args) -> dict:
+    airtable_port, api_port = free_port(), free_port()
+    airtable = start([
+        str(BENCH_DIR / "fake_airtable.py"), "--port", str(airtable_port),
+        "--records", str(args.records), "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms), "--rate-limit", str(args.rate_limit)
+    ])
+    api = start([str(BENCH_DIR / "serve_app.py"), "--port", str(api_port)], env={
+        "AIRTABLE_API_URL": f"http://127.0.0.1:{airtable_port}/v0",
+        "AIRTABLE_ACCESS_TOKEN": "bench",
+        "AIRTABLE_BASE_ID": "appBench",
+        "AIRTABLE_MIRROR_PATH": "",
+        "BENCH_MONGO": args.mongo,
+        "MONGO_URL": os.environ.get("MONGO_URL", "mongodb://localhost:27017"),
+        "DB_NAME": os.environ.get("DB_NAME", "gli_bench"),
+    })
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{api_port}", limits=limits,
+                                     timeout=args.timeout) as client:
+            await wait_until_up(client, f"http://127.0.0.1:{airtable_port}/_stats")
+            await wait_until_up(client, "/api/")
+            context = await prepare(client)
+
+            results = {}
+            for name, request in routes(context, args.include_writes).items():
+                if args.route and not any(pattern in name for pattern in args.route):
+                    continue
+                total = args.upstream_requests if name in UPSTREAM_ROUTES else args.requests
+                await drive(client, request, args.warmup, min(args.concurrency, args.warmup or 1))
+                results[name] = await drive(client, request, total, args.concurrency)
+                print(f"{name}: {results[name]['p50_ms']}ms p50, {results[name]['throughput_rps']} req/s",
+                      file=sys.stderr)
+
+            upstream = (await client.get(f"http://127.0.0.1:{airtable_port}/_stats")).json()
+    finally:
+        api.terminate()
+        airtable.terminate()
+        api.wait()
+        airtable.wait()
+
+    return {
+        "config": {
+            "records": args.records,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "rate_limit": args.rate_limit,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "upstream_requests": args.upstream_requests,
+            "mongo": args.mongo,
+        },
+        "airtable": upstream,
+        "routes": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load- en latency benchmark voor de GLI API")
+    parser.add_argument("--records", type=int, default=500, help="Aantal groepen in de Airtable stand-in")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Airtable latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--rate-limit", type=float, default=5, help="Airtable requests per seconde, 0 voor geen limiet")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--upstream-requests", type=int, default=20,
+                        help="Requests per route voor routes die elke keer Airtable aanroepen")
+    parser.add_argument("--warmup", type=int, default=10, help="Requests per route vóór de meting")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--mongo", choices=["mock", "url"], default="mock",
+                        help="mongomock in-process, of MongoDB via MONGO_URL")
+    parser.add_argument("--route", action="append", help="Alleen routes die deze tekst bevatten")
+    parser.add_argument("--include-writes", action="store_true", help="Ook schrijvende routes belasten")
+    parser.add_argument("--output", help="Schrijf het JSON rapport naar dit bestand")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Vergelijk de standaard FastAPI serialisatie met FastJSONResponse.
+
+    python benchmarks/bench_json.py --groepen 2000 --rounds 50
+
+Meet per ronde het serialiseren van een lijst GLIGroepResponse modellen:
+- default: response_model validatie + jsonable_encoder + json.dumps (FastAPI pad)
+- fast: serialize_models naar bytes via pydantic-core
+- cached: hergebruik van voorgecodeerde bytes uit de GroepenStore
+Het resultaat wordt als JSON op stdout geschreven.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from airtable_models import GLIGroepResponse, GLIType, GroupStatus
+from fast_json import FastJSONResponse, serialize_models
+from groepen_store import GroepenStore
+
+def make_groepen(n: int) -> List[GLIGroepResponse]:
+    types = list(GLIType)
+    statuses = list(GroupStatus)
+    start = date(2025, 1, 1)
+    return [
+        GLIGroepResponse(
+            id=f"rec{i:014d}",
+            gli_aanbieder=f"Aanbieder {i % 12}",
+            type_gli=types[i % len(types)],
+            startdatum_groep=start + timedelta(days=i % 365),
+            einddatum_groep=start + timedelta(days=i % 365 + 180),
+            groepnummer=f"G-{i}",
+            status=statuses[i % len(statuses)],
+            created_time="2025-01-01T00:00:00.000Z"
+        )
+        for i in range(n)
+    ]
+
+async def default_path(field, groepen) -> bytes:
+    content = await serialize_response(field=field, response_content=groepen, is_coroutine=True)
+    return JSONResponse(content).body
+
+def fast_path(groepen) -> bytes:
+    return FastJSONResponse(serialize_models(GLIGroepResponse, groepen)).body
+
+def cached_path(store: GroepenStore) -> bytes:
+    body = store.encoded("alle", lambda: serialize_models(GLIGroepResponse, list(store.records.values())))
+    return FastJSONResponse(body).body
+
+def summarize(timings: List[float]) -> dict:
+    timings = sorted(timings)
+    return {
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "min_ms": round(timings[0] * 1000, 3),
+    }
+
+async def run(n: int, rounds: int) -> dict:
+    groepen = make_groepen(n)
+    store = GroepenStore()
+    store.replace_all(groepen)
+    field = create_response_field(name="response", type_=List[GLIGroepResponse])
+
+    # Beide paden moeten dezelfde JSON opleveren
+    assert json.loads(await default_path(field, groepen)) == json.loads(fast_path(groepen))
+
+    results = {}
+    for name, call in (
+        ("default", lambda: default_path(field, groepen)),
+        ("fast", lambda: fast_path(groepen)),
+        ("cached", lambda: cached_path(store)),
+    ):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            result = call()
+            if asyncio.iscoroutine(result):
+                await result
+            timings.append(time.perf_counter() - started)
+        results[name] = summarize(timings)
+
+    return {"groepen": n, "rounds": rounds, "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--groepen", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.groepen, args.rounds)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Lokale stand-in voor de Airtable REST API, voor benchmarks.
+
+    python benchmarks/fake_airtable.py --port 8765 --records 2000 --latency-ms 80 --rate-limit 5
+
+Ondersteunt list (paginering, fields[], LAST_MODIFIED_TIME filter), get,
+create, update, delete en de batch varianten. Met --rate-limit antwoordt de
+server met 429 zodra meer requests per seconde binnenkomen dan Airtable toestaat.
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+GLI_TYPES = ["Beweegkuur", "Cool", "Slimmer"]
+STATUSES = ["In planning", "Inschrijving open", "Beschikbaar", "Vol", "Gestart", "Afgerond"]
+
+class FakeAirtable:
+    """In-memory tabel met instelbare latency en rate limit."""
+
+    def __init__(self, records: int, latency: float, jitter: float, rate_limit: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.records: Dict[str, dict] = {}
+        self.modified: Dict[str, datetime] = {}
+        self._window: List[float] = []
+        self.requests = 0
+        self.throttled = 0
+        for i in range(records):
+            self.put(self.new_record(self.sample_fields(i)))
+
+    @staticmethod
+    def now() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    @staticmethod
+    def sample_fields(i: int) -> dict:
+        start = date(2025, 1, 6) + timedelta(days=7 * (i % 104))
+        return {
+            "GLI aanbieder": f"Aanbieder {i % 15}",
+            "Type GLI": GLI_TYPES[i % len(GLI_TYPES)],
+            "Startdatum groep": start.isoformat(),
+            "Einddatum groep": (start + timedelta(days=365)).isoformat(),
+            "Groepnummer": f"G-{i:05d}",
+            "Status": STATUSES[i % len(STATUSES)],
+        }
+
+    def new_record(self, fields: dict) -> dict:
+        record_id = "rec" + "".join(random.choices(string.ascii_letters + string.digits, k=14))
+        return {"id": record_id, "createdTime": self.now(), "fields": fields}
+
+    def put(self, record: dict) -> dict:
+        self.records[record["id"]] = record
+        self.modified[record["id"]] = datetime.now(timezone.utc)
+        return record
+
+    async def admit(self):
+        """Simuleer netwerklatency en het rate limit van een base."""
+        self.requests += 1
+        if self.rate_limit:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.rate_limit:
+                self.throttled += 1
+                raise HTTPException(status_code=429, detail="RATE_LIMIT_REACHED", headers={"Retry-After": "1"})
+            self._window.append(now)
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    def get_or_404(self, record_id: str) -> dict:
+        if record_id not in self.records:
+            raise HTTPException(status_code=404, detail="NOT_FOUND")
+        return self.records[record_id]
+
+def create_app(table: FakeAirtable) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v0/{base_id}/{table_name}")
+    async def list_records(base_id: str, table_name: str, request: Request):
+        await table.admit()
+        params = request.query_params
+        records = list(table.records.values())
+
+        formula = params.get("filterByFormula", "")
+        if "LAST_MODIFIED_TIME" in formula:
+            since = datetime.fromisoformat(formula.split("'")[1].replace("Z", "+00:00"))
+            records = [r for r in records if table.modified[r["id"]] > since]
+
+        fields = params.getlist("fields[]")
+        if fields:
+            records = [{**r, "fields": {k: v for k, v in r["fields"].items() if k in fields}} for r in records]
+
+        page_size = min(100, int(params.get("pageSize", 100)))
+        offset = int(params.get("offset", 0))
+        body = {"records": records[offset:offset + page_size]}
+        if offset + page_size < len(records):
+            body["offset"] = str(offset + page_size)
+        return body
+
+    @app.get("/v0/{base_id}/{table_name}/{record_id}")
+    async def get_record(base_id: str, table_name: str, record_id: str):
+        await table.admit()
+        return table.get_or_404(record_id)
+
+    @app.post("/v0/{base_id}/{table_name}")
+    async def create_records(base_id: str, table_name: str, request: Request):
+        await table.admit()
+        body = await request.json()
+        if "records" in body:
+            return {"records": [table.put(table.new_record(r["fields"])) for r in body["records"]]}
+        return table.put(table.new_record(body["fields"]))
+
+    @app.patch("/v0/{base_id}/{table_name}")
+    async def update_records(base_id: str, table_name: str, request: Request):
+        await table.admit()
+        body = await request.json()
+        updated = []
+        for update in body["records"]:
+            record = table.get_or_404(update["id"])
+            updated.append(table.put({**record, "fields": {**record["fields"], **update["fields"]}}))
+        return {"records": updated}
+
+    @app.patch("/v0/{base_id}/{table_name}/{record_id}")
+    async def update_record(base_id: str, table_name: str, record_id: str, request: Request):
+        await table.admit()
+        record = table.get_or_404(record_id)
+        body = await request.json()
+        return table.put({**record, "fields": {**record["fields"], **body["fields"]}})
+
+    @app.delete("/v0/{base_id}/{table_name}")
+    async def delete_records(base_id: str, table_name: str, request: Request):
+        await table.admit()
+        record_ids = request.query_params.getlist("records[]")
+        for record_id in record_ids:
+            table.get_or_404(record_id)
+        for record_id in record_ids:
+            table.records.pop(record_id)
+        return {"records": [{"id": record_id, "deleted": True} for record_id in record_ids]}
+
+    @app.delete("/v0/{base_id}/{table_name}/{record_id}")
+    async def delete_record(base_id: str, table_name: str, record_id: str):
+        await table.admit()
+        table.get_or_404(record_id)
+        table.records.pop(record_id)
+        return {"id": record_id, "deleted": True}
+
+    @app.get("/_stats")
+    async def stats():
+        return JSONResponse({"records": len(table.records), "requests": table.requests,
+                             "throttled": table.throttled})
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokale stand-in voor de Airtable API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--records", type=int, default=500, help="Aantal groepen in de tabel")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Willekeurige extra/minder latency")
+    parser.add_argument("--rate-limit", type=float, default=5, help="Requests per seconde, 0 voor geen limiet")
+    args = parser.parse_args()
+
+    table = FakeAirtable(args.records, args.latency_ms / 1000, args.jitter_ms / 1000, args.rate_limit)
+    uvicorn.run(create_app(table), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Start server.py voor benchmarks, optioneel tegen mongomock in plaats van MongoDB.
+
+    BENCH_MONGO=mock python benchmarks/serve_app.py --port 8766
+
+Airtable wordt via AIRTABLE_API_URL naar de lokale stand-in gestuurd.
+"""
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+def main():
+    parser = argparse.ArgumentParser(description="Start de API voor benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    if os.environ.get('BENCH_MONGO', 'mock') == 'mock':
+        # Moet vóór het importeren van server gebeuren
+        import mongomock_motor
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+    import uvicorn
+    import server
+    # Request logging van server.py en httpx vertekent de meting
+    logging.getLogger().setLevel(os.environ.get('BENCH_LOG_LEVEL', 'WARNING'))
+    uvicorn.run(server.app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
+import { getAllPages } from '../lib/api';
 import { useAuth } from '../App';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -17,12 +18,12 @@ const DashboardPage = () => {
 
   const fetchDashboardData = async () => {
     try {
-      const [resourcesRes, eventsRes] = await Promise.all([
-        axios.get(`${API}/resources`),
-        axios.get(`${API}/events`)
+      const [resourcesData, eventsRes] = await Promise.all([
+        getAllPages(`${API}/resources`),
+        axios.get(`${API}/events/upcoming`)
       ]);
       
-      setResources(resourcesRes.data);
+      setResources(resourcesData);
       setEvents(eventsRes.data);
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
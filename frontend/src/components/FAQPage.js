@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
+import { getAllPages } from '../lib/api';
 import { useAuth } from '../App';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -11,15 +12,35 @@ const FAQPage = () => {
   const [loading, setLoading] = useState(true);
   const [selectedCategory, setSelectedCategory] = useState('alle');
   const [expandedFaq, setExpandedFaq] = useState(null);
+  const [searchQuery, setSearchQuery] = useState('');
+  const [searchIds, setSearchIds] = useState(null);
 
   useEffect(() => {
     fetchFaqs();
   }, []);
 
+  useEffect(() => {
+    if (!searchQuery.trim()) {
+      setSearchIds(null);
+      return;
+    }
+    // Ranked server-side search; wait until the user pauses typing
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API}/search`, {
+          params: { q: searchQuery, types: 'faqs', limit: 100 }
+        });
+        setSearchIds(response.data.results.map(result => result.id));
+      } catch (error) {
+        console.error('Error searching FAQs:', error);
+      }
+    }, 200);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
   const fetchFaqs = async () => {
     try {
-      const response = await axios.get(`${API}/faqs`);
-      setFaqs(response.data);
+      setFaqs(await getAllPages(`${API}/faqs`));
     } catch (error) {
       console.error('Error fetching FAQs:', error);
     }
@@ -35,9 +56,13 @@ const FAQPage = () => {
     { value: 'praktisch', label: 'Praktische zaken' }
   ];
 
+  const rankedFaqs = searchIds === null
+    ? faqs
+    : searchIds.map(id => faqs.find(faq => faq.id === id)).filter(Boolean);
+
   const filteredFaqs = selectedCategory === 'alle' 
-    ? faqs 
-    : faqs.filter(faq => faq.category === selectedCategory);
+    ? rankedFaqs 
+    : rankedFaqs.filter(faq => faq.category === selectedCategory);
 
   const toggleFaq = (faqId) => {
     setExpandedFaq(expandedFaq === faqId ? null : faqId);
@@ -113,6 +138,14 @@ const FAQPage = () => {
             {/* FAQ Content */}
             <div className="lg:col-span-3">
               <div className="mb-6">
+                <input
+                  type="search"
+                  className="form-input mb-4"
+                  placeholder="Zoek in de veelgestelde vragen..."
+                  value={searchQuery}
+                  onChange={(e) => setSearchQuery(e.target.value)}
+                  data-testid="faq-search-input"
+                />
                 <h2 className="text-2xl font-bold mb-2">
                   {categories.find(cat => cat.value === selectedCategory)?.label}
                 </h2>
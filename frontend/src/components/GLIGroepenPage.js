@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
+import { getAllPages } from '../lib/api';
 import { useAuth } from '../App';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -27,8 +28,7 @@ const GLIGroepenPage = () => {
 
   const fetchGroepen = async () => {
     try {
-      const response = await axios.get(`${API}/gli-groepen/`);
-      setGroepen(response.data);
+      setGroepen(await getAllPages(`${API}/gli-groepen/`));
     } catch (error) {
       console.error('Error fetching GLI groepen:', error);
     }
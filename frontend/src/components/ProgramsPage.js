@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import { getAllPages } from '../lib/api';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -16,8 +16,7 @@ const ProgramsPage = () => {
 
   const fetchPrograms = async () => {
     try {
-      const response = await axios.get(`${API}/programs`);
-      setPrograms(response.data);
+      setPrograms(await getAllPages(`${API}/programs`));
     } catch (error) {
       console.error('Error fetching programs:', error);
     }
@@ -26,8 +25,7 @@ const ProgramsPage = () => {
 
   const fetchGliGroepen = async () => {
     try {
-      const response = await axios.get(`${API}/gli-groepen/`);
-      setGliGroepen(response.data);
+      setGliGroepen(await getAllPages(`${API}/gli-groepen/`));
     } catch (error) {
       console.error('Error fetching GLI groepen:', error);
     }
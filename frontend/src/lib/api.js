@@ -0,0 +1,17 @@
+import axios from 'axios';
+
+// List endpoints return at most one page; the cursor for the next page is in this header
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+
+// Fetch every item of a paginated list endpoint by following X-Next-Cursor
+export async function getAllPages(url, config = {}) {
+  const items = [];
+  let after = null;
+  do {
+    const params = after ? { ...config.params, after } : config.params;
+    const response = await axios.get(url, { ...config, params });
+    items.push(...response.data);
+    after = response.headers[NEXT_CURSOR_HEADER];
+  } while (after);
+  return items;
+}
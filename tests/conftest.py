@@ -0,0 +1,21 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# De backend modules importeren elkaar als top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+@pytest.fixture
+def server(monkeypatch):
+    """server.py met een in-memory database in plaats van MONGO_URL."""
+    monkeypatch.setenv('MONGO_URL', os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+    monkeypatch.setenv('DB_NAME', os.environ.get('DB_NAME', 'test'))
+    module = importlib.import_module('server')
+    monkeypatch.setattr(module, 'db', AsyncMongoMockClient()['test'])
+    module.user_cache.clear()
+    module.response_cache.invalidate()
+    return module
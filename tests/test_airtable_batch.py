@@ -0,0 +1,115 @@
+import asyncio
+import json
+from typing import Callable, List
+
+import httpx
+import pytest
+
+import airtable_scheduler
+from airtable_models import GLIGroepBatchOperation
+from airtable_service import AirtableService
+
+FIELDS = {"GLI aanbieder": "Zorg4Zeist", "Type GLI": "Cool", "Startdatum groep": "2026-09-01",
+          "Einddatum groep": "2027-03-01", "Groepnummer": "0", "Status": "In planning"}
+
+def airtable_record(record_id: str, fields: dict) -> dict:
+    # Airtable geeft na een PATCH alle velden van het record terug
+    return {"id": record_id, "createdTime": "2026-01-15T10:30:00.000Z", "fields": {**FIELDS, **fields}}
+
+def create_op(groepnummer: str) -> GLIGroepBatchOperation:
+    return GLIGroepBatchOperation(action="create", groep={
+        "gli_aanbieder": "Zorg4Zeist", "type_gli": "Cool", "startdatum_groep": "2026-09-01",
+        "einddatum_groep": "2027-03-01", "groepnummer": groepnummer, "status": "In planning"
+    })
+
+def update_op(record_id: str) -> GLIGroepBatchOperation:
+    return GLIGroepBatchOperation(action="update", id=record_id, update={"status": "Vol"})
+
+def delete_op(record_id: str) -> GLIGroepBatchOperation:
+    return GLIGroepBatchOperation(action="delete", id=record_id)
+
+class FakeAirtable:
+    """Beantwoordt batch requests; `fail` bepaalt per request een foutstatus."""
+
+    def __init__(self, fail: Callable[[httpx.Request, list], int] = lambda request, records: 0):
+        self.fail = fail
+        self.requests: List[tuple] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            records = request.url.params.get_list("records[]")
+        else:
+            records = json.loads(request.content)["records"]
+        self.requests.append((request.method, len(records)))
+        status = self.fail(request, records)
+        if status:
+            return httpx.Response(status, json={"error": "fake"})
+        if request.method == "DELETE":
+            return httpx.Response(200, json={"records": [{"id": r, "deleted": True} for r in records]})
+        return httpx.Response(200, json={"records": [
+            airtable_record(r["id"] if "id" in r else f"recNew{r['fields']['Groepnummer']}", r["fields"])
+            for r in records
+        ]})
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv('AIRTABLE_ACCESS_TOKEN', 'test')
+    monkeypatch.setenv('AIRTABLE_BASE_ID', 'appBatch')
+    monkeypatch.setenv('AIRTABLE_MIRROR_PATH', '')
+    monkeypatch.setenv('AIRTABLE_RATE_LIMIT', '1000')
+    monkeypatch.setenv('AIRTABLE_RETRY_BASE_DELAY', '0.01')
+    monkeypatch.setenv('AIRTABLE_BREAKER_THRESHOLD', '100')
+    monkeypatch.setattr(airtable_scheduler, "_schedulers", {})
+    return AirtableService()
+
+def run_batch(service: AirtableService, fake: FakeAirtable, operations):
+    async def main():
+        service.gli_table._client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+        try:
+            return await service.batch_groepen(operations)
+        finally:
+            await service.gli_table.aclose()
+    return asyncio.run(main())
+
+def test_actions_run_create_then_update_then_delete(service):
+    fake = FakeAirtable()
+    operations = [delete_op("recA"), update_op("recB"), create_op("1"), update_op("recC"), create_op("2")]
+    results = run_batch(service, fake, operations)
+    assert [method for method, _ in fake.requests] == ["POST", "PATCH", "DELETE"]
+    assert [(r.index, r.action.value, r.success) for r in results] == [
+        (0, "delete", True), (1, "update", True), (2, "create", True), (3, "update", True), (4, "create", True)
+    ]
+    assert results[2].id == "recNew1"
+
+def test_rejected_chunk_is_split_per_record(service):
+    # Airtable weigert de hele batch als één record ongeldig is
+    invalid = lambda request, records: 422 if any(r["fields"]["Groepnummer"] == "bad" for r in records) else 0
+    fake = FakeAirtable(invalid)
+    operations = [create_op(str(i)) for i in range(4)] + [create_op("bad")] + [create_op(str(i)) for i in range(5, 10)]
+    results = run_batch(service, fake, operations)
+    assert fake.requests == [("POST", 10)] + [("POST", 1)] * 10
+    assert [r.success for r in results] == [True] * 4 + [False] + [True] * 5
+    assert "422" in results[4].error
+
+def test_rate_limited_chunk_is_retried(service):
+    statuses = [429]
+    fake = FakeAirtable(lambda request, records: statuses.pop() if statuses else 0)
+    results = run_batch(service, fake, [create_op(str(i)) for i in range(3)])
+    assert fake.requests == [("POST", 3), ("POST", 3)]
+    assert all(r.success for r in results)
+
+def test_server_error_fails_create_chunk_without_retry(service):
+    fake = FakeAirtable(lambda request, records: 503)
+    results = run_batch(service, fake, [create_op(str(i)) for i in range(3)])
+    # Mogelijk toch verwerkt: geen retry en geen losse creates die dubbel kunnen worden
+    assert fake.requests == [("POST", 3)]
+    assert not any(r.success for r in results)
+    assert all("Mogelijk toch aangemaakt" in r.error for r in results)
+
+def test_server_error_splits_update_chunk(service, monkeypatch):
+    monkeypatch.setattr(service.gli_table.scheduler, "max_retries", 0)
+    fake = FakeAirtable(lambda request, records: 500 if len(records) > 1 or records[0]["id"] == "recB" else 0)
+    results = run_batch(service, fake, [update_op("recA"), update_op("recB"), update_op("recC")])
+    assert fake.requests == [("PATCH", 3)] + [("PATCH", 1)] * 3
+    assert [r.success for r in results] == [True, False, True]
+    assert "500" in results[1].error
@@ -0,0 +1,188 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import InvalidOperation
+
+from airtable_coordination import FileCoordinator, MongoCoordinator, fcntl
+from airtable_models import GLIGroepResponse
+from airtable_service import AirtableService
+from groepen_store import GroepenStore
+from snapshot_mirror import GroepenSnapshot
+
+SYNCED_AT = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+def groep(i: int) -> GLIGroepResponse:
+    return GLIGroepResponse(
+        id=f"rec{i:04d}", gli_aanbieder="Zorg4Zeist", type_gli="Beweegkuur",
+        startdatum_groep="2026-09-01", einddatum_groep="2027-03-01",
+        groepnummer=f"BK-{i}", status="Inschrijving open", created_time="2026-01-15T10:30:00.000Z"
+    )
+
+def leader_store(count: int = 3) -> GroepenStore:
+    store = GroepenStore()
+    store.replace_all(groep(i) for i in range(count))
+    store.synced_at = SYNCED_AT
+    return store
+
+@pytest.fixture(params=["file", "mongo"])
+def coordinators(request, tmp_path):
+    """Twee workers die dezelfde coördinatie delen."""
+    if request.param == "file":
+        if fcntl is None:
+            pytest.skip("leiderverkiezing via bestanden vereist fcntl")
+        return FileCoordinator(tmp_path, tick=0.01), FileCoordinator(tmp_path, tick=0.01)
+    db = AsyncMongoMockClient()["test"]
+    return MongoCoordinator(db, lease_ttl=60, tick=0.01), MongoCoordinator(db, lease_ttl=60, tick=0.01)
+
+@pytest.fixture
+def follower_service(monkeypatch):
+    monkeypatch.setenv('AIRTABLE_ACCESS_TOKEN', 'test')
+    monkeypatch.setenv('AIRTABLE_BASE_ID', 'appTest')
+    monkeypatch.setenv('AIRTABLE_MIRROR_PATH', '')
+    return AirtableService()
+
+def test_follower_takes_over_after_release(coordinators):
+    leader, follower = coordinators
+
+    async def main():
+        assert await leader.acquire()
+        assert not await follower.acquire()
+        await leader.publish(leader_store(), SYNCED_AT)
+        snapshot = await follower.fetch()
+        assert isinstance(snapshot, GroepenSnapshot)
+        assert len(snapshot.groepen) == 3
+
+        await leader.release()
+        assert not leader.is_leader
+        # Geen wachten op een TTL: de volgende tick van de volger neemt het over
+        assert await follower.acquire()
+        assert not await leader.acquire()
+
+    asyncio.run(main())
+
+def test_follower_applies_heartbeat_without_reloading(coordinators, follower_service):
+    leader, follower = coordinators
+    store = leader_store()
+    service = follower_service
+    service._coordinator = follower
+    service._is_leader = False
+
+    async def main():
+        await leader.acquire()
+        await leader.publish(store, SYNCED_AT)
+        await service._follow()
+        version = service._store.version
+        assert len(service._store) == 3
+        assert service._store.synced_at == SYNCED_AT
+
+        # Een sync zonder wijzigingen: alleen synced_at en het watermark schuiven op
+        later = SYNCED_AT + timedelta(minutes=5)
+        store.synced_at = later
+        await leader.publish(store, later)
+        await service._follow()
+        assert service._store.synced_at == later
+        assert service._sync.watermark == later
+        assert service._store.version == version
+
+        # Niets nieuws gepubliceerd: de volger houdt wat hij heeft
+        assert await follower.fetch() is None
+        await service.gli_table.aclose()
+
+    asyncio.run(main())
+
+def test_mongo_heartbeat_skips_the_snapshot_data():
+    db = AsyncMongoMockClient()["test"]
+    leader = MongoCoordinator(db, tick=0.01)
+    follower = MongoCoordinator(db, tick=0.01)
+    store = leader_store()
+
+    async def main():
+        await leader.acquire()
+        await leader.publish(store, SYNCED_AT)
+        assert isinstance(await follower.fetch(), GroepenSnapshot)
+
+        store.synced_at = SYNCED_AT + timedelta(seconds=30)
+        await leader.publish(store, store.synced_at)
+        heartbeat = await follower.fetch()
+        assert not isinstance(heartbeat, GroepenSnapshot)
+        assert heartbeat.synced_at == store.synced_at
+        assert (leader.published, leader.heartbeats, follower.fetched) == (1, 1, 1)
+
+        # Een nieuwe volger krijgt de groepen met de synced_at van de laatste heartbeat
+        snapshot = await MongoCoordinator(db, tick=0.01).fetch()
+        assert snapshot.synced_at == store.synced_at
+        assert len(snapshot.groepen) == 3
+
+    asyncio.run(main())
+
+def test_server_shutdown_releases_the_lease_before_closing_mongo(server, monkeypatch):
+    monkeypatch.setenv('AIRTABLE_ACCESS_TOKEN', 'test')
+    monkeypatch.setenv('AIRTABLE_BASE_ID', 'appTest')
+    monkeypatch.setenv('AIRTABLE_MIRROR_PATH', '')
+    server.get_airtable_service.cache_clear()
+    db = AsyncMongoMockClient()["test"]
+    coordinator = MongoCoordinator(db, lease_ttl=60, tick=0.01)
+    closed = []
+
+    async def delete_one(*args, **kwargs):
+        # Zoals Motor: na client.close() lukt geen enkele operatie meer
+        if closed:
+            raise InvalidOperation("Cannot use MongoClient after close")
+        return await type(coordinator.leases).delete_one(coordinator.leases, *args, **kwargs)
+
+    class Client:
+        def close(self):
+            closed.append(True)
+
+    class Hasher:
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(coordinator.leases, "delete_one", delete_one)
+    monkeypatch.setattr(server, "client", Client())
+    monkeypatch.setattr(server, "password_hasher", Hasher())
+
+    async def main():
+        service = server.get_airtable_service()
+        assert await coordinator.acquire()
+        service._coordinator = coordinator
+        service._is_leader = True
+        await server.shutdown_db_client()
+        assert closed
+        # Geen lease meer: een andere worker hoeft niet op de TTL te wachten
+        assert await db["airtable_leases"].count_documents({}) == 0
+
+    try:
+        asyncio.run(main())
+    finally:
+        server.get_airtable_service.cache_clear()
+
+def test_follower_reads_known_ids_from_the_snapshot(coordinators, follower_service):
+    leader, follower = coordinators
+    service = follower_service
+    service._coordinator = follower
+    service._is_leader = False
+    requested = []
+
+    def airtable(request):
+        requested.append(request.url.path)
+        return httpx.Response(404, json={"error": "NOT_FOUND"})
+
+    async def main():
+        await leader.acquire()
+        await leader.publish(leader_store(), SYNCED_AT)
+        await service._follow()
+        service.gli_table._client = httpx.AsyncClient(transport=httpx.MockTransport(airtable))
+        try:
+            assert (await service.get_groep_by_id("rec0001")).groepnummer == "BK-1"
+            assert requested == []
+            # Een id dat nog niet in de snapshot staat gaat wel naar Airtable
+            assert await service.get_groep_by_id("recOnbekend") is None
+            assert len(requested) == 1
+        finally:
+            await service.gli_table.aclose()
+
+    asyncio.run(main())
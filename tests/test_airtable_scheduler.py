@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from airtable_scheduler import AirtableScheduler, CircuitOpenError
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.airtable.com/v0/base/table")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+@pytest.fixture
+def scheduler_env(monkeypatch):
+    monkeypatch.setenv('AIRTABLE_RATE_LIMIT', '20')
+    monkeypatch.delenv('AIRTABLE_RATE_BURST', raising=False)
+    monkeypatch.delenv('AIRTABLE_WORKERS', raising=False)
+    monkeypatch.setenv('AIRTABLE_RETRY_BASE_DELAY', '0.01')
+    monkeypatch.setenv('AIRTABLE_BREAKER_THRESHOLD', '2')
+    monkeypatch.setenv('AIRTABLE_BREAKER_RESET', '0.2')
+
+def test_tokens_are_spaced_at_the_rate_limit(scheduler_env):
+    scheduler = AirtableScheduler()
+    started = []
+
+    async def call():
+        started.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(scheduler.submit(call) for _ in range(10)))
+
+    asyncio.run(main())
+
+    gaps = [b - a for a, b in zip(started, started[1:])]
+    assert len(started) == 10
+    # 20 req/s zonder burst: elke call wacht ~50ms op de vorige
+    assert min(gaps) >= 0.04
+    # Geen enkel venster van één seconde boven het limiet
+    assert all(sum(1 for t in started if s <= t < s + 1) <= 20 for s in started)
+
+def test_rate_limit_is_shared_by_the_workers(scheduler_env, monkeypatch):
+    monkeypatch.setenv('AIRTABLE_WORKERS', '4')
+    # Vier workers met elk 5 req/s blijven samen op het base limiet van 20 req/s
+    assert AirtableScheduler()._bucket.rate == 5
+
+def test_breaker_opens_then_half_opens_then_closes(scheduler_env, monkeypatch):
+    monkeypatch.setenv('AIRTABLE_MAX_RETRIES', '0')
+    scheduler = AirtableScheduler()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise http_error(503)
+
+    async def ok():
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await scheduler.submit(failing)
+        assert scheduler.breaker_state == "open"
+
+        # Open: de call wordt niet eens uitgevoerd
+        with pytest.raises(CircuitOpenError):
+            await scheduler.submit(ok)
+        assert calls == 2
+
+        await asyncio.sleep(0.25)
+        assert scheduler.breaker_state == "half-open"
+
+        # Half-open laat één proefcall door; slaagt die, dan sluit de breaker
+        assert await scheduler.submit(ok) == "ok"
+        assert scheduler.breaker_state == "closed"
+        assert await scheduler.submit(ok) == "ok"
+
+    asyncio.run(main())
+    assert scheduler.rejected == 1
+
+def test_failed_trial_reopens_breaker(scheduler_env, monkeypatch):
+    monkeypatch.setenv('AIRTABLE_MAX_RETRIES', '0')
+    scheduler = AirtableScheduler()
+
+    async def failing():
+        raise http_error(503)
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await scheduler.submit(failing)
+        await asyncio.sleep(0.25)
+        with pytest.raises(httpx.HTTPStatusError):
+            await scheduler.submit(failing)
+        assert scheduler.breaker_state == "open"
+
+    asyncio.run(main())
+
+@pytest.mark.parametrize("error, idempotent, attempts", [
+    (httpx.ReadTimeout("timeout"), True, 3),
+    (httpx.ReadTimeout("timeout"), False, 1),
+    (httpx.ConnectError("refused"), False, 3),
+    (http_error(500), False, 1),
+    (http_error(429), False, 3),
+    (http_error(422), True, 1),
+])
+def test_retries_depend_on_idempotency(scheduler_env, monkeypatch, error, idempotent, attempts):
+    monkeypatch.setenv('AIRTABLE_MAX_RETRIES', '2')
+    monkeypatch.setenv('AIRTABLE_BREAKER_THRESHOLD', '100')
+    scheduler = AirtableScheduler()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise error
+
+    with pytest.raises(type(error)):
+        asyncio.run(scheduler.submit(call, idempotent=idempotent))
+    assert calls == attempts
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.setattr(server, "JWT_TRUST_CLAIMS", True)
+    # Zonder lifespan: geen Airtable sync of seed bij het opstarten
+    return TestClient(server.app)
+
+def register(client, email="inwoner@example.com") -> str:
+    response = client.post("/api/auth/register", json={
+        "email": email, "password": "geheim123", "name": "Test Inwoner", "role": "inwoner"
+    })
+    assert response.status_code == 200
+    return response.json()["token"]
+
+def test_profile_returns_stored_user_in_claims_mode(client, server):
+    token = register(client)
+    stored = asyncio.run(server.db.users.find_one({"email": "inwoner@example.com"}))
+    response = client.get("/api/auth/profile", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile["id"] == stored["id"]
+    assert profile["created_at"].startswith(stored["created_at"].isoformat()[:19])
+    assert "password" not in profile
+
+def test_cached_user_is_reused(client, server):
+    token = register(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/auth/profile", headers=headers)
+    hits = server.user_cache.hits
+    client.get("/api/auth/profile", headers=headers)
+    assert server.user_cache.hits == hits + 1
+
+def test_deactivated_user_loses_access_after_invalidation(client, server):
+    token = register(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/profile", headers=headers).status_code == 200
+
+    asyncio.run(server.db.users.update_one({"email": "inwoner@example.com"}, {"$set": {"is_active": False}}))
+    server.invalidate_user("inwoner@example.com")
+
+    # Cache leeg en de token is van voor de invalidatie: de claims worden niet meer vertrouwd
+    assert client.get("/api/auth/profile", headers=headers).status_code == 401
+    assert client.get("/api/resources", headers=headers).status_code == 401
+
+@pytest.mark.parametrize("path", ["/api/admin/password-pool", "/api/contact-requests/export"])
+def test_admin_routes_require_admin(client, path):
+    assert client.get(path).status_code in (401, 403)
+    inwoner = register(client, "inwoner@example.com")
+    assert client.get(path, headers={"Authorization": f"Bearer {inwoner}"}).status_code == 403
+
+    response = client.post("/api/auth/register", json={
+        "email": "admin@example.com", "password": "geheim123", "name": "Beheerder", "role": "admin"
+    })
+    admin = response.json()["token"]
+    assert client.get(path, headers={"Authorization": f"Bearer {admin}"}).status_code == 200
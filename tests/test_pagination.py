@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+from pydantic import BaseModel
+
+from airtable_models import GLIGroepResponse
+from airtable_service import get_airtable_service
+from gli_router import router as gli_router
+from pagination import NEXT_CURSOR_HEADER, encode_cursor, find_page, parse_fields
+
+START = datetime(2026, 5, 1, 9, 0, tzinfo=timezone.utc)
+
+class Item(BaseModel):
+    id: str
+    title: str
+    date: datetime
+
+def read_all(collection, limit: int, **kwargs) -> List:
+    """Follow next_cursor until the last page, like the frontend does."""
+    async def main():
+        items, after = [], None
+        while True:
+            page = await find_page(collection, {}, Item, limit, after, **kwargs)
+            assert len(page.items) <= limit
+            items.extend(page.items)
+            after = page.next_cursor
+            if after is None:
+                return items
+    return asyncio.run(main())
+
+@pytest.fixture
+def collection():
+    collection = AsyncMongoMockClient()["test"]["items"]
+    # Pairs of items share a date, so the _id tie-breaker is exercised
+    documents = [{"id": f"item-{i}", "title": f"Titel {i}", "date": START + timedelta(days=(25 - i) // 2)}
+                 for i in range(25)]
+    asyncio.run(collection.insert_many(documents))
+    return collection
+
+def test_cursor_round_trip_by_id(collection):
+    items = read_all(collection, 10)
+    assert [item.id for item in items] == [f"item-{i}" for i in range(25)]
+
+@pytest.mark.parametrize("limit", [1, 2, 7, 25, 100])
+def test_cursor_round_trip_by_date(collection, limit):
+    items = read_all(collection, limit, sort_field="date")
+    assert len({item.id for item in items}) == 25
+    keys = [(item.date, item.id) for item in items]
+    assert [date for date, _ in keys] == sorted(date for date, _ in keys)
+
+def test_fields_projection(collection):
+    fields = parse_fields("title", Item)
+    assert fields == ["id", "title"]
+    items = read_all(collection, 10, fields=fields, sort_field="date")
+    assert len(items) == 25
+    # The sort key is needed for the cursor but not returned
+    assert all(set(item) == {"id", "title"} for item in items)
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("title,secret", Item)
+    assert error.value.status_code == 400
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    encode_cursor({"_id": "not-an-object-id"}),
+    "WzEsMiwzXQ",  # valid base64 JSON, but a list
+])
+def test_bad_cursor_is_400(collection, cursor):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(find_page(collection, {}, Item, 10, cursor))
+    assert error.value.status_code == 400
+
+def test_cursor_without_sort_key_is_400(collection):
+    cursor = encode_cursor({"_id": str(ObjectId())})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(find_page(collection, {}, Item, 10, cursor, sort_field="date"))
+    assert error.value.status_code == 400
+
+@pytest.fixture
+def groepen_client(monkeypatch):
+    monkeypatch.setenv('AIRTABLE_ACCESS_TOKEN', 'test')
+    monkeypatch.setenv('AIRTABLE_BASE_ID', 'appTest')
+    monkeypatch.setenv('AIRTABLE_MIRROR_PATH', '')
+    service = get_airtable_service.__wrapped__()
+    service._store.replace_all(
+        GLIGroepResponse(
+            id=f"rec{i:04d}", gli_aanbieder="Zorg4Zeist", type_gli="Cool",
+            startdatum_groep=(START + timedelta(days=i // 3)).date(), einddatum_groep="2027-06-01",
+            groepnummer=f"C-{i}", status="Inschrijving open", created_time="2026-01-15T10:30:00.000Z"
+        )
+        for i in range(12)
+    )
+    service._store.synced_at = datetime.now(timezone.utc)
+    service.snapshot_cache.prime(service._store)
+
+    app = FastAPI()
+    app.include_router(gli_router)
+    app.dependency_overrides[get_airtable_service] = lambda: service
+    with TestClient(app) as client:
+        yield client
+    asyncio.run(service.gli_table.aclose())
+
+def test_groepen_cursor_round_trip(groepen_client):
+    ids, after = [], None
+    while True:
+        params = {"limit": 5, "fields": "groepnummer"}
+        if after:
+            params["after"] = after
+        response = groepen_client.get("/api/gli-groepen/", params=params)
+        assert response.status_code == 200
+        assert all(set(groep) == {"id", "groepnummer"} for groep in response.json())
+        ids.extend(groep["id"] for groep in response.json())
+        after = response.headers.get(NEXT_CURSOR_HEADER)
+        if after is None:
+            break
+    assert ids == [f"rec{i:04d}" for i in range(12)]
+
+@pytest.mark.parametrize("cursor", ["garbage!", encode_cursor({"startdatum": "gisteren", "id": "rec0001"})])
+def test_groepen_bad_cursor_is_400(groepen_client, cursor):
+    assert groepen_client.get("/api/gli-groepen/", params={"after": cursor}).status_code == 400
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import airtable_scheduler
+from airtable_coordination import MongoCoordinator
+from airtable_models import GLIGroepResponse
+from airtable_service import AirtableService
+from groepen_store import GroepenStore
+from search_index import SearchIndex, SearchSource, fold, stem, tokenize
+
+SOURCES = {
+    "faqs": SearchSource(title="question", fields=(("question", 2.0), ("answer", 1.0)), snippet="answer"),
+    "groepen": SearchSource(title="groepnummer", fields=(("gli_aanbieder", 1.0),)),
+}
+
+def stems(*words: str) -> list:
+    return [stem(fold(word)) for word in words]
+
+def faq(question: str, answer: str = "") -> dict:
+    return {"question": question, "answer": answer}
+
+def groep(i: int, aanbieder: str = "Zorg4Zeist") -> GLIGroepResponse:
+    return GLIGroepResponse(
+        id=f"rec{i:04d}", gli_aanbieder=aanbieder, type_gli="Beweegkuur",
+        startdatum_groep="2026-09-01", einddatum_groep="2027-03-01",
+        groepnummer=f"BK-{i}", status="Inschrijving open", created_time="2026-01-15T10:30:00.000Z"
+    )
+
+def ids(results) -> list:
+    return [document.id for _, document in results]
+
+def test_stem_plurals():
+    assert stems("groepen", "groep") == ["groep", "groep"]
+    assert stems("kinderen", "kinder") == ["kinder", "kinder"]
+    assert stems("trainers", "trainer") == ["trainer", "trainer"]
+    assert stems("oefeningen", "oefening") == ["oefen", "oefen"]
+
+def test_stem_diaeresis():
+    assert fold("patiënten") == "patienten"
+    assert stems("patiënten", "patiënt", "patient") == ["patient"] * 3
+
+def test_stem_heid_and_ing_endings():
+    assert stems("gezondheid") == ["gezond"]
+    assert stems("mogelijkheden", "mogelijkheid") == ["mogelijk", "mogelijk"]
+    assert stems("bewegen", "beweging") == ["beweg", "beweg"]
+
+def test_stem_undoubling():
+    # Consonants after dropping -en, vowels of a closing syllable
+    assert stems("katten", "bedden") == ["kat", "bed"]
+    assert stems("maan") == ["man"]
+
+def test_stem_leaves_short_and_alphanumeric_words_alone():
+    assert stems("en", "bk12") == ["en", "bk12"]
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("Wat is de beweging van de patiënten?") == ["beweg", "patient"]
+
+def test_bm25_ranks_title_and_rare_terms_higher():
+    index = SearchIndex(SOURCES)
+    index.upsert("faqs", "a", faq("Hoe werkt beweging?", "Meer over voeding."))
+    index.upsert("faqs", "b", faq("Voeding", "Gezond eten helpt bij beweging."))
+    index.upsert("faqs", "c", faq("Slaap", "Rust en voeding."))
+    # Titles weigh double
+    assert ids(index.search("beweging ")) == ["a", "b"]
+    # With equal term frequencies the shorter document wins
+    assert ids(index.search("voeding ")) == ["b", "c", "a"]
+    # "slaap" occurs in one document only and outweighs "voeding"
+    assert ids(index.search("slaap voeding "))[0] == "c"
+
+def test_last_word_matches_as_prefix():
+    index = SearchIndex(SOURCES)
+    index.upsert("faqs", "a", faq("Beweging"))
+    assert ids(index.search("bew")) == ["a"]
+    # A finished word must match completely
+    assert index.search("bew ") == []
+
+def test_upsert_replaces_and_remove_drops_a_document():
+    index = SearchIndex(SOURCES)
+    index.upsert("faqs", "a", faq("Beweging"))
+    index.upsert("faqs", "b", faq("Voeding"))
+    assert ids(index.search("beweging")) == ["a"]
+
+    index.upsert("faqs", "a", faq("Slaap"))
+    assert index.search("beweging") == []
+    assert ids(index.search("slaap")) == ["a"]
+    assert len(index) == 2
+
+    index.remove("faqs", "a")
+    assert index.search("slaap") == []
+    assert ids(index.search("voeding")) == ["b"]
+    assert index.stats()["terms"] == 1
+
+def test_sync_kind_only_reindexes_changed_documents():
+    index = SearchIndex(SOURCES)
+    sources = {"a": faq("Beweging"), "b": faq("Voeding")}
+    index.sync_kind("faqs", sources, version=1)
+
+    upserted = []
+    original = index.upsert
+    index.upsert = lambda kind, key, source: (upserted.append(key), original(kind, key, source))
+    changed = {"a": sources["a"], "c": faq("Slaap")}
+    # Same version: nothing to do
+    index.sync_kind("faqs", changed, version=1)
+    assert upserted == []
+
+    index.sync_kind("faqs", changed, version=2)
+    assert upserted == ["c"]
+    assert index.search("voeding") == []
+    assert ids(index.search("slaap")) == ["c"]
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv('AIRTABLE_ACCESS_TOKEN', 'test')
+    monkeypatch.setenv('AIRTABLE_BASE_ID', 'appSearch')
+    monkeypatch.setenv('AIRTABLE_MIRROR_PATH', '')
+    monkeypatch.setenv('AIRTABLE_RATE_LIMIT', '1000')
+    monkeypatch.setattr(airtable_scheduler, "_schedulers", {})
+    return AirtableService()
+
+def test_snapshot_listener_follows_snapshots_and_writes(service):
+    index = SearchIndex(SOURCES)
+    service.add_snapshot_listener(
+        lambda store: index.sync_kind("groepen", store.records, version=store.version)
+    )
+    db = AsyncMongoMockClient()["test"]
+    leader = MongoCoordinator(db, lease_ttl=60, tick=0.01)
+    service._coordinator = MongoCoordinator(db, lease_ttl=60, tick=0.01)
+    service._is_leader = False
+
+    store = GroepenStore()
+    store.replace_all([groep(1), groep(2, aanbieder="Fysio Utrecht")])
+    store.synced_at = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+    def airtable(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": "rec0001", "deleted": True})
+
+    async def main():
+        # Nothing is indexed before the first snapshot
+        assert index.search("zorg4zeist") == []
+        await leader.acquire()
+        await leader.publish(store, store.synced_at)
+        await service._follow()
+        assert ids(index.search("zorg4zeist")) == ["rec0001"]
+        assert ids(index.search("fysio")) == ["rec0002"]
+
+        service.gli_table._client = httpx.AsyncClient(transport=httpx.MockTransport(airtable))
+        try:
+            await service.delete_groep("rec0001")
+        finally:
+            await service.gli_table.aclose()
+        assert index.search("zorg4zeist") == []
+
+    asyncio.run(main())
+
+def test_listener_added_after_sync_is_called_immediately(service):
+    service._store.replace_all([groep(1)])
+    service._store.synced_at = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    seen = []
+    service.add_snapshot_listener(lambda store: seen.append(len(store)))
+    assert seen == [1]
@@ -0,0 +1,61 @@
+import time
+
+from user_cache import UserCache
+
+def test_hit_after_put():
+    cache = UserCache(maxsize=10, ttl=60)
+    assert cache.get("token") is None
+    cache.put("token", "a@example.com", "user-a")
+    assert cache.get("token") == "user-a"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_entry_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = UserCache(maxsize=10, ttl=60)
+    cache.put("token", "a@example.com", "user-a")
+    now[0] += 59
+    assert cache.get("token") == "user-a"
+    now[0] += 1
+    assert cache.get("token") is None
+
+def test_entry_never_outlives_token_exp(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = UserCache(maxsize=10, ttl=60)
+    cache.put("token", "a@example.com", "user-a", token_exp=1010)
+    now[0] = 1010
+    assert cache.get("token") is None
+
+def test_invalidate_drops_all_tokens_of_a_user():
+    cache = UserCache(maxsize=10, ttl=60, remember_for=3600)
+    cache.put("token-1", "a@example.com", "user-a")
+    cache.put("token-2", "a@example.com", "user-a")
+    cache.put("token-3", "b@example.com", "user-b")
+    issued_before = time.time() - 1
+    cache.invalidate_email("a@example.com")
+    assert cache.get("token-1") is None
+    assert cache.get("token-2") is None
+    assert cache.get("token-3") == "user-b"
+    assert cache.invalidated_since("a@example.com", issued_before)
+    assert not cache.invalidated_since("a@example.com", time.time() + 1)
+    assert not cache.invalidated_since("b@example.com", issued_before)
+
+def test_invalidations_are_forgotten_after_token_lifetime(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = UserCache(maxsize=10, ttl=60, remember_for=100)
+    cache.invalidate_email("a@example.com")
+    now[0] += 101
+    cache.invalidate_email("b@example.com")
+    assert not cache.invalidated_since("a@example.com", 0)
+    assert cache.invalidated_since("b@example.com", 0)
+
+def test_least_recently_used_is_evicted():
+    cache = UserCache(maxsize=2, ttl=60)
+    cache.put("token-1", "a@example.com", "user-a")
+    cache.put("token-2", "b@example.com", "user-b")
+    cache.get("token-1")
+    cache.put("token-3", "c@example.com", "user-c")
+    assert cache.get("token-2") is None
+    assert cache.get("token-1") == "user-a"
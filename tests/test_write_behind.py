@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from bson import json_util
+from mongomock_motor import AsyncMongoMockClient
+
+from write_behind import WriteBehindQueue, fcntl
+
+def contact(i: int) -> dict:
+    return {"id": f"contact-{i}", "name": f"Naam {i}", "message": "hallo"}
+
+def write_spool(path, documents, torn_tail: bool = False):
+    """Spool file as a crashed process leaves it behind."""
+    with open(path, "w", encoding="utf-8") as handle:
+        for document in documents:
+            handle.write(json_util.dumps(document) + "\n")
+        if torn_tail:
+            handle.write('{"id": "contact-torn", "na')
+
+@pytest.fixture
+def collection():
+    collection = AsyncMongoMockClient()["test"]["contact_requests"]
+    asyncio.run(collection.create_index("id", unique=True))
+    return collection
+
+def test_crashed_spool_is_replayed_without_duplicates(tmp_path, collection):
+    documents = [contact(i) for i in range(5)]
+    # The crash hit after the first two documents reached Mongo but before
+    # the spool file was removed
+    write_spool(tmp_path / "contact_requests.4242.1.ndjson", documents, torn_tail=True)
+
+    async def main():
+        await collection.insert_many([dict(d) for d in documents[:2]])
+        queue = WriteBehindQueue(collection, tmp_path, flush_interval=60)
+        queue.start()
+        assert queue.stats()["buffered"] == 5
+        assert await queue.flush() == 5
+        await queue.submit(contact(5))
+        await queue.close()
+        return sorted(d["id"] for d in await collection.find({}, {"_id": 0, "id": 1}).to_list(None))
+
+    ids = asyncio.run(main())
+    assert ids == [f"contact-{i}" for i in range(6)]
+    assert list(tmp_path.glob("*.ndjson")) == []
+
+def test_replay_twice_keeps_one_copy(tmp_path, collection):
+    spool = tmp_path / "contact_requests.4242.1.ndjson"
+    documents = [contact(i) for i in range(3)]
+
+    async def replay():
+        write_spool(spool, documents)
+        queue = WriteBehindQueue(collection, tmp_path, flush_interval=60)
+        queue.start()
+        await queue.close()
+
+    asyncio.run(replay())
+    asyncio.run(replay())
+    assert asyncio.run(collection.count_documents({})) == 3
+
+@pytest.mark.skipif(fcntl is None, reason="spool locking needs fcntl")
+def test_spool_of_live_process_is_left_alone(tmp_path, collection):
+    spool = tmp_path / "contact_requests.4242.1.ndjson"
+    write_spool(spool, [contact(0)])
+
+    with open(spool, "a+", encoding="utf-8") as held:
+        fcntl.flock(held, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        async def main():
+            queue = WriteBehindQueue(collection, tmp_path, flush_interval=60)
+            queue.start()
+            assert queue.stats()["buffered"] == 0
+            await queue.close()
+
+        asyncio.run(main())
+
+    assert spool.exists()
+    assert asyncio.run(collection.count_documents({})) == 0